@@ -0,0 +1,170 @@
+"""Bir nechta bot jarayonlari - update'larni chat bo'yicha bo'lib yuborish."""
+import asyncio
+import json
+import logging
+import multiprocessing
+import secrets
+from typing import Any, Optional
+
+from aiohttp import web
+from aiogram import Bot
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.types import Update
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Worker'ga "to'xta" signali
+STOP = None
+
+
+def partition_for(raw_update: dict[str, Any], partitions: int) -> int:
+    """
+    Update qaysi worker'ga tegishli ekanini aniqlash.
+
+    Bitta chat (yoki chat bo'lmasa - foydalanuvchi) update'lari doim bitta
+    worker'ga tushadi, shuning uchun chat ichidagi tartib saqlanadi.
+    """
+    update = Update.model_validate(raw_update)
+    context = UserContextMiddleware.resolve_event_context(update)
+    if context.chat is not None:
+        key = context.chat.id
+    elif context.user is not None:
+        key = context.user.id
+    else:
+        key = update.update_id
+    return key % partitions
+
+
+class UpdateRouter:
+    """Update'larni worker navbatlariga taqsimlash."""
+
+    def __init__(self, queues: list):
+        self.queues = queues
+
+    async def route(self, raw_update: dict[str, Any]) -> None:
+        """Update'ni tegishli worker navbatiga qo'yish (navbat to'la bo'lsa kutadi)."""
+        index = partition_for(raw_update, len(self.queues))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.queues[index].put, raw_update)
+
+
+def worker_main(index: int, queue) -> None:
+    """Worker jarayonining kirish nuqtasi."""
+    try:
+        asyncio.run(_worker(index, queue))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _worker(index: int, queue) -> None:
+    from bot.outbox import outbox
+    from main import create_bot, create_dispatcher
+
+    # Telegram limiti bot bo'yicha umumiy - har bir worker o'z ulushini oladi
+    outbox.set_rate(settings.OUTBOX_RATE / settings.BOT_WORKERS)
+    bot = create_bot()
+    dp = create_dispatcher(init_database=False)
+    await dp.emit_startup(bot=bot, dispatcher=dp)
+    logger.info(f"Bot worker #{index} ishga tushdi.")
+
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            raw_update = await loop.run_in_executor(None, queue.get)
+            if raw_update is STOP:
+                break
+            await dp.feed_raw_update(bot, raw_update)
+    finally:
+        await dp.emit_shutdown(bot=bot, dispatcher=dp)
+        await bot.session.close()
+        logger.info(f"Bot worker #{index} to'xtadi.")
+
+
+async def _poll(bot: Bot, router: UpdateRouter, allowed_updates: list[str]) -> None:
+    """Long polling - barcha update'lar bitta jarayonda olinadi va taqsimlanadi."""
+    offset: Optional[int] = None
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset,
+                timeout=30,
+                allowed_updates=allowed_updates,
+            )
+        except Exception as e:
+            logger.error(f"getUpdates xatosi: {e}")
+            await asyncio.sleep(5)
+            continue
+
+        for update in updates:
+            await router.route(update.model_dump(mode="json", exclude_none=True, by_alias=True))
+            offset = update.update_id + 1
+
+
+async def _serve_webhook(bot: Bot, router: UpdateRouter, allowed_updates: list[str]) -> None:
+    """Webhook - update'lar HTTP orqali qabul qilinadi va taqsimlanadi."""
+    from bot.webhook import register_webhook
+
+    async def handle(request: web.Request) -> web.Response:
+        if settings.WEBHOOK_SECRET and not secrets.compare_digest(
+            request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""),
+            settings.WEBHOOK_SECRET,
+        ):
+            return web.Response(status=401, text="Unauthorized")
+        try:
+            raw_update = await request.json(loads=json.loads)
+        except ValueError:
+            return web.Response(status=400, text="Bad request")
+        await router.route(raw_update)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post(settings.WEBHOOK_PATH, handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+    await site.start()
+    await register_webhook(bot, allowed_updates)
+    logger.info(
+        f"Webhook server ishga tushdi: http://{settings.WEBHOOK_HOST}:{settings.WEBHOOK_PORT}"
+        f"{settings.WEBHOOK_PATH}"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def run_cluster(bot: Bot, allowed_updates: list[str], workers: int) -> None:
+    """
+    ``workers`` ta bot jarayonini ishga tushirish.
+
+    Joriy jarayon update'larni qabul qiladi (polling yoki webhook) va
+    chat ID bo'yicha worker'larga taqsimlaydi. FSM holatlari umumiy SQL
+    storage'da saqlanadi.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queues = [ctx.Queue(maxsize=settings.UPDATE_QUEUE_SIZE) for _ in range(workers)]
+    processes = [
+        ctx.Process(target=worker_main, args=(i, queue), name=f"bot-worker-{i}")
+        for i, queue in enumerate(queues)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"{workers} ta bot worker jarayoni ishga tushirildi.")
+
+    router = UpdateRouter(queues)
+    try:
+        if settings.RUN_MODE == settings.RUN_MODE_WEBHOOK:
+            await _serve_webhook(bot, router, allowed_updates)
+        else:
+            await _poll(bot, router, allowed_updates)
+    finally:
+        for queue in queues:
+            queue.put(STOP)
+        for process in processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+        await bot.session.close()
@@ -0,0 +1,51 @@
+"""Telegram bilan fayl almashish - vaqtinchalik fayllardan yuklash va hujjatlarni yuklab olish."""
+import tempfile
+from typing import AsyncGenerator, BinaryIO
+
+from aiogram import Bot
+from aiogram.types import Document
+from aiogram.types.input_file import DEFAULT_CHUNK_SIZE, InputFile
+
+from core.config import settings
+from utils.import_files import SUPPORTED_EXTENSIONS
+
+
+def new_spool() -> tempfile.SpooledTemporaryFile:
+    """``EXPORT_SPOOL_SIZE`` baytgacha xotirada, undan katta bo'lsa diskda turadigan fayl."""
+    return tempfile.SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_SIZE, mode="w+b")
+
+
+class SpooledInputFile(InputFile):
+    """
+    Ochiq fayl obyektini Telegram'ga qismlab yuklash.
+
+    ``BufferedInputFile`` dan farqli ravishda butun fayl baytlarga
+    o'qilmaydi - yuklash ``chunk_size`` bo'laklarda boradi.
+    """
+
+    def __init__(self, fileobj: BinaryIO, filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        super().__init__(filename=filename, chunk_size=chunk_size)
+        self.fileobj = fileobj
+
+    async def read(self, bot: Bot) -> AsyncGenerator[bytes, None]:
+        self.fileobj.seek(0)
+        while chunk := self.fileobj.read(self.chunk_size):
+            yield chunk
+
+
+def check_import_document(document: Document) -> str:
+    """Import uchun yuborilgan hujjatni tekshirish (xato matni yoki bo'sh satr)."""
+    if not (document.file_name or "").lower().endswith(SUPPORTED_EXTENSIONS):
+        return "❌ Faqat .csv yoki .xlsx fayl yuboring."
+    if document.file_size and document.file_size > settings.IMPORT_MAX_FILE_SIZE:
+        limit_mb = settings.IMPORT_MAX_FILE_SIZE / (1024 * 1024)
+        return f"❌ Fayl juda katta (ko'pi bilan {limit_mb:.0f} MB)."
+    return ""
+
+
+async def download_document(bot: Bot, document: Document) -> tempfile.SpooledTemporaryFile:
+    """Hujjatni vaqtinchalik faylga yuklab olish (o'qish uchun boshiga qaytarilgan)."""
+    spool = new_spool()
+    await bot.download(document, destination=spool)
+    spool.seek(0)
+    return spool
@@ -1,15 +1,23 @@
 """Admin handlerlari - to'liq versiya."""
 import logging
+from typing import Optional
 from aiogram import Router, F
-from aiogram.types import CallbackQuery, Message
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, InlineKeyboardButton, Message
+from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.fsm.context import FSMContext
 
-from core.db import get_session
+from core.db import get_session, get_heavy_session
+from core.lanes import LANE_HEAVY
 from core.security.access import check_admin_access
-from services.user import UserService
+from services.user import UserService, pending_telegram_id
 from services.class_service import ClassService
 from services.report_service import ReportService
+from services.reminder_service import ReminderService
+from services.import_service import ImportService
+from services.student_service import StudentService
 from bot.states import AdminStates
+from bot.outbox import PRIORITY_HIGH, outbox
 from bot.keyboards.inline import (
     get_back_button,
     get_classes_list_keyboard,
@@ -20,7 +28,18 @@ from bot.keyboards.inline import (
     get_cancel_keyboard,
     get_reports_menu_keyboard,
     get_report_classes_keyboard,
+    get_export_months_keyboard,
+    get_raw_export_keyboard,
+    get_archive_keyboard,
+    get_move_mode_keyboard,
+    get_move_students_keyboard,
+    get_move_target_keyboard,
+    get_move_preview_keyboard,
 )
+from bot.files import SpooledInputFile, check_import_document, download_document, new_spool
+from reports.generator import ReportGenerator
+from utils.import_files import iter_table_rows
+from utils.dates import get_month_name
 
 logger = logging.getLogger(__name__)
 router = Router()
@@ -121,6 +140,72 @@ async def admin_create_class_finish(message: Message, state: FSMContext):
         )
 
 
+
+@router.callback_query(F.data == "a:import:students")
+async def admin_import_students_start(callback: CallbackQuery, state: FSMContext):
+    """O'quvchilarni fayldan import qilish (barcha sinflar) - boshlash."""
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await state.set_state(AdminStates.waiting_students_file)
+        await callback.message.edit_text(
+            "📥 O'quvchilar importi\n\n"
+            "CSV yoki XLSX fayl yuboring. Birinchi qator - sarlavha:\n"
+            "Ism familiya | Sinf\n\n"
+            "Sinflar oldindan yaratilgan bo'lishi kerak. Ro'yxatda bor "
+            "ismlar o'tkazib yuboriladi.",
+            reply_markup=get_cancel_keyboard(),
+        )
+        await callback.answer()
+
+
+@router.message(AdminStates.waiting_students_file, F.document, flags={"lane": LANE_HEAVY})
+async def admin_import_students_file(message: Message, state: FSMContext):
+    """O'quvchilarni fayldan import qilish - faylni qayta ishlash."""
+    error = check_import_document(message.document)
+    if error:
+        await message.answer(error)
+        return
+    
+    await state.clear()
+    
+    async for session in get_heavy_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(message.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await message.answer(error_msg)
+            return
+        
+        spool = await download_document(message.bot, message.document)
+        try:
+            rows = iter_table_rows(spool, message.document.file_name)
+            report = await ImportService(session).import_students(rows)
+        except ValueError as e:
+            await message.answer(f"❌ {e}")
+            return
+        finally:
+            spool.close()
+        
+        await message.answer(
+            ReportGenerator.format_import_report(report),
+            reply_markup=get_back_button("a:menu:classes"),
+        )
+
+
+@router.message(AdminStates.waiting_students_file)
+async def admin_import_students_not_file(message: Message):
+    """Import kutilayotganda fayl o'rniga matn yuborilsa."""
+    await message.answer("📄 CSV yoki XLSX fayl yuboring yoki bekor qiling.")
+
+
 @router.callback_query(F.data.regexp(r"^a:cls:(\d+)$"))
 async def admin_class_detail(callback: CallbackQuery):
     """Sinf tafsilotlari."""
@@ -273,15 +358,42 @@ async def admin_delete_class_execute(callback: CallbackQuery):
         await callback.answer()
 
 
-@router.callback_query(F.data.regexp(r"a:cls:(\d+):excel$"))
-async def admin_export_students_excel(callback: CallbackQuery):
-    """O'quvchilarni Excel faylda yuklab olish."""
-    class_id = int(callback.data.split(":")[2])
+@router.callback_query(F.data.regexp(r"a:cls:(\d+):(excel|pdf)$"))
+async def admin_export_months(callback: CallbackQuery):
+    """Excel / PDF eksport - oy tanlash."""
+    _, _, class_id, action = callback.data.split(":")
     
     async for session in get_session():
         user_service = UserService(session)
         user = await user_service.get_user_by_telegram_id(callback.from_user.id)
         
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        title = {
+            "excel": "📊 Excel: o'quvchilar ro'yxati va oylik davomat.",
+            "pdf": "🖨 PDF: oylik sinf davomat jurnali (chop etish uchun).",
+        }[action]
+        await callback.message.edit_text(
+            f"{title}\n\nOyni tanlang:",
+            reply_markup=get_export_months_keyboard(int(class_id), action),
+        )
+        await callback.answer()
+
+
+@router.callback_query(F.data.regexp(r"a:cls:(\d+):excel:(\d{6})$"), flags={"lane": LANE_HEAVY})
+async def admin_export_students_excel(callback: CallbackQuery):
+    """O'quvchilar ro'yxati va oylik davomatni .xlsx faylda yuklab olish."""
+    parts = callback.data.split(":")
+    class_id = int(parts[2])
+    year, month = int(parts[4][:4]), int(parts[4][4:])
+    
+    async for session in get_heavy_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
         has_access, error_msg = await check_admin_access(user)
         if not has_access:
             await callback.answer(error_msg, show_alert=True)
@@ -294,33 +406,82 @@ async def admin_export_students_excel(callback: CallbackQuery):
             await callback.answer("❌ Sinf topilmadi.", show_alert=True)
             return
         
-        # O'quvchilarni olish
-        from services.student_service import StudentService
-        student_service = StudentService(session)
-        students = await student_service.get_students_by_class(class_id)
-        
-        if not students:
+        if not class_obj.total_students:
             await callback.answer("❌ Bu sinfda o'quvchilar yo'q.", show_alert=True)
             return
         
-        # Excel yaratish
-        from utils.excel import generate_students_excel
-        excel_file = generate_students_excel(class_obj.name, students)
+        await callback.answer("⏳ Fayl tayyorlanmoqda...")
         
-        # Faylni yuborish
-        from aiogram.types import BufferedInputFile
         from datetime import date
+        from services.export_service import ExportService
+        from utils.dates import get_month_range, get_term_range
+        
+        # Ro'yxat varag'ida joriy chorak hisoblagichlari ham bor
+        month_start, month_end = get_month_range(year, month)
+        term_start, _ = get_term_range(date.today())
+        export_service = ExportService(session)
+        version = await export_service.get_data_version(
+            class_id, min(month_start, term_start), max(month_end, date.today())
+        )
         
-        filename = f"{class_obj.name}_oquvchilar_{date.today().strftime('%Y%m%d')}.csv"
-        file = BufferedInputFile(excel_file.read(), filename=filename)
+        async def render(spool):
+            # Qatorlar DB kursoridan to'g'ridan-to'g'ri faylga yoziladi
+            students = await export_service.write_class_workbook(
+                class_id, class_obj.name, year, month, spool
+            )
+            return (
+                f"{class_obj.name}_davomat_{year:04d}{month:02d}.xlsx",
+                f"📊 {class_obj.name} - {get_month_name(month)} {year}\n\n"
+                f"👥 Jami: {students} ta o'quvchi",
+            )
         
-        await callback.message.answer_document(
-            document=file,
-            caption=f"📊 {class_obj.name} - O'quvchilar ro'yxati\n\n"
-                    f"👥 Jami: {len(students)} ta o'quvchi"
+        await _send_cached_export(
+            callback.message, export_service, "excel", class_id, parts[4], version, render
         )
+
+
+@router.callback_query(F.data.regexp(r"a:cls:(\d+):pdf:(\d{6})$"), flags={"lane": LANE_HEAVY})
+async def admin_export_register_pdf(callback: CallbackQuery):
+    """Oylik sinf davomat jurnalini PDF faylda yuklab olish."""
+    parts = callback.data.split(":")
+    class_id = int(parts[2])
+    year, month = int(parts[4][:4]), int(parts[4][4:])
+    
+    async for session in get_heavy_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        class_service = ClassService(session)
+        class_obj = await class_service.get_class_by_id(class_id)
+        
+        if not class_obj:
+            await callback.answer("❌ Sinf topilmadi.", show_alert=True)
+            return
+        
+        await callback.answer("⏳ Jurnal tayyorlanmoqda...")
         
-        await callback.answer("✅ Fayl yuborildi!")
+        from services.export_service import ExportService
+        from utils.dates import get_month_range
+        
+        export_service = ExportService(session)
+        version = await export_service.get_data_version(class_id, *get_month_range(year, month))
+        
+        async def render(spool):
+            content = await export_service.get_register_pdf(class_id, class_obj.name, year, month)
+            spool.write(content)
+            return (
+                f"{class_obj.name}_jurnal_{year:04d}{month:02d}.pdf",
+                f"🖨 {class_obj.name} - davomat jurnali, {get_month_name(month)} {year}",
+            )
+        
+        await _send_cached_export(
+            callback.message, export_service, "pdf", class_id, parts[4], version, render
+        )
 
 
 @router.callback_query(F.data.regexp(r"a:cls:(\d+):staff$"))
@@ -480,7 +641,8 @@ async def admin_staff_menu(callback: CallbackQuery):
         builder = InlineKeyboardBuilder()
         
         builder.row(
-            InlineKeyboardButton(text="➕ Yangi xodim", callback_data="a:staff:add")
+            InlineKeyboardButton(text="➕ Yangi xodim", callback_data="a:staff:add"),
+            InlineKeyboardButton(text="📥 Fayldan import", callback_data="a:staff:import"),
         )
         builder.row(
             InlineKeyboardButton(text="◀️ Orqaga", callback_data="back_to_menu")
@@ -581,7 +743,7 @@ async def admin_add_staff_finish(message: Message, state: FSMContext):
             await message.answer(error_msg)
         # Xodim yaratish
         new_staff = await user_service.create_user(
-            telegram_id=0,  # Xodim hali botga kirmagan
+            telegram_id=pending_telegram_id(phone),  # Xodim hali botga kirmagan
             phone=phone,
             full_name=full_name,
             role="xodim",
@@ -615,6 +777,73 @@ async def admin_add_staff_finish(message: Message, state: FSMContext):
         )
 
 
+
+@router.callback_query(F.data == "a:staff:import")
+async def admin_import_staff_start(callback: CallbackQuery, state: FSMContext):
+    """Xodimlarni fayldan import qilish - boshlash."""
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await state.set_state(AdminStates.waiting_staff_file)
+        await callback.message.edit_text(
+            "📥 Xodimlar importi\n\n"
+            "CSV yoki XLSX fayl yuboring. Birinchi qator - sarlavha:\n"
+            "Ism familiya | Telefon | Sinflar\n\n"
+            "Sinflar ixtiyoriy, bir nechta bo'lsa vergul bilan yozing "
+            "(masalan: 5A, 6B). Bazada bor xodimlarga faqat yangi sinflar "
+            "biriktiriladi.",
+            reply_markup=get_cancel_keyboard(),
+        )
+        await callback.answer()
+
+
+@router.message(AdminStates.waiting_staff_file, F.document, flags={"lane": LANE_HEAVY})
+async def admin_import_staff_file(message: Message, state: FSMContext):
+    """Xodimlarni fayldan import qilish - faylni qayta ishlash."""
+    error = check_import_document(message.document)
+    if error:
+        await message.answer(error)
+        return
+    
+    await state.clear()
+    
+    async for session in get_heavy_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(message.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await message.answer(error_msg)
+            return
+        
+        spool = await download_document(message.bot, message.document)
+        try:
+            rows = iter_table_rows(spool, message.document.file_name)
+            report = await ImportService(session).import_staff(rows)
+        except ValueError as e:
+            await message.answer(f"❌ {e}")
+            return
+        finally:
+            spool.close()
+        
+        await message.answer(
+            ReportGenerator.format_staff_import_report(report),
+            reply_markup=get_back_button("a:menu:staff"),
+        )
+
+
+@router.message(AdminStates.waiting_staff_file)
+async def admin_import_staff_not_file(message: Message):
+    """Import kutilayotganda fayl o'rniga matn yuborilsa."""
+    await message.answer("📄 CSV yoki XLSX fayl yuboring yoki bekor qiling.")
+
+
 @router.callback_query(F.data == "a:menu:reports")
 async def admin_reports_menu(callback: CallbackQuery):
     """Admin - Hisobotlar menyusi."""
@@ -635,12 +864,12 @@ async def admin_reports_menu(callback: CallbackQuery):
         await callback.answer()
 
 
-@router.callback_query(F.data == "a:reports:daily")
+@router.callback_query(F.data == "a:reports:daily", flags={"lane": LANE_HEAVY})
 async def admin_daily_report(callback: CallbackQuery):
     """Admin - Bugungi hisobot."""
     from datetime import date
     
-    async for session in get_session():
+    async for session in get_heavy_session():
         user_service = UserService(session)
         user = await user_service.get_user_by_telegram_id(callback.from_user.id)
         
@@ -661,15 +890,11 @@ async def admin_daily_report(callback: CallbackQuery):
             await callback.answer()
             return
         
-        # Har bir sinf uchun bugungi hisobot
+        # Barcha sinflar uchun bugungi hisobot (kunlik xulosalardan)
         report_service = ReportService(session)
         today = date.today()
         
-        reports = []
-        for class_obj in classes:
-            report, success = await report_service.get_daily_report(class_obj.id, today)
-            if success:
-                reports.append(report)
+        reports = await report_service.get_school_daily_reports(today)
         
         if not reports:
             await callback.message.edit_text(
@@ -689,6 +914,47 @@ async def admin_daily_report(callback: CallbackQuery):
         await callback.answer()
 
 
+@router.callback_query(F.data.in_({"a:reports:unmarked", "a:reports:unmarked:refresh"}))
+async def admin_unmarked_classes(callback: CallbackQuery):
+    """Admin - Bugun davomati to'liq belgilanmagan sinflar."""
+    from datetime import date
+    from utils.dates import format_date
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        today = date.today()
+        unmarked = await ReminderService(session).get_unmarked_classes(today)
+        
+        if not unmarked:
+            text = f"✅ {format_date(today)}: barcha sinflar davomati belgilangan."
+        else:
+            text = f"⏳ Belgilanmagan sinflar ({len(unmarked)} ta)\n📅 {format_date(today)}\n\n"
+            for row in unmarked:
+                text += f"📚 {row['class_name']}: {row['marked']}/{row['total']}\n"
+        
+        builder = InlineKeyboardBuilder()
+        builder.row(
+            InlineKeyboardButton(text="🔄 Yangilash", callback_data="a:reports:unmarked:refresh")
+        )
+        builder.row(
+            InlineKeyboardButton(text="◀️ Orqaga", callback_data="a:menu:reports")
+        )
+        
+        try:
+            await callback.message.edit_text(text, reply_markup=builder.as_markup())
+        except TelegramBadRequest:
+            # Matn o'zgarmagan
+            pass
+        await callback.answer()
+
+
 @router.callback_query(F.data == "a:reports:classes")
 async def admin_class_reports_menu(callback: CallbackQuery):
     """Admin - Sinf hisobotlari - sinfni tanlash."""
@@ -780,6 +1046,519 @@ async def cancel_action(callback: CallbackQuery, state: FSMContext):
             )
 
 
+# ============= O'QUVCHILARNI KO'CHIRISH =============
+
+async def _move_student_ids(state: FSMContext, class_id: int, mode: str) -> Optional[list[int]]:
+    """Ko'chirish rejimi bo'yicha o'quvchilar (``all`` - butun sinf, None)."""
+    if mode == "all":
+        return None
+    data = await state.get_data()
+    if data.get("move_class_id") != class_id:
+        return []
+    return data.get("move_selected", [])
+
+
+@router.callback_query(F.data.regexp(r"^a:mv:(\d+)$"))
+async def admin_move_mode(callback: CallbackQuery, state: FSMContext):
+    """O'quvchilarni boshqa sinfga ko'chirish - rejim tanlash."""
+    class_id = int(callback.data.split(":")[2])
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        class_obj = await ClassService(session).get_class_by_id(class_id)
+        if not class_obj:
+            await callback.answer("❌ Sinf topilmadi.", show_alert=True)
+            return
+        
+        await callback.message.edit_text(
+            f"🔀 {class_obj.name} - o'quvchilarni ko'chirish\n\n"
+            f"👥 O'quvchilar: {class_obj.total_students} ta\n\n"
+            "Butun sinfni (masalan, yangi o'quv yilida) yoki tanlangan "
+            "o'quvchilarni boshqa sinfga o'tkazish mumkin.",
+            reply_markup=get_move_mode_keyboard(class_id),
+        )
+        await callback.answer()
+
+
+@router.callback_query(F.data.regexp(r"^a:mv:(\d+):(pick|t:\d+)$"))
+async def admin_move_pick(callback: CallbackQuery, state: FSMContext):
+    """Ko'chiriladigan o'quvchilarni belgilash."""
+    parts = callback.data.split(":")
+    class_id = int(parts[2])
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        selected = set(await _move_student_ids(state, class_id, "sel"))
+        if parts[3] == "pick":
+            selected = set()
+        else:
+            student_id = int(parts[4])
+            selected ^= {student_id}
+        await state.update_data(move_class_id=class_id, move_selected=sorted(selected))
+        
+        students = await StudentService(session).get_students_by_class(class_id)
+        if not students:
+            await callback.answer("❌ Sinfda o'quvchilar yo'q.", show_alert=True)
+            return
+        
+        await callback.message.edit_text(
+            f"☑️ Ko'chiriladigan o'quvchilarni belgilang ({len(selected)} ta tanlangan):",
+            reply_markup=get_move_students_keyboard(students, class_id, selected),
+        )
+        await callback.answer()
+
+
+@router.callback_query(F.data.regexp(r"^a:mv:(\d+):(all|sel):to$"))
+async def admin_move_target(callback: CallbackQuery, state: FSMContext):
+    """Ko'chirish - maqsad sinfni tanlash."""
+    parts = callback.data.split(":")
+    class_id = int(parts[2])
+    mode = parts[3]
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        if mode == "sel" and not await _move_student_ids(state, class_id, mode):
+            await callback.answer("❌ Hech kim tanlanmagan.", show_alert=True)
+            return
+        
+        classes = await ClassService(session).get_all_classes()
+        if len(classes) < 2:
+            await callback.answer("❌ Boshqa sinf yo'q.", show_alert=True)
+            return
+        
+        await callback.message.edit_text(
+            "🔀 Qaysi sinfga ko'chirilsin?",
+            reply_markup=get_move_target_keyboard(classes, class_id, mode),
+        )
+        await callback.answer()
+
+
+@router.callback_query(F.data.regexp(r"^a:mv:(\d+):(all|sel):to:(\d+)$"))
+async def admin_move_preview(callback: CallbackQuery, state: FSMContext):
+    """Ko'chirish - oldindan ko'rish (kimlar, qayerga, ism to'qnashuvlari)."""
+    parts = callback.data.split(":")
+    class_id, mode, target_id = int(parts[2]), parts[3], int(parts[5])
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        student_ids = await _move_student_ids(state, class_id, mode)
+        if student_ids is not None and not student_ids:
+            await callback.answer("❌ Hech kim tanlanmagan.", show_alert=True)
+            return
+        
+        preview, error = await StudentService(session).preview_transfer(
+            class_id, target_id, student_ids=student_ids,
+        )
+        if preview is None:
+            await callback.answer(error, show_alert=True)
+            return
+        
+        await callback.message.edit_text(
+            ReportGenerator.format_transfer_preview(preview) + "\nTasdiqlaysizmi?",
+            reply_markup=get_move_preview_keyboard(class_id, mode, target_id),
+        )
+        await callback.answer()
+
+
+@router.callback_query(F.data.regexp(r"^a:mv:(\d+):(all|sel):(go|dry):(\d+)$"))
+async def admin_move_execute(callback: CallbackQuery, state: FSMContext):
+    """Ko'chirish - bajarish yoki sinov (dry-run, hech narsa saqlanmaydi)."""
+    parts = callback.data.split(":")
+    class_id, mode, action, target_id = int(parts[2]), parts[3], parts[4], int(parts[5])
+    dry_run = action == "dry"
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        user_id = user.id
+        student_ids = await _move_student_ids(state, class_id, mode)
+        if student_ids is not None and not student_ids:
+            await callback.answer("❌ Hech kim tanlanmagan.", show_alert=True)
+            return
+        
+        student_service = StudentService(session)
+        preview, error = await student_service.preview_transfer(
+            class_id, target_id, student_ids=student_ids,
+        )
+        if preview is None:
+            await callback.answer(error, show_alert=True)
+            return
+        
+        moved, error = await student_service.transfer_students(
+            class_id, target_id, user_id, student_ids=student_ids, dry_run=dry_run,
+        )
+        if error:
+            await callback.answer(error, show_alert=True)
+            return
+        
+        route = f"{preview.from_class_name} → {preview.to_class_name}"
+        if dry_run:
+            await callback.message.edit_text(
+                f"🧪 Sinov: {moved} ta o'quvchi ko'chirilgan bo'lardi ({route}).\n"
+                "Hech narsa o'zgarmadi.\n\nTasdiqlaysizmi?",
+                reply_markup=get_move_preview_keyboard(class_id, mode, target_id),
+            )
+            await callback.answer()
+            return
+        
+        await state.update_data(move_class_id=None, move_selected=[])
+        logger.info(
+            "Bulk transfer: %s students %s -> %s by user %s",
+            moved, class_id, target_id, user_id,
+        )
+        await callback.message.edit_text(
+            f"✅ {moved} ta o'quvchi ko'chirildi: {route}",
+            reply_markup=get_class_actions_keyboard(target_id),
+        )
+        await callback.answer()
+
+
+# ============= DAVOMAT EKSPORTI =============
+
+@router.callback_query(F.data.regexp(r"^a:raw:(\d+)$"))
+async def admin_raw_export_menu(callback: CallbackQuery, state: FSMContext):
+    """Xom davomat eksporti - oraliq tanlash."""
+    class_id = int(callback.data.split(":")[2])
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await state.clear()
+        scope = "barcha sinflar"
+        if class_id:
+            class_obj = await ClassService(session).get_class_by_id(class_id)
+            if not class_obj:
+                await callback.answer("❌ Sinf topilmadi.", show_alert=True)
+                return
+            scope = class_obj.name
+        
+        await callback.message.edit_text(
+            f"📥 Davomat yozuvlari (CSV) - {scope}\n\n"
+            f"Sana, sinf, o'quvchi, status, belgilagan va yangilangan vaqt.\n"
+            f"Oraliqni tanlang:",
+            reply_markup=get_raw_export_keyboard(class_id),
+        )
+        await callback.answer()
+
+
+@router.callback_query(F.data.regexp(r"^a:raw:(\d+):(month|prev|year)$"), flags={"lane": LANE_HEAVY})
+async def admin_raw_export_period(callback: CallbackQuery):
+    """Xom davomat eksporti - tayyor oraliq bo'yicha."""
+    from datetime import date
+    from utils.dates import get_academic_year_start, get_month_range, shift_month
+    
+    parts = callback.data.split(":")
+    class_id = int(parts[2])
+    today = date.today()
+    
+    if parts[3] == "month":
+        start, end = today.replace(day=1), today
+    elif parts[3] == "prev":
+        start, end = get_month_range(*shift_month(today.year, today.month, -1))
+    else:
+        start, end = get_academic_year_start(today), today
+    
+    async for session in get_heavy_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await callback.answer("⏳ Fayl tayyorlanmoqda...")
+        await _send_raw_export(session, callback.message, class_id or None, start, end)
+
+
+@router.callback_query(F.data.regexp(r"^a:raw:(\d+):custom$"))
+async def admin_raw_export_custom(callback: CallbackQuery, state: FSMContext):
+    """Xom davomat eksporti - oraliqni qo'lda kiritish."""
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await state.set_state(AdminStates.waiting_export_range)
+        await state.update_data(class_id=int(callback.data.split(":")[2]))
+        await callback.message.edit_text(
+            "✏️ Sanalar oralig'ini kiriting:\n\n"
+            "Masalan: 01.09.2026 - 31.12.2026",
+            reply_markup=get_cancel_keyboard(),
+        )
+        await callback.answer()
+
+
+@router.message(AdminStates.waiting_export_range, flags={"lane": LANE_HEAVY})
+async def admin_raw_export_range(message: Message, state: FSMContext):
+    """Xom davomat eksporti - kiritilgan oraliq bo'yicha."""
+    from utils.dates import parse_date
+    
+    parts = (message.text or "").replace("—", "-").split(" - ")
+    dates = [parse_date(part.strip(), "%d.%m.%Y") for part in parts] if len(parts) == 2 else []
+    if len(dates) != 2 or None in dates or dates[0] > dates[1]:
+        await message.answer("❌ Noto'g'ri format. Masalan: 01.09.2026 - 31.12.2026")
+        return
+    
+    async for session in get_heavy_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(message.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await message.answer(error_msg)
+            await state.clear()
+            return
+        
+        data = await state.get_data()
+        await state.clear()
+        await message.answer("⏳ Fayl tayyorlanmoqda...")
+        await _send_raw_export(session, message, data.get("class_id") or None, dates[0], dates[1])
+
+
+async def _send_raw_export(session, message: Message, class_id, start, end) -> None:
+    """Xom davomat CSV'ni oqim bilan yaratib, hujjat sifatida yuborish."""
+    from services.export_service import ExportService
+    from utils.dates import format_date
+    
+    scope = "barcha_sinflar"
+    if class_id:
+        class_obj = await ClassService(session).get_class_by_id(class_id)
+        scope = class_obj.name if class_obj else str(class_id)
+    
+    export_service = ExportService(session)
+    version = await export_service.get_data_version(class_id, start, end)
+    
+    async def render(spool):
+        # Qatorlar kursordan bo'laklab o'qilib, vaqtinchalik faylga yoziladi
+        rows = await export_service.write_attendance_csv(start, end, spool, class_id=class_id)
+        if not rows:
+            return None
+        return (
+            f"davomat_{scope}_{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}.csv",
+            f"📥 Davomat yozuvlari\n\n"
+            f"📅 {format_date(start)} - {format_date(end)}\n"
+            f"📝 Jami: {rows} ta yozuv",
+        )
+    
+    params = f"{start.strftime('%Y%m%d')}-{end.strftime('%Y%m%d')}"
+    if not await _send_cached_export(message, export_service, "raw", class_id or 0, params, version, render):
+        await message.answer("📭 Bu oraliqda davomat yozuvlari yo'q.")
+
+
+async def _send_cached_export(
+    message: Message,
+    export_service,
+    kind: str,
+    class_id: int,
+    params: str,
+    version: str,
+    render,
+) -> bool:
+    """
+    Eksport faylini yuborish: shu versiya avval yuklangan bo'lsa ``file_id``
+    bilan (qayta yaratmasdan), aks holda ``render(spool)`` orqali yaratib.
+    
+    ``render`` (filename, caption) yoki yuboriladigan narsa bo'lmasa None
+    qaytaradi.
+    
+    Returns:
+        Fayl yuborildimi
+    """
+    cached = await export_service.get_cached_file(kind, class_id, params, version)
+    if cached is not None:
+        try:
+            await message.answer_document(document=cached.file_id, caption=cached.caption)
+            return True
+        except TelegramBadRequest as e:
+            logger.warning(f"Keshdagi file_id yaroqsiz ({kind}, {class_id}, {params}): {e}")
+            await export_service.forget_file(kind, class_id, params)
+    
+    with new_spool() as spool:
+        rendered = await render(spool)
+        if rendered is None:
+            return False
+        filename, caption = rendered
+        sent = await message.answer_document(
+            document=SpooledInputFile(spool, filename=filename),
+            caption=caption,
+        )
+    
+    if sent.document is not None:
+        await export_service.remember_file(
+            kind, class_id, params, version, sent.document.file_id, caption
+        )
+    return True
+
+
+@router.callback_query(F.data == "a:archive")
+async def admin_archive_menu(callback: CallbackQuery):
+    """Maktab arxivi - davr tanlash."""
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await callback.message.edit_text(
+            "🗂 Maktab arxivi (ZIP)\n\n"
+            "Har bir sinf uchun Excel fayl (ro'yxat va davomat) hamda "
+            "umumiy xulosa.\n\n"
+            "Davrni tanlang:",
+            reply_markup=get_archive_keyboard(),
+        )
+        await callback.answer()
+
+
+@router.callback_query(F.data.regexp(r"^a:archive:(term|prev|year)$"), flags={"lane": LANE_HEAVY})
+async def admin_archive_export(callback: CallbackQuery):
+    """Maktab arxivini yaratib yuborish."""
+    from datetime import date
+    from core.db.engine import heavy_session_maker
+    from services.export_service import ExportService
+    from utils.dates import format_date, get_academic_period, get_academic_year_start, get_term_range
+    
+    choice = callback.data.split(":")[2]
+    today = date.today()
+    if choice == "year":
+        start, end = get_academic_year_start(today), today
+        title = f"{start.year}-{start.year + 1} o'quv yili"
+    else:
+        start, end = get_term_range(today, 0 if choice == "term" else -1)
+        end = min(end, today)
+        title = f"{get_academic_period(start)} chorak"
+    
+    async for session in get_heavy_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await callback.answer("⏳ Arxiv tayyorlanmoqda...")
+        
+        export_service = ExportService(session)
+        version = await export_service.get_data_version(None, start, end)
+        
+        async def render(spool):
+            classes = await export_service.write_school_archive(
+                start, end, title, spool, session_factory=heavy_session_maker
+            )
+            return (
+                f"davomat_arxivi_{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}.zip",
+                f"🗂 Maktab arxivi - {title}\n\n"
+                f"📅 {format_date(start)} - {format_date(end)}\n"
+                f"📚 Sinflar: {classes} ta",
+            )
+        
+        params = f"{start.strftime('%Y%m%d')}-{end.strftime('%Y%m%d')}"
+        await _send_cached_export(callback.message, export_service, "archive", 0, params, version, render)
+
+
+# ============= E'LONLAR =============
+
+@router.callback_query(F.data == "a:menu:announce")
+async def admin_announce_start(callback: CallbackQuery, state: FSMContext):
+    """E'lon yuborish - boshlash."""
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await state.set_state(AdminStates.waiting_announcement_text)
+        await callback.message.edit_text(
+            "📣 E'lon\n\n"
+            "Barcha xodim va adminlarga yuboriladigan matnni kiriting:",
+            reply_markup=get_cancel_keyboard(),
+        )
+        await callback.answer()
+
+
+@router.message(AdminStates.waiting_announcement_text, flags={"lane": LANE_HEAVY})
+async def admin_announce_send(message: Message, state: FSMContext):
+    """E'lonni navbat orqali barcha foydalanuvchilarga yuborish."""
+    if not message.text:
+        await message.answer("❌ Matn kiriting:")
+        return
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(message.from_user.id)
+        
+        has_access, error_msg = await check_admin_access(user)
+        if not has_access:
+            await message.answer(error_msg)
+            await state.clear()
+            return
+        
+        await state.clear()
+        
+        recipients = await user_service.repo.get_all_staff()
+        recipients += await user_service.repo.get_all_admins()
+        chat_ids = [u.telegram_id for u in recipients if u.telegram_id > 0]
+        
+        await message.answer(f"⏳ E'lon navbatga qo'yildi: {len(chat_ids)} ta qabul qiluvchi.")
+        sent, failed = await outbox.broadcast(chat_ids, f"📣 E'lon\n\n{message.html_text}")
+        await outbox.submit(
+            message.chat.id,
+            f"✅ E'lon yuborildi: {sent} ta\n❌ Yuborilmadi: {failed} ta",
+            priority=PRIORITY_HIGH,
+        )
+
+
 # ============= ADMINLAR BOSHQARUVI =============
 
 @router.callback_query(F.data == "a:menu:admins")
@@ -925,7 +1704,7 @@ async def admin_add_admin_finish(message: Message, state: FSMContext):
         
         # Admin yaratish
         new_admin = await user_service.create_user(
-            telegram_id=0,
+            telegram_id=pending_telegram_id(phone),
             phone=phone,
             full_name=full_name,
             role="admin",
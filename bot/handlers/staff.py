@@ -5,14 +5,20 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
 
-from core.db import get_session
+from core.db import get_session, get_heavy_session
+from core.lanes import LANE_HEAVY
 from core.security.access import check_staff_access
 from services.user import UserService
 from services.class_service import ClassService
 from services.attendance_service import AttendanceService
 from services.student_service import StudentService
+from services.import_service import ImportService
 from utils.dates import format_date, get_weekday_name
+from reports.generator import ReportGenerator
 from bot.states import StaffStates
+from bot.outbox import outbox
+from bot.files import check_import_document, download_document
+from utils.import_files import iter_table_rows
 from bot.keyboards.inline import (
     get_back_button,
     get_staff_classes_keyboard,
@@ -304,6 +310,7 @@ async def staff_mark_attendance_execute(callback: CallbackQuery):
             attendance_day_id=attendance_day_id,
             student_id=student_id,
             status=status,
+            user_id=user.id,
         )
         
         if not success:
@@ -448,6 +455,18 @@ async def staff_finalize_attendance(callback: CallbackQuery):
         # Ekranni yangilash
         day = await attendance_service.attendance_repo.get_attendance_day_by_id(attendance_day_id)
         if day:
+            # Adminlarga xabar (navbat orqali, javob kutilmaydi)
+            class_obj = await ClassService(session).get_class_by_id(day.class_id)
+            admins = await user_service.repo.get_all_admins()
+            for admin_user in admins:
+                if admin_user.telegram_id > 0:
+                    await outbox.submit(
+                        admin_user.telegram_id,
+                        f"✅ {class_obj.name if class_obj else day.class_id} sinfi davomati yakunlandi\n"
+                        f"📅 {format_date(day.date)}\n"
+                        f"👤 {user.full_name}",
+                    )
+            
             # Summary handlerini chaqirish uchun yangi callback yasash
             from aiogram.types import CallbackQuery as CQ
             new_callback = CQ(
@@ -538,9 +557,11 @@ async def staff_students_class_list(callback: CallbackQuery):
             await callback.answer(error_msg, show_alert=True)
             return
         
-        # O'quvchilarni olish
+        # O'quvchilarni olish (chorak hisoblagichlari bilan)
         student_service = StudentService(session)
-        students = await student_service.get_students_by_class(class_id)
+        roster = await student_service.get_roster(class_id)
+        students = [student for student, _ in roster]
+        stats = {student.id: student_stats for student, student_stats in roster}
         
         # Sinfni topish
         class_service = ClassService(session)
@@ -563,7 +584,7 @@ async def staff_students_class_list(callback: CallbackQuery):
         await callback.message.edit_text(
             f"📚 {class_obj.name} - O'quvchilar ({len(students)} ta)\n\n"
             f"O'quvchini tanlang:",
-            reply_markup=get_students_list_keyboard(students, class_id),
+            reply_markup=get_students_list_keyboard(students, class_id, stats=stats),
         )
         await callback.answer()
 
@@ -654,6 +675,81 @@ async def staff_add_student_finish(message: Message, state: FSMContext):
         )
 
 
+@router.callback_query(F.data.regexp(r"s:students:(\d+):import$"))
+async def staff_import_students_start(callback: CallbackQuery, state: FSMContext):
+    """O'quvchilarni fayldan import qilish - boshlash."""
+    class_id = int(callback.data.split(":")[2])
+    
+    async for session in get_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+        
+        has_access, error_msg = await check_staff_access(user)
+        if not has_access:
+            await callback.answer(error_msg, show_alert=True)
+            return
+        
+        await state.set_state(StaffStates.waiting_student_file)
+        await state.update_data(class_id=class_id)
+        
+        from bot.keyboards.inline import get_cancel_keyboard
+        await callback.message.edit_text(
+            "📄 O'quvchilarni fayldan import qilish\n\n"
+            "CSV yoki XLSX fayl yuboring: birinchi ustunda o'quvchining "
+            "to'liq ismi (har qatorda bitta). Ro'yxatda bor ismlar "
+            "o'tkazib yuboriladi.",
+            reply_markup=get_cancel_keyboard(),
+        )
+        await callback.answer()
+
+
+@router.message(StaffStates.waiting_student_file, F.document, flags={"lane": LANE_HEAVY})
+async def staff_import_students_file(message: Message, state: FSMContext):
+    """O'quvchilarni fayldan import qilish - faylni qayta ishlash."""
+    error = check_import_document(message.document)
+    if error:
+        await message.answer(error)
+        return
+    
+    data = await state.get_data()
+    class_id = data.get("class_id")
+    await state.clear()
+    
+    if not class_id:
+        await message.answer("❌ Xato yuz berdi. Qaytadan urinib ko'ring.")
+        return
+    
+    async for session in get_heavy_session():
+        user_service = UserService(session)
+        user = await user_service.get_user_by_telegram_id(message.from_user.id)
+        
+        has_access, error_msg = await check_staff_access(user)
+        if not has_access:
+            await message.answer(error_msg)
+            return
+        
+        spool = await download_document(message.bot, message.document)
+        try:
+            rows = iter_table_rows(spool, message.document.file_name)
+            report = await ImportService(session).import_students(rows, class_id=class_id)
+        except ValueError as e:
+            await message.answer(f"❌ {e}")
+            return
+        finally:
+            spool.close()
+        
+        await message.answer(
+            ReportGenerator.format_import_report(report),
+            reply_markup=get_back_button(f"s:students:class:{class_id}"),
+        )
+
+
+@router.message(StaffStates.waiting_student_file)
+async def staff_import_students_not_file(message: Message):
+    """Import kutilayotganda fayl o'rniga matn yuborilsa."""
+    await message.answer("📄 CSV yoki XLSX fayl yuboring yoki bekor qiling.")
+
+
 @router.callback_query(F.data.regexp(r"s:students:(\d+):actions$"))
 async def staff_student_actions(callback: CallbackQuery):
     """O'quvchi harakatlari."""
@@ -681,9 +777,13 @@ async def staff_student_actions(callback: CallbackQuery):
         class_service = ClassService(session)
         class_obj = await class_service.get_class_by_id(student.class_id)
         
+        # Chorak hisoblagichlari (tayyor qator, agregatsiyasiz)
+        student_stats = await StudentService(session).get_student_stats(student_id)
+        
         await callback.message.edit_text(
             f"👤 {student.full_name}\n"
             f"📚 Sinf: {class_obj.name if class_obj else 'Noma\'lum'}\n\n"
+            f"{ReportGenerator.format_student_stats(student_stats)}\n"
             f"Nima qilmoqchisiz?",
             reply_markup=get_student_actions_keyboard(student_id),
         )
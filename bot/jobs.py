@@ -0,0 +1,91 @@
+"""Fon ishlari - eslatmalar, davomatni avtomatik yakunlash va eksport keshi."""
+import logging
+from datetime import date, datetime
+
+from bot.outbox import PRIORITY_NORMAL, outbox
+from core.config import settings
+from core.db import get_session
+from core.scheduler import Scheduler
+from repositories.export_cache import ExportCacheRepository
+from services.attendance_service import AttendanceService
+from services.journal_service import JournalService
+from services.reminder_service import ReminderService
+
+logger = logging.getLogger(__name__)
+
+
+async def remind_unmarked_classes() -> int:
+    """
+    Davomati belgilanmagan sinflar xodimlariga eslatma yuborish.
+    
+    Xabarlar navbat orqali (tezlik limiti bilan) yuboriladi, natija
+    kutilmaydi. Eslatma olgan xodimlar sonini qaytaradi.
+    """
+    async for session in get_session():
+        reminders = await ReminderService(session).build_staff_reminders(date.today())
+    
+    for chat_id, text in reminders:
+        await outbox.submit(chat_id, text, priority=PRIORITY_NORMAL)
+    
+    if reminders:
+        logger.info(f"Belgilanmagan davomat eslatmasi: {len(reminders)} ta xodim")
+    return len(reminders)
+
+
+async def auto_finalize_attendance() -> dict:
+    """Muddati o'tgan to'liq kunlarni yakunlash, qolganlarini belgilash."""
+    cutoff = datetime.strptime(settings.FINALIZE_CUTOFF, "%H:%M").time()
+    async for session in get_session():
+        finalized, flagged = await AttendanceService(session).auto_finalize(datetime.now(), cutoff)
+    
+    if flagged:
+        logger.warning(f"To'liq belgilanmagan, muddati o'tgan kunlar: {flagged} ta")
+    return {"finalized": finalized, "incomplete": flagged}
+
+
+async def sweep_export_cache() -> int:
+    """
+    Davomati o'zgargan sinflarning eksport keshini tozalash.
+    
+    O'zgarishlar jurnalidan faqat oxirgi ko'rilgan ``seq`` dan keyingi
+    yozuvlar o'qiladi; kesh o'chirilishi va kursor bitta tranzaksiyada
+    saqlanadi. Qayta ishlangan jurnal yozuvlari sonini qaytaradi.
+    """
+    async for session in get_session():
+        cache_repo = ExportCacheRepository(session)
+        removed = 0
+        
+        async def invalidate(changes) -> None:
+            nonlocal removed
+            removed += await cache_repo.invalidate_classes({change.class_id for change in changes})
+        
+        processed = await JournalService(session).consume("export-cache", invalidate)
+    
+    if removed:
+        logger.info(f"Eskirgan eksport fayllari o'chirildi: {removed} ta")
+    return processed
+
+
+def register_jobs(scheduler: Scheduler) -> None:
+    """Barcha davriy ishlarni reestrga qo'shish (jadvali bo'sh bo'lganlari o'chirilgan)."""
+    if settings.REMINDER_SCHEDULE:
+        scheduler.register(
+            "unmarked-reminders",
+            settings.REMINDER_SCHEDULE,
+            remind_unmarked_classes,
+            jitter=settings.SCHEDULER_JITTER,
+        )
+    if settings.FINALIZE_SCHEDULE:
+        scheduler.register(
+            "auto-finalize",
+            settings.FINALIZE_SCHEDULE,
+            auto_finalize_attendance,
+            jitter=settings.SCHEDULER_JITTER,
+        )
+    if settings.EXPORT_CACHE_SCHEDULE:
+        scheduler.register(
+            "export-cache-sweep",
+            settings.EXPORT_CACHE_SCHEDULE,
+            sweep_export_cache,
+            jitter=settings.SCHEDULER_JITTER,
+        )
@@ -1,4 +1,5 @@
 """Inline keyboard builderlar."""
+from typing import Optional
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
 
@@ -22,6 +23,7 @@ def get_admin_menu_keyboard() -> InlineKeyboardMarkup:
         InlineKeyboardButton(text="👨‍💼 Adminlar", callback_data="a:menu:admins"),
     )
     builder.row(
+        InlineKeyboardButton(text="📣 E'lon", callback_data="a:menu:announce"),
         InlineKeyboardButton(text="⚙️ Sozlamalar", callback_data="a:menu:settings"),
     )
     return builder.as_markup()
@@ -76,6 +78,9 @@ def get_classes_list_keyboard(classes: list, show_create: bool = True) -> Inline
         builder.row(
             InlineKeyboardButton(text="➕ Yangi sinf", callback_data="a:cls:create")
         )
+        builder.row(
+            InlineKeyboardButton(text="📥 O'quvchilar importi", callback_data="a:import:students")
+        )
     
     # Orqaga
     builder.row(
@@ -95,6 +100,15 @@ def get_class_actions_keyboard(class_id: int) -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(text="📊 Excel yuklab olish", callback_data=f"a:cls:{class_id}:excel")
     )
+    builder.row(
+        InlineKeyboardButton(text="🖨 Davomat jurnali (PDF)", callback_data=f"a:cls:{class_id}:pdf")
+    )
+    builder.row(
+        InlineKeyboardButton(text="📥 Davomat yozuvlari (CSV)", callback_data=f"a:raw:{class_id}")
+    )
+    builder.row(
+        InlineKeyboardButton(text="🔀 O'quvchilarni ko'chirish", callback_data=f"a:mv:{class_id}")
+    )
     builder.row(
         InlineKeyboardButton(text="🗑 O'chirish", callback_data=f"a:cls:{class_id}:delete")
     )
@@ -105,6 +119,69 @@ def get_class_actions_keyboard(class_id: int) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+def get_export_months_keyboard(class_id: int, action: str, count: int = 6) -> InlineKeyboardMarkup:
+    """Eksport uchun oy tanlash keyboard (joriy va oldingi oylar)."""
+    from datetime import date
+    from utils.dates import get_month_name, shift_month
+    
+    builder = InlineKeyboardBuilder()
+    today = date.today()
+    
+    for delta in range(count):
+        year, month = shift_month(today.year, today.month, -delta)
+        builder.add(InlineKeyboardButton(
+            text=f"{get_month_name(month)} {year}",
+            callback_data=f"a:cls:{class_id}:{action}:{year:04d}{month:02d}"
+        ))
+    builder.adjust(3)
+    
+    builder.row(
+        InlineKeyboardButton(text="◀️ Orqaga", callback_data=f"a:cls:{class_id}")
+    )
+    
+    return builder.as_markup()
+
+
+def get_raw_export_keyboard(class_id: int = 0) -> InlineKeyboardMarkup:
+    """Xom davomat eksporti uchun oraliq tanlash (class_id=0 - barcha sinflar)."""
+    builder = InlineKeyboardBuilder()
+    
+    builder.row(
+        InlineKeyboardButton(text="📅 Bu oy", callback_data=f"a:raw:{class_id}:month"),
+        InlineKeyboardButton(text="📅 O'tgan oy", callback_data=f"a:raw:{class_id}:prev"),
+    )
+    builder.row(
+        InlineKeyboardButton(text="🎓 O'quv yili", callback_data=f"a:raw:{class_id}:year"),
+        InlineKeyboardButton(text="✏️ Boshqa oraliq", callback_data=f"a:raw:{class_id}:custom"),
+    )
+    builder.row(
+        InlineKeyboardButton(
+            text="◀️ Orqaga",
+            callback_data=f"a:cls:{class_id}" if class_id else "a:menu:reports",
+        )
+    )
+    
+    return builder.as_markup()
+
+
+def get_archive_keyboard() -> InlineKeyboardMarkup:
+    """Maktab arxivi uchun davr tanlash."""
+    builder = InlineKeyboardBuilder()
+    
+    builder.row(
+        InlineKeyboardButton(text="📅 Joriy chorak", callback_data="a:archive:term"),
+        InlineKeyboardButton(text="📅 O'tgan chorak", callback_data="a:archive:prev"),
+    )
+    builder.row(
+        InlineKeyboardButton(text="🎓 O'quv yili", callback_data="a:archive:year")
+    )
+    builder.row(
+        InlineKeyboardButton(text="◀️ Orqaga", callback_data="a:menu:reports")
+    )
+    
+    return builder.as_markup()
+
+
 def get_confirm_keyboard(callback_yes: str, callback_no: str = "cancel") -> InlineKeyboardMarkup:
     """Tasdiqlash keyboard."""
     builder = InlineKeyboardBuilder()
@@ -249,13 +326,24 @@ def get_students_list_keyboard(
     students: list,
     class_id: int,
     show_add: bool = True,
+    stats: Optional[dict] = None,
 ) -> InlineKeyboardMarkup:
-    """O'quvchilar ro'yxati keyboard."""
+    """O'quvchilar ro'yxati keyboard (stats berilsa - chorak davomat foizi bilan)."""
+    from reports.generator import ReportGenerator
+    
     builder = InlineKeyboardBuilder()
     
     for student in students:
+        text = f"👤 {student.full_name}"
+        student_stats = stats.get(student.id) if stats else None
+        if student_stats is not None:
+            rate = ReportGenerator.attendance_rate(
+                student_stats.present, student_stats.late, student_stats.absent
+            )
+            if rate is not None:
+                text += f" · {rate:.0f}%"
         builder.add(InlineKeyboardButton(
-            text=f"👤 {student.full_name}",
+            text=text,
             callback_data=f"s:students:{student.id}:actions"
         ))
     
@@ -266,7 +354,11 @@ def get_students_list_keyboard(
             InlineKeyboardButton(
                 text="➕ Yangi o'quvchi",
                 callback_data=f"s:students:{class_id}:add"
-            )
+            ),
+            InlineKeyboardButton(
+                text="📄 Fayldan import",
+                callback_data=f"s:students:{class_id}:import"
+            ),
         )
     
     builder.row(
@@ -349,6 +441,89 @@ def get_transfer_target_classes_keyboard(
     return builder.as_markup()
 
 
+def get_move_mode_keyboard(class_id: int) -> InlineKeyboardMarkup:
+    """Ommaviy ko'chirish - butun sinf yoki tanlangan o'quvchilar."""
+    builder = InlineKeyboardBuilder()
+    
+    builder.row(
+        InlineKeyboardButton(text="👥 Butun sinf", callback_data=f"a:mv:{class_id}:all:to")
+    )
+    builder.row(
+        InlineKeyboardButton(text="☑️ O'quvchilarni tanlash", callback_data=f"a:mv:{class_id}:pick")
+    )
+    builder.row(
+        InlineKeyboardButton(text="◀️ Orqaga", callback_data=f"a:cls:{class_id}")
+    )
+    
+    return builder.as_markup()
+
+
+def get_move_students_keyboard(
+    students: list,
+    class_id: int,
+    selected: set[int],
+) -> InlineKeyboardMarkup:
+    """Ko'chiriladigan o'quvchilarni belgilash (bosilganda belgi almashadi)."""
+    builder = InlineKeyboardBuilder()
+    
+    for student in students:
+        mark = "✅" if student.id in selected else "⬜"
+        builder.add(InlineKeyboardButton(
+            text=f"{mark} {student.full_name}",
+            callback_data=f"a:mv:{class_id}:t:{student.id}"
+        ))
+    
+    builder.adjust(1)
+    
+    builder.row(
+        InlineKeyboardButton(
+            text=f"➡️ Davom etish ({len(selected)} ta)",
+            callback_data=f"a:mv:{class_id}:sel:to"
+        )
+    )
+    builder.row(
+        InlineKeyboardButton(text="◀️ Orqaga", callback_data=f"a:mv:{class_id}")
+    )
+    
+    return builder.as_markup()
+
+
+def get_move_target_keyboard(classes: list, class_id: int, mode: str) -> InlineKeyboardMarkup:
+    """Ommaviy ko'chirish - maqsad sinf."""
+    builder = InlineKeyboardBuilder()
+    
+    for class_obj in classes:
+        if class_obj.id == class_id:
+            continue
+        builder.add(InlineKeyboardButton(
+            text=f"📚 {class_obj.name}",
+            callback_data=f"a:mv:{class_id}:{mode}:to:{class_obj.id}"
+        ))
+    
+    builder.adjust(2)
+    
+    builder.row(
+        InlineKeyboardButton(text="◀️ Orqaga", callback_data=f"a:mv:{class_id}")
+    )
+    
+    return builder.as_markup()
+
+
+def get_move_preview_keyboard(class_id: int, mode: str, target_id: int) -> InlineKeyboardMarkup:
+    """Ommaviy ko'chirish - tasdiqlash yoki sinov (dry-run)."""
+    builder = InlineKeyboardBuilder()
+    
+    builder.row(
+        InlineKeyboardButton(text="✅ Ko'chirish", callback_data=f"a:mv:{class_id}:{mode}:go:{target_id}"),
+        InlineKeyboardButton(text="🧪 Sinov", callback_data=f"a:mv:{class_id}:{mode}:dry:{target_id}"),
+    )
+    builder.row(
+        InlineKeyboardButton(text="❌ Bekor qilish", callback_data=f"a:mv:{class_id}")
+    )
+    
+    return builder.as_markup()
+
+
 def get_reports_menu_keyboard() -> InlineKeyboardMarkup:
     """Hisobotlar menyusi keyboard."""
     builder = InlineKeyboardBuilder()
@@ -356,9 +531,18 @@ def get_reports_menu_keyboard() -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(text="📅 Bugungi hisobot", callback_data="a:reports:daily")
     )
+    builder.row(
+        InlineKeyboardButton(text="⏳ Belgilanmagan sinflar", callback_data="a:reports:unmarked")
+    )
     builder.row(
         InlineKeyboardButton(text="📚 Sinf hisoboti", callback_data="a:reports:classes")
     )
+    builder.row(
+        InlineKeyboardButton(text="📥 Davomat yozuvlari (CSV)", callback_data="a:raw:0")
+    )
+    builder.row(
+        InlineKeyboardButton(text="🗂 Maktab arxivi (ZIP)", callback_data="a:archive")
+    )
     builder.row(
         InlineKeyboardButton(text="◀️ Orqaga", callback_data="back_to_menu")
     )
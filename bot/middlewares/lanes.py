@@ -0,0 +1,35 @@
+"""Handler'larni interaktiv yoki og'ir yo'lakka yo'naltirish."""
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import TelegramObject
+
+from core.lanes import LANE_HEAVY, LANE_INTERACTIVE, HeavyLane
+
+
+class LaneMiddleware(BaseMiddleware):
+    """
+    ``flags={"lane": "heavy"}`` bilan belgilangan handler'larni og'ir
+    yo'lakda fonda bajaradi, shunda update worker darhol bo'shaydi.
+    Qolgan handler'lar odatdagidek (interaktiv) bajariladi.
+
+    Og'ir handler uchun natija sifatida fon task'i qaytadi - outer
+    middleware'lar (masalan, takroriy bosish kaliti) ish tugashini
+    shu orqali kutishi mumkin.
+    """
+
+    def __init__(self, lane: HeavyLane):
+        self.lane = lane
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if get_flag(data, "lane", default=LANE_INTERACTIVE) != LANE_HEAVY:
+            return await handler(event, data)
+
+        handler_name = data["handler"].callback.__name__
+        return self.lane.spawn(lambda: handler(event, data), name=f"heavy:{handler_name}")
@@ -0,0 +1,132 @@
+"""Update'larni cheklangan parallellik va chat bo'yicha tartib bilan qayta ishlash."""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[Any]]
+
+queue_depth = metrics.gauge(
+    "updates_queue_depth", "Navbatda kutayotgan update'lar soni"
+)
+queue_wait = metrics.histogram(
+    "updates_queue_wait_seconds", "Update navbatda kutgan vaqt"
+)
+processing_time = metrics.histogram(
+    "updates_processing_seconds", "Update'ni qayta ishlash vaqti"
+)
+failed_updates = metrics.counter(
+    "updates_failed_total", "Xato bilan tugagan update'lar"
+)
+
+
+class ChatOrderedExecutor:
+    """
+    Update'larni worker'lar pulida bajarish.
+
+    Turli chatlar parallel (``workers`` tagacha), bitta chat update'lari
+    esa qat'iy ketma-ket bajariladi. Navbat to'lganda ``submit`` kutadi,
+    shu orqali polling sekinlashadi (backpressure).
+    """
+
+    def __init__(self, workers: int = 8, queue_size: int = 100):
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._capacity = asyncio.Semaphore(self.queue_size)
+        # Hozir biror worker band qilgan chatlar va ularning kutayotgan ishlari
+        self._active: dict[Hashable, deque] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Worker'larni ishga tushirish."""
+        if self._tasks:
+            return
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"update-worker-{i}"))
+        logger.info(f"Update worker'lari ishga tushdi: {self.workers} ta, navbat: {self.queue_size}")
+
+    async def submit(self, key: Hashable, job: Job) -> None:
+        """Ishni navbatga qo'yish (navbat to'la bo'lsa kutadi)."""
+        await self._capacity.acquire()
+        queue_depth.inc()
+        loop = asyncio.get_running_loop()
+        await self._ready.put((key, job, loop.time()))
+
+    async def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Navbatdagi ishlarni tugatib, worker'larni to'xtatish."""
+        try:
+            await asyncio.wait_for(self._ready.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Update navbati to'liq bo'shamadi, worker'lar to'xtatilmoqda.")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _worker(self) -> None:
+        while True:
+            key, job, enqueued_at = await self._ready.get()
+            backlog = self._active.get(key)
+            if backlog is not None:
+                # Chat boshqa worker'da - tartibni saqlash uchun unga topshiramiz
+                backlog.append((job, enqueued_at))
+                self._ready.task_done()
+                continue
+
+            backlog = deque()
+            self._active[key] = backlog
+            try:
+                await self._run(job, enqueued_at)
+                while backlog:
+                    await self._run(*backlog.popleft())
+            finally:
+                del self._active[key]
+                self._ready.task_done()
+
+    async def _run(self, job: Job, enqueued_at: float) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        queue_depth.dec()
+        queue_wait.observe(started - enqueued_at)
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            failed_updates.inc()
+            logger.exception("Update'ni qayta ishlashda xatolik")
+        finally:
+            processing_time.observe(loop.time() - started)
+            self._capacity.release()
+
+
+class ChatOrderingMiddleware(BaseMiddleware):
+    """Update'larni ``ChatOrderedExecutor`` orqali bajaruvchi outer middleware."""
+
+    def __init__(self, executor: ChatOrderedExecutor):
+        self.executor = executor
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        chat = data.get("event_chat")
+        user = data.get("event_from_user")
+        if chat is not None:
+            key = ("chat", chat.id)
+        elif user is not None:
+            key = ("user", user.id)
+        else:
+            key = ("update", event.update_id)
+
+        await self.executor.submit(key, lambda: handler(event, data))
@@ -0,0 +1,192 @@
+"""Foydalanuvchi bo'yicha throttling va takroriy callback'larni bostirish."""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+from core.metrics import metrics
+
+throttled_updates = metrics.counter("updates_throttled_total", "Limitdan oshgan update'lar")
+duplicate_updates = metrics.counter("updates_duplicate_total", "Takroriy update'lar")
+tracked_keys = metrics.gauge("throttling_tracked_keys", "Xotirada saqlanayotgan kalitlar")
+
+# Telegram qayta yuborgan update'lar shu vaqt ichida tanib olinadi
+UPDATE_TTL = 60.0
+# Callback kaliti update qayta ishlanib bo'lgach bo'shatiladi; bu faqat
+# zaxira - bo'shatish yetib kelmasa (masalan, navbatga qo'yishda xato)
+# bir xil tugma shuncha vaqtdan ortiq bloklanmaydi
+IN_FLIGHT_TTL = 10.0
+
+
+class TTLSet:
+    """Hajmi cheklangan, yozuvlari TTL bilan eskiradigan to'plam."""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        # TTL bir xil, shuning uchun qo'shilish tartibi = eskirish tartibi
+        self._items: OrderedDict[Hashable, float] = OrderedDict()
+
+    def add(self, key: Hashable, now: float) -> bool:
+        """Kalitni qo'shish. Agar u allaqachon bo'lsa False qaytaradi."""
+        self._expire(now)
+        if key in self._items:
+            return False
+        self._items[key] = now + self.ttl
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    def _expire(self, now: float) -> None:
+        while self._items:
+            key, expires_at = next(iter(self._items.items()))
+            if expires_at > now:
+                break
+            del self._items[key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class TokenBuckets:
+    """Foydalanuvchilar uchun token bucket'lar (LRU bo'yicha cheklangan)."""
+
+    def __init__(self, rate: float, burst: int, max_size: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_size = max(1, max_size)
+        self._buckets: OrderedDict[Hashable, list[float]] = OrderedDict()
+
+    def consume(self, key: Hashable, now: float) -> bool:
+        """Bitta token olish. Token qolmagan bo'lsa False qaytaradi."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            # Yangi (yoki chiqarib yuborilgan) bucket to'la hisoblanadi
+            bucket = [float(self.burst), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            tokens, last = bucket
+            bucket[0] = min(self.burst, tokens + (now - last) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Outer update middleware.
+
+    - Bir xil ``update_id`` qayta kelsa tashlab yuboriladi.
+    - Bir xil ``(user_id, callback_data)`` oldingisi hali bajarilayotganda
+      (navbatda yoki handler'da) bosilsa, callback darhol javoblanadi va
+      handler'ga yetib bormaydi. Update qayta ishlanib bo'lgach kalit
+      ``release_middleware`` orqali bo'shaydi - o'zgarmas tugmalarni qayta
+      bosish (belgilash va olib tashlash, yangilash) odatdagidek ishlaydi.
+    - Har bir foydalanuvchi token bucket bilan cheklanadi.
+    """
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        burst: int = 5,
+        max_keys: int = 10000,
+    ):
+        self.buckets = TokenBuckets(rate=rate, burst=burst, max_size=max_keys)
+        self.recent_updates = TTLSet(ttl=UPDATE_TTL, max_size=max_keys)
+        self.in_flight = TTLSet(ttl=IN_FLIGHT_TTL, max_size=max_keys)
+        self.release_middleware = CallbackReleaseMiddleware(self.in_flight)
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        now = time.monotonic()
+
+        if not self.recent_updates.add(event.update_id, now):
+            duplicate_updates.inc(kind="update")
+            return None
+
+        user = data.get("event_from_user")
+        callback = event.callback_query
+
+        try:
+            key = None
+            if callback is not None and user is not None:
+                key = (user.id, callback.data)
+                if not self.in_flight.add(key, now):
+                    duplicate_updates.inc(kind="callback")
+                    await callback.answer()
+                    return None
+
+            if user is not None and not self.buckets.consume(user.id, now):
+                throttled_updates.inc()
+                if key is not None:
+                    self.in_flight.discard(key)
+                if callback is not None:
+                    await callback.answer("⏳ Juda tez. Biroz kuting...")
+                return None
+        finally:
+            tracked_keys.set(
+                len(self.buckets) + len(self.recent_updates) + len(self.in_flight)
+            )
+
+        try:
+            return await handler(event, data)
+        except BaseException:
+            # Update navbatga ham tushmadi - release_middleware ishlamaydi
+            if key is not None:
+                self.in_flight.discard(key)
+            raise
+
+
+class CallbackReleaseMiddleware(BaseMiddleware):
+    """
+    Update qayta ishlanib bo'lgach ``(user_id, callback_data)`` kalitini bo'shatish.
+
+    Outer update middleware sifatida ``ChatOrderingMiddleware`` dan keyin
+    ro'yxatdan o'tkaziladi, ya'ni update worker'ida butun qayta ishlashni
+    o'raydi: mos handler topilmasa yoki xato bo'lsa ham kalit bo'shaydi.
+    Handler og'ir yo'lakka yuborilgan bo'lsa (``LaneMiddleware`` fon
+    task'ini qaytaradi), kalit shu task tugaganda bo'shaydi.
+    """
+
+    def __init__(self, in_flight: TTLSet):
+        self.in_flight = in_flight
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if event.callback_query is None or user is None:
+            return await handler(event, data)
+
+        key = (user.id, event.callback_query.data)
+        result = None
+        try:
+            result = await handler(event, data)
+            return result
+        finally:
+            if isinstance(result, asyncio.Task) and not result.done():
+                result.add_done_callback(lambda _: self.in_flight.discard(key))
+            else:
+                self.in_flight.discard(key)
@@ -0,0 +1,342 @@
+"""Chiquvchi xabarlar navbati - Telegram limitlariga mos tezlikda yuborish."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+from aiogram.types import Message
+
+from bot.session import retries_disabled
+from core.config import settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+outbox_queued = metrics.gauge("outbox_queued", "Navbatdagi chiquvchi xabarlar")
+outbox_sent = metrics.counter("outbox_sent_total", "Yuborilgan xabarlar")
+outbox_failed = metrics.counter("outbox_failed_total", "Yuborilmagan xabarlar")
+outbox_retries = metrics.counter("outbox_retries_total", "Qayta yuborishlar")
+outbox_dead_chats = metrics.gauge("outbox_dead_chats", "Botni bloklagan chatlar")
+outbox_wait = metrics.histogram(
+    "outbox_wait_seconds",
+    "Xabarning navbatda kutgan vaqti",
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0),
+)
+
+
+class ChatUnavailable(Exception):
+    """Chat botni bloklagan yoki mavjud emas - xabar yuborilmaydi."""
+
+
+@dataclass(order=True)
+class OutgoingMessage:
+    priority: int
+    seq: int
+    chat_id: int = field(compare=False)
+    text: str = field(compare=False)
+    kwargs: dict[str, Any] = field(compare=False, default_factory=dict)
+    future: Optional[asyncio.Future] = field(compare=False, default=None)
+    created_at: float = field(compare=False, default=0.0)
+    attempts: int = field(compare=False, default=0)
+
+
+class Outbox:
+    """
+    Chiquvchi xabarlar navbati.
+
+    - Umumiy tezlik ``rate`` xabar/soniya bilan cheklanadi, xabarlar bir
+      tekis oraliqda yuboriladi (to'plab yuborilmaydi).
+    - Bitta chatga ketma-ket xabarlar orasida kamida ``chat_interval``
+      soniya o'tadi.
+    - Navbat ustuvorlik (``PRIORITY_*``), so'ng qo'shilish tartibida
+      bo'shatiladi.
+    - 429 javobida xabar ``retry_after`` dan keyin qayta yuboriladi va
+      shu vaqt davomida butun navbat to'xtab turadi.
+    - Botni bloklagan chatlar "dead letter" ro'yxatiga tushadi va ularga
+      boshqa xabar yuborilmaydi.
+    """
+
+    def __init__(
+        self,
+        rate: float = 30.0,
+        chat_interval: float = 1.0,
+        concurrency: int = 10,
+        queue_size: int = 10000,
+        max_retries: int = 3,
+        dead_letter_size: int = 1000,
+    ):
+        self.set_rate(rate)
+        self.chat_interval = chat_interval
+        self.max_retries = max(0, max_retries)
+        self.dead_chats: set[int] = set()
+        self.dead_letters: deque[OutgoingMessage] = deque(maxlen=dead_letter_size)
+
+        self._bot: Optional[Bot] = None
+        self._ready: list[OutgoingMessage] = []
+        # (qachon yuborish mumkin, xabar) - chat limiti yoki 429 sababli kechiktirilganlar
+        self._delayed: list[tuple[float, OutgoingMessage]] = []
+        self._chat_next: dict[int, float] = {}
+        self._capacity = asyncio.Semaphore(max(1, queue_size))
+        self._in_flight = asyncio.Semaphore(max(1, concurrency))
+        self._wakeup = asyncio.Event()
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._sender: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Umumiy tezlikni o'rnatish (xabar/soniya, 0 - cheklovsiz).
+
+        Klaster rejimida har bir worker o'z navbatiga ega, shuning uchun
+        worker'lar ``OUTBOX_RATE`` ni o'zaro bo'lib oladi.
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+
+    def start(self, bot: Bot) -> None:
+        """Yuboruvchi task'ni ishga tushirish."""
+        self._bot = bot
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.create_task(self._run(), name="outbox-sender")
+
+    async def submit(
+        self,
+        chat_id: int,
+        text: str,
+        priority: int = PRIORITY_NORMAL,
+        **kwargs: Any,
+    ) -> asyncio.Future:
+        """
+        Xabarni navbatga qo'yish.
+
+        Navbat to'la bo'lsa joy bo'shaguncha kutadi. Natija ``Future``
+        orqali qaytadi: uni kutish shart emas (fire-and-forget), kutilsa
+        ``Message`` yoki xatolik olinadi.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(_consume_exception)
+
+        if chat_id in self.dead_chats:
+            future.set_exception(ChatUnavailable(chat_id))
+            outbox_failed.inc(reason="dead_chat")
+            return future
+
+        await self._capacity.acquire()
+        message = OutgoingMessage(
+            priority=priority,
+            seq=next(self._seq),
+            chat_id=chat_id,
+            text=text,
+            kwargs=kwargs,
+            future=future,
+            created_at=time.monotonic(),
+        )
+        heapq.heappush(self._ready, message)
+        outbox_queued.inc()
+        self._wakeup.set()
+        return future
+
+    async def send(
+        self,
+        chat_id: int,
+        text: str,
+        priority: int = PRIORITY_NORMAL,
+        **kwargs: Any,
+    ) -> Message:
+        """Xabarni navbat orqali yuborish va natijasini kutish."""
+        return await (await self.submit(chat_id, text, priority, **kwargs))
+
+    async def broadcast(
+        self,
+        chat_ids: Iterable[int],
+        text: str,
+        priority: int = PRIORITY_LOW,
+        **kwargs: Any,
+    ) -> tuple[int, int]:
+        """
+        Bir xil xabarni ko'p chatga yuborish.
+
+        Barcha xabarlar yuborilguncha kutadi va (yuborilgan, yuborilmagan)
+        sonlarini qaytaradi.
+        """
+        futures = [
+            await self.submit(chat_id, text, priority, **kwargs)
+            for chat_id in dict.fromkeys(chat_ids)
+            if chat_id
+        ]
+        if not futures:
+            return 0, 0
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        failed = sum(1 for result in results if isinstance(result, BaseException))
+        return len(results) - failed, failed
+
+    def pending(self) -> int:
+        """Navbatdagi (hali yuborilmagan) xabarlar soni."""
+        return len(self._ready) + len(self._delayed)
+
+    async def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Navbatni ``timeout`` soniyagacha bo'shatib, to'xtatish."""
+        deadline = time.monotonic() + timeout if timeout is not None else float("inf")
+        while (self.pending() or self._tasks) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+            self._sender = None
+        for task in list(self._tasks):
+            task.cancel()
+
+        # Yuborilmay qolgan xabarlar
+        for _, message in self._delayed:
+            self._ready.append(message)
+        for message in self._ready:
+            self._finish(message, cancelled=True)
+        self._ready.clear()
+        self._delayed.clear()
+
+    async def _run(self) -> None:
+        next_slot = time.monotonic()
+        while True:
+            message = await self._next_message()
+            await self._in_flight.acquire()
+
+            # Umumiy limit: xabarlar orasida bir xil oraliq
+            now = time.monotonic()
+            next_slot = max(next_slot, now, self._paused_until)
+            if next_slot > now:
+                await asyncio.sleep(next_slot - now)
+            next_slot += self.interval
+
+            task = asyncio.create_task(self._deliver(message))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _next_message(self) -> OutgoingMessage:
+        """Hozir yuborish mumkin bo'lgan eng ustuvor xabarni olish."""
+        while True:
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, message = heapq.heappop(self._delayed)
+                heapq.heappush(self._ready, message)
+
+            while self._ready:
+                message = heapq.heappop(self._ready)
+                if message.chat_id in self.dead_chats:
+                    self._finish(message, exc=ChatUnavailable(message.chat_id))
+                    outbox_failed.inc(reason="dead_chat")
+                    continue
+                chat_ready_at = self._chat_next.get(message.chat_id, 0.0)
+                if chat_ready_at > now:
+                    heapq.heappush(self._delayed, (chat_ready_at, message))
+                    continue
+                self._chat_next[message.chat_id] = now + self.chat_interval
+                return message
+
+            self._wakeup.clear()
+            timeout = self._delayed[0][0] - now if self._delayed else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._prune_chat_limits(now)
+
+    async def _deliver(self, message: OutgoingMessage) -> None:
+        try:
+            # 429 ni session emas, navbatning o'zi qayta rejalashtiradi
+            with retries_disabled():
+                result = await self._bot.send_message(message.chat_id, message.text, **message.kwargs)
+        except TelegramRetryAfter as e:
+            if message.attempts >= self.max_retries:
+                outbox_failed.inc(reason="retry_after")
+                self._finish(message, exc=e)
+                return
+            message.attempts += 1
+            outbox_retries.inc()
+            retry_at = time.monotonic() + e.retry_after
+            self._paused_until = max(self._paused_until, retry_at)
+            self._chat_next[message.chat_id] = retry_at
+            heapq.heappush(self._delayed, (retry_at, message))
+            self._wakeup.set()
+            logger.warning(f"Outbox: 429, {e.retry_after} s kutiladi")
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            if isinstance(e, TelegramBadRequest) and "chat not found" not in e.message.lower():
+                outbox_failed.inc(reason="bad_request")
+                self._finish(message, exc=e)
+                return
+            self.dead_chats.add(message.chat_id)
+            self.dead_letters.append(message)
+            outbox_dead_chats.set(len(self.dead_chats))
+            outbox_failed.inc(reason="blocked")
+            logger.info(f"Outbox: chat {message.chat_id} mavjud emas yoki botni bloklagan")
+            self._finish(message, exc=ChatUnavailable(message.chat_id))
+        except asyncio.CancelledError:
+            self._finish(message, cancelled=True)
+            raise
+        except Exception as e:
+            outbox_failed.inc(reason=type(e).__name__)
+            self._finish(message, exc=e)
+        else:
+            outbox_sent.inc(priority=str(message.priority))
+            self._finish(message, result=result)
+        finally:
+            self._in_flight.release()
+
+    def _finish(
+        self,
+        message: OutgoingMessage,
+        result: Any = None,
+        exc: Optional[BaseException] = None,
+        cancelled: bool = False,
+    ) -> None:
+        outbox_queued.dec()
+        outbox_wait.observe(time.monotonic() - message.created_at)
+        self._capacity.release()
+        future = message.future
+        if future is None or future.done():
+            return
+        if cancelled:
+            future.cancel()
+        elif exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _prune_chat_limits(self, now: float) -> None:
+        if len(self._chat_next) > 10000:
+            self._chat_next = {
+                chat_id: ready_at for chat_id, ready_at in self._chat_next.items() if ready_at > now
+            }
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Kutilmagan (fire-and-forget) future'lardagi xatolik log'ni to'ldirmasin
+    if not future.cancelled():
+        future.exception()
+
+
+outbox = Outbox(
+    rate=settings.OUTBOX_RATE,
+    chat_interval=settings.OUTBOX_CHAT_INTERVAL,
+    concurrency=settings.OUTBOX_CONCURRENCY,
+    queue_size=settings.OUTBOX_QUEUE_SIZE,
+    max_retries=settings.OUTBOX_MAX_RETRIES,
+)
@@ -0,0 +1,115 @@
+"""Bot API uchun sozlanadigan HTTP session (pool, retry, metrikalar)."""
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import PRODUCTION, TelegramAPIServer
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from aiogram.methods import TelegramMethod
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+request_latency = metrics.histogram(
+    "bot_api_request_seconds",
+    "Bot API so'rovlari davomiyligi",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+request_errors = metrics.counter("bot_api_errors_total", "Bot API xatolari")
+request_retries = metrics.counter("bot_api_retries_total", "Bot API qayta urinishlari")
+
+_retries_enabled: ContextVar[bool] = ContextVar("bot_api_retries_enabled", default=True)
+
+
+@contextmanager
+def retries_disabled() -> Iterator[None]:
+    """Joriy task ichida qayta urinishlarni o'chirish (chaqiruvchi o'zi qayta uringanda)."""
+    token = _retries_enabled.set(False)
+    try:
+        yield
+    finally:
+        _retries_enabled.reset(token)
+
+
+class TunedAiohttpSession(AiohttpSession):
+    """
+    ``AiohttpSession`` kengaytmasi.
+
+    - Ulanishlar puli hajmi va keep-alive vaqti sozlanadi.
+    - 429 javobida ``retry_after`` kutiladi, 5xx xatolarida esa
+      exponential backoff bilan qayta uriniladi. Tarmoq xatolarida faqat
+      o'qish metodlari (``get*``) qayta yuboriladi, aks holda xabar
+      ikki marta ketishi mumkin.
+    - Har bir metod uchun davomiylik va xatolar soni yoziladi.
+    """
+
+    def __init__(
+        self,
+        api: TelegramAPIServer = PRODUCTION,
+        limit: int = 100,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        **kwargs: Any,
+    ):
+        super().__init__(api=api, limit=limit, timeout=timeout, **kwargs)
+        self._connector_init["keepalive_timeout"] = keepalive_timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[Any],
+        timeout: Optional[int] = None,
+    ) -> Any:
+        name = method.__api_method__
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                result = await super().make_request(bot, method, timeout=timeout)
+            except TelegramRetryAfter as e:
+                self._record(name, started, "retry_after")
+                error, delay = e, e.retry_after
+            except TelegramServerError as e:
+                self._record(name, started, "server_error")
+                error, delay = e, self._backoff_delay(attempt)
+            except TelegramNetworkError as e:
+                self._record(name, started, "network_error")
+                if not name.startswith("get"):
+                    raise
+                error, delay = e, self._backoff_delay(attempt)
+            except Exception as e:
+                self._record(name, started, type(e).__name__)
+                raise
+            else:
+                self._record(name, started)
+                return result
+
+            if attempt >= self.max_retries or not _retries_enabled.get():
+                raise error
+            attempt += 1
+            request_retries.inc(method=name)
+            logger.warning(f"{name}: {delay:.1f} s dan keyin qayta urinish ({attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _record(name: str, started: float, error: Optional[str] = None) -> None:
+        request_latency.observe(time.monotonic() - started, method=name)
+        if error:
+            request_errors.inc(method=name, error=error)
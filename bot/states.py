@@ -12,9 +12,21 @@ class AdminStates(StatesGroup):
     waiting_staff_phone = State()
     waiting_staff_name = State()
     
+    # Xodimlarni fayldan import qilish
+    waiting_staff_file = State()
+    
     # Admin qo'shish
     waiting_admin_phone = State()
     waiting_admin_name = State()
+    
+    # E'lon yuborish
+    waiting_announcement_text = State()
+    
+    # Davomat eksporti uchun sanalar oralig'i
+    waiting_export_range = State()
+    
+    # O'quvchilarni fayldan import qilish (barcha sinflar)
+    waiting_students_file = State()
 
 
 class StaffStates(StatesGroup):
@@ -22,3 +34,6 @@ class StaffStates(StatesGroup):
     
     # O'quvchi qo'shish
     waiting_student_name = State()
+    
+    # O'quvchilarni fayldan import qilish
+    waiting_student_file = State()
@@ -0,0 +1 @@
+# FSM storage module
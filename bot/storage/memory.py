@@ -0,0 +1,139 @@
+"""Hajmi cheklangan, eskiradigan in-memory FSM storage."""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from copy import copy
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+fsm_live_keys = metrics.gauge("fsm_storage_keys", "Xotiradagi FSM yozuvlari soni")
+fsm_evicted = metrics.counter("fsm_storage_evicted_total", "Chiqarib yuborilgan FSM yozuvlari")
+
+
+@dataclass
+class _Record:
+    state: Optional[str] = None
+    data: dict[str, Any] = field(default_factory=dict)
+    last_access: float = 0.0
+
+
+class BoundedMemoryStorage(BaseStorage):
+    """
+    aiogram ``MemoryStorage`` o'rniga.
+
+    - Har bir yozuv ``ttl`` soniya ishlatilmasa eskiradi.
+    - Yozuvlar soni ``max_size`` dan oshsa, eng uzoq ishlatilmagani
+      chiqarib yuboriladi (LRU).
+    - Holati va ma'lumoti bo'sh yozuvlar saqlanmaydi.
+
+    Yozuvlar oxirgi murojaat tartibida saqlanadi, shuning uchun o'qish,
+    yozish va eskirganlarni tozalash O(1) (amortizatsiyalangan).
+    """
+
+    def __init__(self, ttl: float = 86400, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        self._records: OrderedDict[StorageKey, _Record] = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def start_sweeper(self, interval: float = 60.0) -> None:
+        """Eskirgan yozuvlarni davriy tozalashni boshlash."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop(interval), name="fsm-sweeper")
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Eskirgan yozuvlarni o'chirish. O'chirilganlar sonini qaytaradi."""
+        now = time.monotonic() if now is None else now
+        removed = 0
+        while self._records:
+            key, record = next(iter(self._records.items()))
+            if now - record.last_access < self.ttl:
+                break
+            del self._records[key]
+            removed += 1
+        if removed:
+            fsm_evicted.inc(removed, reason="ttl")
+        fsm_live_keys.set(len(self._records))
+        return removed
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        value = state.state if isinstance(state, State) else state
+        record = self._touch(key, create=value is not None)
+        if record is None:
+            return
+        record.state = value
+        self._drop_if_empty(key, record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = self._touch(key)
+        return record.state if record else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+        record = self._touch(key, create=bool(data))
+        if record is None:
+            return
+        record.data = data.copy()
+        self._drop_if_empty(key, record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        record = self._touch(key)
+        return copy(record.data) if record else {}
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _touch(self, key: StorageKey, create: bool = False) -> Optional[_Record]:
+        now = time.monotonic()
+        record = self._records.get(key)
+        if record is not None and now - record.last_access >= self.ttl:
+            del self._records[key]
+            fsm_evicted.inc(reason="ttl")
+            record = None
+
+        if record is None:
+            if not create:
+                return None
+            record = _Record()
+            self._records[key] = record
+            if len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+                fsm_evicted.inc(reason="lru")
+            fsm_live_keys.set(len(self._records))
+        else:
+            self._records.move_to_end(key)
+
+        record.last_access = now
+        return record
+
+    def _drop_if_empty(self, key: StorageKey, record: _Record) -> None:
+        if record.state is None and not record.data:
+            del self._records[key]
+            fsm_live_keys.set(len(self._records))
+
+    async def _sweep_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.sweep()
+            if removed:
+                logger.debug(f"Eskirgan FSM yozuvlari o'chirildi: {removed} ta")
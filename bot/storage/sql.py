@@ -0,0 +1,155 @@
+"""SQL database'da saqlanadigan FSM storage."""
+import json
+from datetime import datetime, timedelta
+from typing import Any, Mapping, Optional
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from sqlalchemy import and_, case, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.db.models import FsmRecord
+
+EMPTY_DATA = "{}"
+
+
+class SQLStorage(BaseStorage):
+    """
+    FSM holatlarini ``fsm_states`` jadvalida saqlash.
+
+    Holatlar bot qayta ishga tushganda yo'qolmaydi va bir nechta bot
+    jarayonlari bitta bazadan foydalanishi mumkin. Har bir yozuv ``ttl``
+    dan keyin eskiradi; eskirgan yozuvlar o'qishda yo'q deb hisoblanadi
+    va ``delete_expired`` bilan tozalanadi.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        ttl: int = 86400,
+        key_builder: Optional[KeyBuilder] = None,
+    ):
+        self.engine = engine
+        self.ttl = timedelta(seconds=ttl)
+        self.key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        value = state.state if isinstance(state, State) else state
+        now = datetime.utcnow()
+        await self._upsert(
+            self.key_builder.build(key),
+            now,
+            insert_values={"state": value, "data": EMPTY_DATA},
+            update_values={
+                "state": value,
+                # Eskirgan yozuvning eski ma'lumotlari qayta tirilmasligi kerak
+                "data": case((FsmRecord.expires_at <= now, EMPTY_DATA), else_=FsmRecord.data),
+            },
+        )
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        row = await self._get(key)
+        return row.state if row else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+
+        payload = json.dumps(data, ensure_ascii=False)
+        now = datetime.utcnow()
+        await self._upsert(
+            self.key_builder.build(key),
+            now,
+            insert_values={"state": None, "data": payload},
+            update_values={
+                "data": payload,
+                "state": case((FsmRecord.expires_at <= now, None), else_=FsmRecord.state),
+            },
+        )
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        row = await self._get(key)
+        return json.loads(row.data) if row else {}
+
+    async def delete_expired(self) -> int:
+        """Eskirgan yozuvlarni o'chirish. O'chirilganlar sonini qaytaradi."""
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                delete(FsmRecord).where(FsmRecord.expires_at <= datetime.utcnow())
+            )
+        return result.rowcount or 0
+
+    async def close(self) -> None:
+        pass
+
+    async def _get(self, key: StorageKey):
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(FsmRecord.state, FsmRecord.data).where(
+                    and_(
+                        FsmRecord.key == self.key_builder.build(key),
+                        FsmRecord.expires_at > datetime.utcnow(),
+                    )
+                )
+            )
+            return result.first()
+
+    async def _upsert(
+        self,
+        key: str,
+        now: datetime,
+        insert_values: dict[str, Any],
+        update_values: dict[str, Any],
+    ) -> None:
+        expires_at = now + self.ttl
+        async with self.engine.begin() as conn:
+            dialect = conn.dialect.name
+            if dialect in ("sqlite", "postgresql"):
+                if dialect == "sqlite":
+                    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+                else:
+                    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+                stmt = dialect_insert(FsmRecord).values(
+                    key=key, expires_at=expires_at, **insert_values
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[FsmRecord.key],
+                    set_={**update_values, "expires_at": expires_at},
+                )
+                await conn.execute(stmt)
+            else:
+                await self._update_or_insert(conn, key, expires_at, insert_values, update_values)
+
+            # Bo'sh yozuvlarni saqlab turishning hojati yo'q (state.clear())
+            await conn.execute(
+                delete(FsmRecord).where(
+                    and_(
+                        FsmRecord.key == key,
+                        FsmRecord.state.is_(None),
+                        FsmRecord.data == EMPTY_DATA,
+                    )
+                )
+            )
+
+    async def _update_or_insert(self, conn, key, expires_at, insert_values, update_values) -> None:
+        """ON CONFLICT qo'llab-quvvatlanmaydigan backend'lar uchun upsert."""
+        stmt = (
+            update(FsmRecord)
+            .where(FsmRecord.key == key)
+            .values(**update_values, expires_at=expires_at)
+        )
+        result = await conn.execute(stmt)
+        if result.rowcount:
+            return
+        try:
+            async with conn.begin_nested():
+                await conn.execute(
+                    insert(FsmRecord).values(key=key, expires_at=expires_at, **insert_values)
+                )
+        except IntegrityError:
+            # Parallel jarayon birinchi bo'lib yaratdi
+            await conn.execute(stmt)
@@ -0,0 +1,77 @@
+"""Webhook rejimi - aiohttp server."""
+import asyncio
+import logging
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from core.config import settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    """Metrikalarni Prometheus text formatida qaytarish."""
+    return web.Response(text=metrics.render_text(), content_type="text/plain")
+
+
+async def register_webhook(bot: Bot, allowed_updates: list[str]) -> None:
+    """Telegram'da webhook'ni o'rnatish (WEBHOOK_URL bo'lsa)."""
+    if not settings.WEBHOOK_URL:
+        logger.warning("WEBHOOK_URL o'rnatilmagan - Telegram'da webhook ro'yxatdan o'tkazilmaydi.")
+        return
+    await bot.set_webhook(
+        url=settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH,
+        secret_token=settings.WEBHOOK_SECRET or None,
+        allowed_updates=allowed_updates,
+    )
+    logger.info(f"Webhook o'rnatildi: {settings.WEBHOOK_URL}")
+
+
+def create_webhook_app(bot: Bot, dp: Dispatcher) -> web.Application:
+    """
+    Webhook uchun aiohttp ilovasini yaratish.
+
+    ``X-Telegram-Bot-Api-Secret-Token`` sarlavhasi ``WEBHOOK_SECRET`` bilan
+    tekshiriladi. Update navbatga tushgunicha so'rov javob qaytarmaydi,
+    shuning uchun navbat to'lganda Telegram ham sekinlashadi.
+    """
+    app = web.Application()
+
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.WEBHOOK_SECRET or None,
+        handle_in_background=False,
+    ).register(app, path=settings.WEBHOOK_PATH)
+    app.router.add_get("/metrics", metrics_handler)
+
+    # dp.startup / dp.shutdown hook'larini ilova lifecycle'iga ulash
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher) -> None:
+    """Webhook rejimida ishga tushirish."""
+    allowed_updates = dp.resolve_used_update_types()
+
+    async def set_webhook() -> None:
+        await register_webhook(bot, allowed_updates)
+
+    dp.startup.register(set_webhook)
+
+    app = create_webhook_app(bot, dp)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+    await site.start()
+    logger.info(
+        f"Webhook server ishga tushdi: http://{settings.WEBHOOK_HOST}:{settings.WEBHOOK_PORT}"
+        f"{settings.WEBHOOK_PATH}"
+    )
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -1,5 +1,6 @@
 """Konfiguratsiya sozlamalari."""
 import os
+from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -14,7 +15,54 @@ class Settings:
     # Bot
     BOT_TOKEN: str = os.getenv("BOT_TOKEN", "")
     SUPER_ADMIN_ID: int = int(os.getenv("SUPER_ADMIN_ID", "0"))
-
+    
+    # Bot API HTTP client (BOT_API_URL - lokal Bot API server yoki test uchun)
+    BOT_API_URL: str = os.getenv("BOT_API_URL", "")
+    BOT_API_POOL_LIMIT: int = int(os.getenv("BOT_API_POOL_LIMIT", "100"))
+    BOT_API_KEEPALIVE: float = float(os.getenv("BOT_API_KEEPALIVE", "30"))
+    BOT_API_TIMEOUT: float = float(os.getenv("BOT_API_TIMEOUT", "60"))
+    BOT_API_MAX_RETRIES: int = int(os.getenv("BOT_API_MAX_RETRIES", "3"))
+    BOT_API_BACKOFF: float = float(os.getenv("BOT_API_BACKOFF", "0.5"))
+    
+    # Chiquvchi xabarlar navbati (Telegram: ~30 xabar/s umumiy, 1 xabar/s bitta chatga)
+    OUTBOX_RATE: float = float(os.getenv("OUTBOX_RATE", "25"))
+    OUTBOX_CHAT_INTERVAL: float = float(os.getenv("OUTBOX_CHAT_INTERVAL", "1.0"))
+    OUTBOX_CONCURRENCY: int = int(os.getenv("OUTBOX_CONCURRENCY", "10"))
+    OUTBOX_QUEUE_SIZE: int = int(os.getenv("OUTBOX_QUEUE_SIZE", "10000"))
+    OUTBOX_MAX_RETRIES: int = int(os.getenv("OUTBOX_MAX_RETRIES", "3"))
+    
+    # O'quv choraklari boshlanishi (MM-DD, birinchisi - o'quv yili boshi)
+    ACADEMIC_TERMS: str = os.getenv("ACADEMIC_TERMS", "09-02,11-10,01-12,03-30")
+    
+    # Davriy ishlar (cron: "daqiqa soat kun oy hafta_kuni", bo'sh - o'chirilgan)
+    SCHEDULER_JITTER: float = float(os.getenv("SCHEDULER_JITTER", "20"))
+    # Ishni bajarayotgan jarayon o'lsa, boshqasi shu vaqtdan keyin o'z zimmasiga oladi
+    JOB_LEASE_TTL: float = float(os.getenv("JOB_LEASE_TTL", "30"))
+    REMINDER_SCHEDULE: str = os.getenv("REMINDER_SCHEDULE", "*/15 8-9 * * 1-6")
+    FINALIZE_SCHEDULE: str = os.getenv("FINALIZE_SCHEDULE", "10 * * * *")
+    # Jurnal bo'yicha o'zgargan sinflarning eksport keshini tozalash
+    EXPORT_CACHE_SCHEDULE: str = os.getenv("EXPORT_CACHE_SCHEDULE", "*/10 * * * *")
+    # Shu vaqtdan keyin kunning davomati muddati o'tgan hisoblanadi
+    FINALIZE_CUTOFF: str = os.getenv("FINALIZE_CUTOFF", "18:00")
+    
+    # Ishga tushirish rejimi: polling | webhook
+    RUN_MODE: str = os.getenv("RUN_MODE", "polling")
+    
+    # Webhook
+    WEBHOOK_URL: str = os.getenv("WEBHOOK_URL", "")
+    WEBHOOK_PATH: str = os.getenv("WEBHOOK_PATH", "/webhook")
+    WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")
+    WEBHOOK_HOST: str = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+    WEBHOOK_PORT: int = int(os.getenv("WEBHOOK_PORT", "8080"))
+    
+    # Bot jarayonlari soni (1 dan ko'p bo'lsa FSM_STORAGE=sql bo'lishi kerak)
+    BOT_WORKERS: int = int(os.getenv("BOT_WORKERS", "1"))
+    
+    # FSM storage: memory | sql
+    FSM_STORAGE: str = os.getenv("FSM_STORAGE", "memory")
+    FSM_TTL: int = int(os.getenv("FSM_TTL", "86400"))
+    FSM_MAX_KEYS: int = int(os.getenv("FSM_MAX_KEYS", "10000"))
+    FSM_SWEEP_INTERVAL: int = int(os.getenv("FSM_SWEEP_INTERVAL", "60"))
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./davomat.db")
@@ -22,6 +70,34 @@ class Settings:
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
+    # Update'larni qayta ishlash
+    UPDATE_WORKERS: int = int(os.getenv("UPDATE_WORKERS", "8"))
+    UPDATE_QUEUE_SIZE: int = int(os.getenv("UPDATE_QUEUE_SIZE", "100"))
+    
+    # Throttling va takroriy callback'lar
+    THROTTLE_RATE: float = float(os.getenv("THROTTLE_RATE", "3"))
+    THROTTLE_BURST: int = int(os.getenv("THROTTLE_BURST", "5"))
+    THROTTLE_MAX_KEYS: int = int(os.getenv("THROTTLE_MAX_KEYS", "10000"))
+    
+    # Og'ir ishlar yo'lagi (eksport, hisobotlar); HEAVY_PROCESSES - PDF render pul hajmi
+    HEAVY_WORKERS: int = int(os.getenv("HEAVY_WORKERS", "2"))
+    HEAVY_PROCESSES: int = int(os.getenv("HEAVY_PROCESSES", "2"))
+    HEAVY_DB_POOL_SIZE: int = int(os.getenv("HEAVY_DB_POOL_SIZE", "2"))
+    
+    # Eksport: DB kursoridan bir martada olinadigan qatorlar va
+    # fayl diskka o'tguncha xotirada saqlanadigan hajm (bayt)
+    EXPORT_FETCH_SIZE: int = int(os.getenv("EXPORT_FETCH_SIZE", "1000"))
+    EXPORT_SPOOL_SIZE: int = int(os.getenv("EXPORT_SPOOL_SIZE", str(4 * 1024 * 1024)))
+    # Maktab arxivi (ZIP) - parallel yaratiladigan sinf fayllari
+    ARCHIVE_WORKERS: int = int(os.getenv("ARCHIVE_WORKERS", "2"))
+    # PDF jurnal: TTF shrift (bo'sh - DejaVuSans qidiriladi) va keshdagi fayllar soni
+    PDF_FONT_PATH: str = os.getenv("PDF_FONT_PATH", "")
+    PDF_CACHE_SIZE: int = int(os.getenv("PDF_CACHE_SIZE", "64"))
+    
+    # Fayldan import: bitta INSERT paketidagi qatorlar va fayl hajmi chegarasi (bayt)
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    IMPORT_MAX_FILE_SIZE: int = int(os.getenv("IMPORT_MAX_FILE_SIZE", str(5 * 1024 * 1024)))
+    
     # Rollar
     ROLE_ADMIN = "admin"
     ROLE_STAFF = "xodim"
@@ -30,10 +106,40 @@ class Settings:
     STATUS_LATE = 2
     STATUS_ABSENT = 3
     
+    # Ishga tushirish rejimlari
+    RUN_MODE_POLLING = "polling"
+    RUN_MODE_WEBHOOK = "webhook"
+    
+    # FSM storage turlari
+    FSM_STORAGE_MEMORY = "memory"
+    FSM_STORAGE_SQL = "sql"
+    
     def validate(self) -> None:
         """Sozlamalarni tekshirish."""
         if not self.BOT_TOKEN:
             raise ValueError("BOT_TOKEN o'rnatilmagan!")
+        if self.RUN_MODE not in (self.RUN_MODE_POLLING, self.RUN_MODE_WEBHOOK):
+            raise ValueError(f"RUN_MODE noto'g'ri: {self.RUN_MODE}")
+        if self.RUN_MODE == self.RUN_MODE_WEBHOOK and not self.WEBHOOK_PATH.startswith("/"):
+            raise ValueError("WEBHOOK_PATH '/' bilan boshlanishi kerak!")
+        if self.FSM_STORAGE not in (self.FSM_STORAGE_MEMORY, self.FSM_STORAGE_SQL):
+            raise ValueError(f"FSM_STORAGE noto'g'ri: {self.FSM_STORAGE}")
+        if self.BOT_WORKERS > 1 and self.FSM_STORAGE != self.FSM_STORAGE_SQL:
+            raise ValueError("BOT_WORKERS > 1 uchun FSM_STORAGE=sql bo'lishi kerak!")
+        
+        from core.scheduler import CronSchedule
+        for name in ("REMINDER_SCHEDULE", "FINALIZE_SCHEDULE", "EXPORT_CACHE_SCHEDULE"):
+            if getattr(self, name):
+                CronSchedule(getattr(self, name))
+        from utils.dates import parse_term_starts
+        try:
+            parse_term_starts(self.ACADEMIC_TERMS)
+        except ValueError:
+            raise ValueError(f"ACADEMIC_TERMS noto'g'ri (MM-DD,...): {self.ACADEMIC_TERMS}")
+        try:
+            datetime.strptime(self.FINALIZE_CUTOFF, "%H:%M")
+        except ValueError:
+            raise ValueError(f"FINALIZE_CUTOFF noto'g'ri (HH:MM): {self.FINALIZE_CUTOFF}")
 
 
 settings = Settings()
@@ -1,7 +1,7 @@
 """Database module."""
 from .base import Base
-from .engine import engine, get_session, init_db
+from .engine import engine, heavy_engine, get_session, get_heavy_session, init_db
 
-__all__ = ["Base", "engine", "get_session", "init_db"]
+__all__ = ["Base", "engine", "heavy_engine", "get_session", "get_heavy_session", "init_db"]
 
 
@@ -23,6 +23,26 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Og'ir ishlar uchun alohida engine - o'z ulanishlar limiti bilan,
+# shunda hisobotlar interaktiv davomat belgilash ulanishlarini band qilmaydi.
+# In-memory SQLite bitta ulanishda yashaydi, shuning uchun u yerda umumiy engine.
+if ":memory:" in settings.DATABASE_URL:
+    heavy_engine = engine
+else:
+    heavy_engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.LOG_LEVEL == "DEBUG",
+        future=True,
+        pool_size=settings.HEAVY_DB_POOL_SIZE,
+        max_overflow=0,
+    )
+
+heavy_session_maker = async_sessionmaker(
+    heavy_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Async session olish."""
@@ -30,6 +50,12 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_heavy_session() -> AsyncGenerator[AsyncSession, None]:
+    """Og'ir ishlar uchun async session olish."""
+    async with heavy_session_maker() as session:
+        yield session
+
+
 async def init_db() -> None:
     """Database jadvallarini yaratish."""
     # CRITICAL: Modellarni import qilish metadata uchun
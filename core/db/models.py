@@ -9,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     Date,
     ForeignKey,
+    Index,
     Text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -45,6 +46,8 @@ class Class(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     total_students: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Ro'yxat har o'zgarganda oshadi (eksport keshlari uchun versiya)
+    roster_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
@@ -100,12 +103,19 @@ class AttendanceDay(Base):
     """Davomat kunlari jadvali."""
     
     __tablename__ = "attendance_days"
+    __table_args__ = (
+        Index("ix_attendance_days_date_class", "date", "class_id"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     class_id: Mapped[int] = mapped_column(Integer, ForeignKey("classes.id", ondelete="CASCADE"), nullable=False)
     date: Mapped[datetime] = mapped_column(Date, nullable=False)
     marked_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     is_finalized: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Muddat o'tgan, lekin to'liq belgilanmagan kun (avtomatik yakunlanmadi)
+    is_incomplete: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Yakunlangan paytdagi sinf o'quvchilari soni (ochiq yoki import qilingan kunda None)
+    total_students: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
@@ -113,12 +123,56 @@ class AttendanceDay(Base):
     items: Mapped[list["AttendanceItem"]] = relationship(
         "AttendanceItem", back_populates="attendance_day", cascade="all, delete-orphan"
     )
+    stats: Mapped[Optional["AttendanceDayStats"]] = relationship(
+        "AttendanceDayStats", cascade="all, delete-orphan", uselist=False
+    )
+
+
+class AttendanceDayStats(Base):
+    """Davomat kuni xulosasi (attendance_items dan hisoblangan, har yozuvda yangilanadi)."""
+    
+    __tablename__ = "attendance_day_stats"
+    __table_args__ = (
+        Index("ix_attendance_day_stats_date_class", "date", "class_id"),
+    )
+    
+    attendance_day_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("attendance_days.id", ondelete="CASCADE"), primary_key=True
+    )
+    class_id: Mapped[int] = mapped_column(Integer, ForeignKey("classes.id", ondelete="CASCADE"), nullable=False)
+    date: Mapped[datetime] = mapped_column(Date, nullable=False)
+    present: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    late: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    absent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    marked: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    is_finalized: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+
+class StudentAttendanceStats(Base):
+    """O'quvchining o'quv davri (chorak) bo'yicha davomat hisoblagichlari."""
+    
+    __tablename__ = "student_attendance_stats"
+    
+    student_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True
+    )
+    period: Mapped[str] = mapped_column(String(20), primary_key=True)  # "2026-2027/1"
+    present: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    late: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    absent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Oxirgi belgilangan kunlardan boshlab ketma-ket kelmagan kunlar
+    absence_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_date: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True)
 
 
 class AttendanceItem(Base):
     """Davomat yozuvlari jadvali."""
     
     __tablename__ = "attendance_items"
+    __table_args__ = (
+        Index("ix_attendance_items_day", "attendance_day_id"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     attendance_day_id: Mapped[int] = mapped_column(Integer, ForeignKey("attendance_days.id", ondelete="CASCADE"), nullable=False)
@@ -146,3 +200,78 @@ class Transfer(Base):
     # Relationships
     student: Mapped["Student"] = relationship("Student", back_populates="transfers", foreign_keys=[student_id])
     by_user: Mapped["User"] = relationship("User", back_populates="transfers_made", foreign_keys=[by_user_id])
+
+
+class FsmRecord(Base):
+    """FSM holatlari jadvali (bir nechta bot jarayoni uchun umumiy)."""
+    
+    __tablename__ = "fsm_states"
+    
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    state: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    data: Mapped[str] = mapped_column(Text, default="{}", nullable=False)  # JSON
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+class JobLease(Base):
+    """Fon ishlari uchun lease (qaysi jarayon ishni bajarishi)."""
+    
+    __tablename__ = "job_leases"
+    
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Har safar egasi almashganda oshadi (fencing token)
+    token: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    acquired_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class AttendanceChange(Base):
+    """
+    Davomat o'zgarishlari jurnali (faqat qo'shiladi, o'zgartirilmaydi).
+    
+    ``seq`` monoton oshadi: iste'molchilar o'zi ko'rgan oxirgi ``seq``
+    dan keyingi yozuvlarnigina o'qiydi. Sinf yoki o'quvchi o'chirilganda
+    ham tarix saqlanib qolishi uchun tashqi kalitlar qo'yilmagan.
+    """
+    
+    __tablename__ = "attendance_changes"
+    __table_args__ = (
+        Index("ix_attendance_changes_day", "attendance_day_id"),
+        Index("ix_attendance_changes_student", "student_id"),
+        Index("ix_attendance_changes_class_date", "class_id", "date"),
+    )
+    
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    attendance_day_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    class_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    date: Mapped[datetime] = mapped_column(Date, nullable=False)
+    student_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    old_status: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # None - birinchi belgilash
+    new_status: Mapped[int] = mapped_column(Integer, nullable=False)
+    changed_by: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # users.id
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class JournalCursor(Base):
+    """Jurnal iste'molchisining oxirgi qayta ishlangan ``seq`` qiymati."""
+    
+    __tablename__ = "journal_cursors"
+    
+    consumer: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_seq: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ExportFile(Base):
+    """Telegram'ga yuklangan eksport fayllari (qayta yuborish uchun ``file_id``)."""
+    
+    __tablename__ = "export_files"
+    
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)      # excel | pdf | raw | archive
+    class_id: Mapped[int] = mapped_column(Integer, primary_key=True)     # 0 - barcha sinflar
+    params: Mapped[str] = mapped_column(String(100), primary_key=True)   # masalan "202610"
+    version: Mapped[str] = mapped_column(String(100), nullable=False)
+    file_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    caption: Mapped[str] = mapped_column(Text, default="", nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
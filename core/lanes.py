@@ -0,0 +1,94 @@
+"""Og'ir ishlar uchun alohida bajarish yo'lagi (task pul + process pul)."""
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+from core.config import settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LANE_INTERACTIVE = "interactive"
+LANE_HEAVY = "heavy"
+
+heavy_queued = metrics.gauge("heavy_lane_queued", "Og'ir yo'lakda kutayotgan ishlar")
+heavy_running = metrics.gauge("heavy_lane_running", "Og'ir yo'lakda bajarilayotgan ishlar")
+heavy_duration = metrics.histogram(
+    "heavy_lane_duration_seconds",
+    "Og'ir ishlarning bajarilish vaqti",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+
+class HeavyLane:
+    """
+    Hisobot va eksport kabi og'ir ishlar yo'lagi.
+
+    Ishlar interaktiv update worker'laridan ajratilgan holda, cheklangan
+    sonli task'larda bajariladi. CPU talab qiladigan render ishlari
+    ``run_in_process`` orqali alohida process pulga yuboriladi - hozir
+    faqat PDF jurnal (``utils.pdf.render_register_pdf``). Excel fayllar
+    openpyxl write-only rejimida bo'laklab, thread'da yoziladi va process
+    pulni ishlatmaydi; pul birinchi PDF so'rovida yaratiladi.
+    """
+
+    def __init__(self, workers: int = 2, processes: int = 2):
+        self.workers = max(1, workers)
+        self.processes = max(1, processes)
+        self._slots = asyncio.Semaphore(self.workers)
+        self._tasks: set[asyncio.Task] = set()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def spawn(self, job: Callable[[], Awaitable[Any]], name: str = "heavy-job") -> asyncio.Task:
+        """Ishni fonda bajarish uchun yo'lakka qo'yish (natija kutilmaydi)."""
+        task = asyncio.create_task(self.run(job), name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_done)
+        return task
+
+    async def run(self, job: Callable[[], Awaitable[Any]]) -> Any:
+        """Ishni yo'lakda bajarish va natijasini qaytarish."""
+        loop = asyncio.get_running_loop()
+        heavy_queued.inc()
+        try:
+            await self._slots.acquire()
+        finally:
+            heavy_queued.dec()
+
+        started = loop.time()
+        heavy_running.inc()
+        try:
+            return await job()
+        finally:
+            heavy_running.dec()
+            heavy_duration.observe(loop.time() - started)
+            self._slots.release()
+
+    async def run_in_process(self, func: Callable[..., Any], *args: Any) -> Any:
+        """CPU talab qiladigan funksiyani process pulda bajarish."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processes)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, func, *args)
+
+    async def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Fondagi ishlarni kutib, process pulni yopish."""
+        if self._tasks:
+            done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+            for task in pending:
+                task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Og'ir ishda xatolik", exc_info=task.exception())
+
+
+heavy_lane = HeavyLane(
+    workers=settings.HEAVY_WORKERS,
+    processes=settings.HEAVY_PROCESSES,
+)
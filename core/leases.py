@@ -0,0 +1,126 @@
+"""Fon ishlari uchun lider tanlash - bazadagi lease'lar orqali."""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Optional
+
+from core.db import get_session
+from core.metrics import metrics
+from repositories.lease import LeaseRepository
+
+logger = logging.getLogger(__name__)
+
+leases_held = metrics.gauge("job_leases_held", "Shu jarayonda turgan lease'lar")
+lease_changes = metrics.counter("job_lease_changes_total", "Lease olish/yo'qotish hodisalari")
+
+
+def default_holder_id() -> str:
+    """Jarayonning noyob identifikatori: host:pid:tasodifiy."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseManager:
+    """
+    Nomlangan lease'larni ushlab turish.
+
+    Fon task'i har ``ttl / 3`` soniyada ushlangan lease'larni yangilaydi
+    va bo'shlarini olishga urinadi. Lease egasi bo'lgan jarayon o'lsa,
+    uning lease'i ``ttl`` dan keyin eskiradi va boshqa jarayon uni
+    keyingi urinishda oladi.
+
+    ``is_held`` faqat oxirgi muvaffaqiyatli yangilanishdan beri ``ttl``
+    o'tmagan bo'lsa True qaytaradi - baza bilan aloqa uzilsa, jarayon
+    o'zini lider deb hisoblashni to'xtatadi.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        holder: Optional[str] = None,
+        renew_interval: Optional[float] = None,
+    ):
+        self.ttl = ttl
+        self.holder = holder or default_holder_id()
+        self.renew_interval = renew_interval or ttl / 3
+        self.names: set[str] = set()
+        # name -> lokal muddat (monotonic)
+        self._held: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, name: str) -> None:
+        """Lease nomini kuzatuvga qo'shish."""
+        self.names.add(name)
+
+    def is_held(self, name: str) -> bool:
+        """Joriy jarayon ``name`` lease'iga egami."""
+        deadline = self._held.get(name)
+        return deadline is not None and time.monotonic() < deadline
+
+    async def start(self) -> None:
+        """Birinchi urinishni bajarib, yangilash task'ini ishga tushirish."""
+        await self.refresh()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="lease-keeper")
+
+    async def refresh(self) -> None:
+        """Barcha lease'larni bir marta yangilash yoki olishga urinish."""
+        async for session in get_session():
+            repo = LeaseRepository(session)
+            for name in sorted(self.names):
+                started = time.monotonic()
+                try:
+                    if name in self._held:
+                        ok = await repo.renew(name, self.holder, self.ttl)
+                    else:
+                        ok = await repo.try_acquire(name, self.holder, self.ttl)
+                except Exception as e:
+                    logger.error(f"Lease '{name}' yangilanmadi: {e}")
+                    await session.rollback()
+                    continue
+                self._set_held(name, ok, started)
+        leases_held.set(len(self._held))
+
+    async def close(self) -> None:
+        """Yangilashni to'xtatib, ushlangan lease'larni bo'shatish."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if not self._held:
+            return
+        try:
+            async for session in get_session():
+                repo = LeaseRepository(session)
+                for name in list(self._held):
+                    await repo.release(name, self.holder)
+        except Exception as e:
+            logger.warning(f"Lease'larni bo'shatib bo'lmadi: {e}")
+        self._held.clear()
+        leases_held.set(0)
+
+    def _set_held(self, name: str, ok: bool, started: float) -> None:
+        was_held = name in self._held
+        if ok:
+            # Lokal muddat so'rov boshlangan vaqtdan hisoblanadi (xavfsiz tomonga)
+            self._held[name] = started + self.ttl
+            if not was_held:
+                lease_changes.inc(lease=name, event="acquired")
+                logger.info(f"Lease olindi: {name} ({self.holder})")
+        elif was_held:
+            del self._held[name]
+            lease_changes.inc(lease=name, event="lost")
+            logger.warning(f"Lease yo'qotildi: {name} ({self.holder})")
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Lease'larni yangilashda xatolik: {e}")
@@ -0,0 +1,180 @@
+"""Jarayon ichidagi oddiy metrikalar (counter, gauge, histogram)."""
+import threading
+from typing import Optional
+
+
+class Counter:
+    """Faqat oshadigan hisoblagich."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Hisoblagichni oshirish."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Joriy qiymatni olish."""
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        """Barcha qiymatlar (nom, label'lar, qiymat)."""
+        with self._lock:
+            return [(self.name, dict(key), value) for key, value in self._values.items()]
+
+
+class Gauge:
+    """Oshib-kamayadigan joriy qiymat."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: str) -> None:
+        """Qiymatni o'rnatish."""
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Qiymatni oshirish."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Qiymatni kamaytirish."""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        """Joriy qiymatni olish."""
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        """Barcha qiymatlar (nom, label'lar, qiymat)."""
+        with self._lock:
+            return [(self.name, dict(key), value) for key, value in self._values.items()]
+
+
+class Histogram:
+    """Kuzatuvlar taqsimoti (sekundlarda, qat'iy bucket'lar bilan)."""
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[tuple[float, ...]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Yangi kuzatuv qo'shish."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [bucket hisoblagichlari, count, sum]
+                series = [[0] * len(self.buckets), 0, 0.0]
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += 1
+            series[2] += value
+
+    def count(self, **labels: str) -> int:
+        """Kuzatuvlar soni."""
+        series = self._series.get(tuple(sorted(labels.items())))
+        return series[1] if series else 0
+
+    def total(self, **labels: str) -> float:
+        """Kuzatuvlar yig'indisi."""
+        series = self._series.get(tuple(sorted(labels.items())))
+        return series[2] if series else 0.0
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        """Barcha qiymatlar (Prometheus uslubidagi _bucket/_count/_sum)."""
+        result = []
+        with self._lock:
+            for key, (bucket_counts, count, total) in self._series.items():
+                labels = dict(key)
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    result.append((f"{self.name}_bucket", {**labels, "le": str(bound)}, bucket_count))
+                result.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, count))
+                result.append((f"{self.name}_count", labels, count))
+                result.append((f"{self.name}_sum", labels, total))
+        return result
+
+
+class MetricsRegistry:
+    """Barcha metrikalar reestri."""
+
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, description, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"'{name}' metrikasi boshqa turda ro'yxatdan o'tgan.")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """Counter olish yoki yaratish."""
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        """Gauge olish yoki yaratish."""
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[tuple[float, ...]] = None,
+    ) -> Histogram:
+        """Histogram olish yoki yaratish."""
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+
+    def snapshot(self) -> dict[str, list[tuple[str, dict, float]]]:
+        """Barcha metrikalar qiymatlarini olish."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.samples() for metric in metrics}
+
+    def render_text(self) -> str:
+        """Metrikalarni Prometheus text formatida chiqarish."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            kind = type(metric).__name__.lower()
+            if metric.description:
+                lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            for sample_name, labels, value in metric.samples():
+                if labels:
+                    label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                    lines.append(f"{sample_name}{{{label_str}}} {value}")
+                else:
+                    lines.append(f"{sample_name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,252 @@
+"""Asyncio asosidagi rejalashtiruvchi - cron ko'rinishidagi davriy ishlar."""
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from core.config import settings
+from core.leases import LeaseManager
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Oldingi ishga tushirish hali tugamagan bo'lsa:
+OVERLAP_SKIP = "skip"    # navbatdagi ishga tushirish o'tkazib yuboriladi
+OVERLAP_ALLOW = "allow"  # parallel ravishda yana ishga tushiriladi
+
+job_runs = metrics.counter("scheduler_job_runs_total", "Rejalashtirilgan ishlar natijalari")
+job_duration = metrics.histogram(
+    "scheduler_job_duration_seconds",
+    "Rejalashtirilgan ishlarning bajarilish vaqti",
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0),
+)
+job_last_success = metrics.gauge(
+    "scheduler_job_last_success_timestamp",
+    "Oxirgi muvaffaqiyatli bajarilish vaqti (unix)",
+)
+
+
+class CronSchedule:
+    """
+    Cron ifodasi: ``daqiqa soat kun oy hafta_kuni``.
+
+    Har bir maydonda ``*``, ro'yxat (``1,15``), oraliq (``8-10``) va
+    qadam (``*/15``, ``8-18/2``) qo'llanadi. Hafta kuni: 0 (yoki 7) -
+    yakshanba, 1 - dushanba. Kun va hafta kuni ikkalasi cheklangan bo'lsa,
+    ulardan biri mos kelishi yetarli (klassik cron kabi).
+    """
+
+    _RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron ifodasi 5 ta maydondan iborat bo'lishi kerak: {expression!r}")
+        self.expression = expression
+        fields = [self._parse(part, low, high) for part, (low, high) in zip(parts, self._RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {d % 7 for d in weekdays}
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse(part: str, low: int, high: int) -> set[int]:
+        values: set[int] = set()
+        for item in part.split(","):
+            rng, _, step = item.partition("/")
+            if rng == "*":
+                start, end = low, high
+            elif "-" in rng:
+                start, end = (int(x) for x in rng.split("-", 1))
+            else:
+                start = end = int(rng)
+                if step:
+                    end = high
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron qiymati chegaradan tashqarida: {item!r}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        """``dt`` dan keyingi (qat'iy katta) mos keladigan daqiqa."""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                year, month = (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+                dt = dt.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt
+        raise ValueError(f"Cron ifodasi hech qachon mos kelmaydi: {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+
+@dataclass
+class Job:
+    """Ro'yxatdan o'tgan ish va uning oxirgi natijalari."""
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    schedule: CronSchedule
+    jitter: float = 0.0
+    overlap: str = OVERLAP_SKIP
+    next_run: Optional[datetime] = None
+    last_started: Optional[datetime] = None
+    last_duration: Optional[float] = None
+    last_outcome: Optional[str] = None
+    last_result: Any = None
+    last_error: Optional[str] = None
+    running: int = 0
+    _loop_task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class Scheduler:
+    """
+    Ishlar reestri va ularni jadval bo'yicha ishga tushiruvchi.
+
+    Har bir ish o'z task'ida kutadi: navbatdagi vaqt ``CronSchedule`` dan
+    olinadi va unga ``0..jitter`` soniya tasodifiy kechikish qo'shiladi
+    (bir nechta ish bir vaqtda bazaga tushmasligi uchun). Ish natijasi
+    (``ok`` / ``error`` / ``skipped`` / ``standby``) va davomiyligi
+    metrikalarga va ``Job`` obyektiga yoziladi.
+
+    ``leases`` berilsa, har bir ish faqat shu ish nomidagi lease egasi
+    bo'lgan jarayonda bajariladi (qolganlarida ``standby``).
+    """
+
+    def __init__(self, leases: Optional[LeaseManager] = None):
+        self.jobs: dict[str, Job] = {}
+        self.leases = leases
+        self._runs: set[asyncio.Task] = set()
+        self._started = False
+
+    def register(
+        self,
+        name: str,
+        schedule: str,
+        func: Callable[[], Awaitable[Any]],
+        jitter: float = 0.0,
+        overlap: str = OVERLAP_SKIP,
+    ) -> Job:
+        """Ishni reestrga qo'shish."""
+        if name in self.jobs:
+            raise ValueError(f"Ish allaqachon ro'yxatdan o'tgan: {name}")
+        if overlap not in (OVERLAP_SKIP, OVERLAP_ALLOW):
+            raise ValueError(f"Noto'g'ri overlap qiymati: {overlap}")
+        job = Job(name=name, func=func, schedule=CronSchedule(schedule), jitter=jitter, overlap=overlap)
+        self.jobs[name] = job
+        if self.leases is not None:
+            self.leases.add(name)
+        if self._started:
+            self._start_job(job)
+        return job
+
+    async def start(self) -> None:
+        """Lease'larni olishga urinib, barcha ishlarning jadval task'larini ishga tushirish."""
+        if self.leases is not None:
+            await self.leases.start()
+        self._started = True
+        for job in self.jobs.values():
+            self._start_job(job)
+
+    async def run_now(self, name: str) -> Any:
+        """Ishni jadvalni kutmasdan darhol bajarish va natijasini qaytarish."""
+        return await self._execute(self.jobs[name])
+
+    async def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Jadvallarni to'xtatish va bajarilayotgan ishlarni kutish."""
+        self._started = False
+        for job in self.jobs.values():
+            if job._loop_task is not None:
+                job._loop_task.cancel()
+                job._loop_task = None
+        if self._runs:
+            _, pending = await asyncio.wait(set(self._runs), timeout=timeout)
+            for task in pending:
+                task.cancel()
+        if self.leases is not None:
+            await self.leases.close()
+
+    def _start_job(self, job: Job) -> None:
+        if job._loop_task is None or job._loop_task.done():
+            job._loop_task = asyncio.create_task(self._job_loop(job), name=f"job-{job.name}")
+
+    async def _job_loop(self, job: Job) -> None:
+        while True:
+            job.next_run = job.schedule.next_after(datetime.now())
+            delay = (job.next_run - datetime.now()).total_seconds()
+            if job.jitter:
+                delay += random.uniform(0, job.jitter)
+            await asyncio.sleep(max(0.0, delay))
+
+            if self.leases is not None and not self.leases.is_held(job.name):
+                job_runs.inc(job=job.name, outcome="standby")
+                job.last_outcome = "standby"
+                continue
+
+            if job.running and job.overlap == OVERLAP_SKIP:
+                job_runs.inc(job=job.name, outcome="skipped")
+                job.last_outcome = "skipped"
+                logger.warning(f"Ish '{job.name}' hali tugamagan - navbatdagisi o'tkazib yuborildi")
+                continue
+
+            task = asyncio.create_task(self._execute(job), name=f"job-run-{job.name}")
+            self._runs.add(task)
+            task.add_done_callback(self._on_run_done)
+
+    async def _execute(self, job: Job) -> Any:
+        job.running += 1
+        job.last_started = datetime.now()
+        started = time.monotonic()
+        try:
+            result = await job.func()
+        except Exception as e:
+            job.last_outcome = "error"
+            job.last_error = repr(e)
+            job_runs.inc(job=job.name, outcome="error")
+            logger.exception(f"Ish '{job.name}' xatolik bilan tugadi")
+            raise
+        else:
+            job.last_outcome = "ok"
+            job.last_result = result
+            job.last_error = None
+            job_runs.inc(job=job.name, outcome="ok")
+            job_last_success.set(time.time(), job=job.name)
+            logger.info(f"Ish '{job.name}' bajarildi: {result!r}")
+            return result
+        finally:
+            job.running -= 1
+            job.last_duration = time.monotonic() - started
+            job_duration.observe(job.last_duration, job=job.name)
+
+    def _on_run_done(self, task: asyncio.Task) -> None:
+        self._runs.discard(task)
+        if not task.cancelled():
+            # Xatolik _execute ichida log qilingan
+            task.exception()
+
+
+scheduler = Scheduler(leases=LeaseManager(ttl=settings.JOB_LEASE_TTL))
@@ -1,14 +1,27 @@
 """Asosiy bot fayli."""
 import asyncio
 import logging
+from typing import Optional
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.telegram import PRODUCTION, TelegramAPIServer
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
 
 from core.config import settings
-from core.db import init_db, get_session
+from core.db import init_db, get_session, engine, heavy_engine
+from core.lanes import heavy_lane
+from core.scheduler import scheduler
 from services.user import UserService
 from bot.handlers import start, admin, staff
+from bot.outbox import outbox
+from bot.jobs import register_jobs
+from bot.middlewares.ordering import ChatOrderedExecutor, ChatOrderingMiddleware
+from bot.middlewares.lanes import LaneMiddleware
+from bot.middlewares.throttling import ThrottlingMiddleware
+from bot.session import TunedAiohttpSession
+from bot.storage.memory import BoundedMemoryStorage
+from bot.storage.sql import SQLStorage
 
 # Logging sozlash
 logging.basicConfig(
@@ -18,19 +31,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main():
-    """Asosiy funksiya."""
-    # Sozlamalarni tekshirish
-    try:
-        settings.validate()
-    except ValueError as e:
-        logger.error(f"Sozlamalar xatosi: {e}")
-        return
-    
-    # Database'ni initsializatsiya qilish
+async def prepare_database() -> None:
+    """Database'ni initsializatsiya qilish va Super Admin'ni tekshirish."""
     logger.info("Database'ni initsializatsiya qilish...")
     await init_db()
-    
+
     # Super Admin tekshirish va yaratish
     if settings.SUPER_ADMIN_ID:
         logger.info(f"Super Admin tekshirilmoqda: {settings.SUPER_ADMIN_ID}")
@@ -38,7 +43,7 @@ async def main():
             try:
                 user_service = UserService(session)
                 user = await user_service.get_user_by_telegram_id(settings.SUPER_ADMIN_ID)
-                
+
                 if user:
                     if user.role != settings.ROLE_ADMIN:
                         user.role = settings.ROLE_ADMIN
@@ -55,29 +60,144 @@ async def main():
             except Exception as e:
                 logger.error(f"Super Admin yaratishda xatolik: {e}")
             break
-            
+
     logger.info("Database tayyor!")
-    
-    # Bot va Dispatcher yaratish
-    bot = Bot(
+
+
+def create_bot() -> Bot:
+    """Bot obyektini yaratish."""
+    api = TelegramAPIServer.from_base(settings.BOT_API_URL) if settings.BOT_API_URL else PRODUCTION
+    session = TunedAiohttpSession(
+        api=api,
+        limit=settings.BOT_API_POOL_LIMIT,
+        keepalive_timeout=settings.BOT_API_KEEPALIVE,
+        timeout=settings.BOT_API_TIMEOUT,
+        max_retries=settings.BOT_API_MAX_RETRIES,
+        backoff=settings.BOT_API_BACKOFF,
+    )
+    return Bot(
         token=settings.BOT_TOKEN,
+        session=session,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
-    dp = Dispatcher()
-    
+
+
+def create_fsm_storage() -> BaseStorage:
+    """Sozlamalarga ko'ra FSM storage yaratish."""
+    if settings.FSM_STORAGE == settings.FSM_STORAGE_SQL:
+        return SQLStorage(engine, ttl=settings.FSM_TTL)
+    return BoundedMemoryStorage(ttl=settings.FSM_TTL, max_size=settings.FSM_MAX_KEYS)
+
+
+def create_dispatcher(
+    storage: Optional[BaseStorage] = None,
+    init_database: bool = True,
+) -> Dispatcher:
+    """Dispatcher, routerlar, middleware'lar va lifecycle hook'larini sozlash."""
+    if storage is None:
+        storage = create_fsm_storage()
+    dp = Dispatcher(storage=storage)
+
     # Routerlarni ro'yxatdan o'tkazish
     dp.include_router(start.router)
     dp.include_router(admin.router)
     dp.include_router(staff.router)
-    
-    # Botni ishga tushirish
-    logger.info("Bot ishga tushmoqda...")
+
+    # Takroriy bosishlar va limitdan oshgan update'lar navbatga tushmaydi
+    throttling = ThrottlingMiddleware(
+        rate=settings.THROTTLE_RATE,
+        burst=settings.THROTTLE_BURST,
+        max_keys=settings.THROTTLE_MAX_KEYS,
+    )
+    dp.update.outer_middleware(throttling)
+
+    # Update'larni chat bo'yicha tartib bilan, cheklangan parallellikda bajarish
+    executor = ChatOrderedExecutor(
+        workers=settings.UPDATE_WORKERS,
+        queue_size=settings.UPDATE_QUEUE_SIZE,
+    )
+    dp.update.outer_middleware(ChatOrderingMiddleware(executor))
+    # Update qayta ishlanib bo'lgach (handler topilmasa ham) takroriy bosish kaliti bo'shaydi
+    dp.update.outer_middleware(throttling.release_middleware)
+
+    # Og'ir handler'lar (eksport, hisobotlar) alohida yo'lakda bajariladi
+    dp.callback_query.middleware(LaneMiddleware(heavy_lane))
+    dp.message.middleware(LaneMiddleware(heavy_lane))
+
+    if not scheduler.jobs:
+        register_jobs(scheduler)
+
+    async def on_startup(bot: Bot) -> None:
+        if init_database:
+            await prepare_database()
+        if isinstance(storage, SQLStorage):
+            removed = await storage.delete_expired()
+            logger.info(f"Eskirgan FSM holatlari o'chirildi: {removed} ta")
+        elif isinstance(storage, BoundedMemoryStorage):
+            storage.start_sweeper(settings.FSM_SWEEP_INTERVAL)
+        await executor.start()
+        outbox.start(bot)
+        # Har bir ish faqat o'z lease'iga ega jarayonda bajariladi
+        await scheduler.start()
+
+    async def on_shutdown() -> None:
+        await scheduler.close()
+        await executor.close()
+        await outbox.close()
+        await heavy_lane.close()
+        await storage.close()
+        await engine.dispose()
+        if heavy_engine is not engine:
+            await heavy_engine.dispose()
+        logger.info("Database ulanishlari yopildi.")
+
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    return dp
+
+
+async def run_polling(bot: Bot, dp: Dispatcher) -> None:
+    """Long polling rejimida ishga tushirish."""
+    logger.info("Bot polling rejimida ishga tushmoqda...")
     try:
-        await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+        # handle_as_tasks=False: navbat to'lganda polling kutadi (backpressure)
+        await dp.start_polling(
+            bot,
+            allowed_updates=dp.resolve_used_update_types(),
+            handle_as_tasks=False,
+        )
     finally:
         await bot.session.close()
 
 
+async def main():
+    """Asosiy funksiya."""
+    # Sozlamalarni tekshirish
+    try:
+        settings.validate()
+    except ValueError as e:
+        logger.error(f"Sozlamalar xatosi: {e}")
+        return
+
+    bot = create_bot()
+
+    if settings.BOT_WORKERS > 1:
+        # Bir nechta jarayon: bu jarayon faqat update'larni qabul qilib taqsimlaydi
+        from bot.cluster import run_cluster
+        await prepare_database()
+        allowed_updates = create_dispatcher(init_database=False).resolve_used_update_types()
+        await run_cluster(bot, allowed_updates, settings.BOT_WORKERS)
+        return
+
+    dp = create_dispatcher()
+
+    if settings.RUN_MODE == settings.RUN_MODE_WEBHOOK:
+        from bot.webhook import run_webhook
+        await run_webhook(bot, dp)
+    else:
+        await run_polling(bot, dp)
+
+
 if __name__ == "__main__":
     try:
         asyncio.run(main())
@@ -100,6 +100,111 @@ class ReportGenerator:
         
         return text
     
+    @staticmethod
+    def attendance_rate(present: int, late: int, absent: int) -> Optional[float]:
+        """Davomat foizi (kelgan + kechikkan) / jami. Yozuv bo'lmasa None."""
+        total = present + late + absent
+        if total == 0:
+            return None
+        return (present + late) / total * 100
+    
+    @staticmethod
+    def format_student_stats(stats) -> str:
+        """
+        O'quvchining chorak hisoblagichlarini formatlash.
+        
+        Args:
+            stats: StudentAttendanceStats yoki None
+        
+        Returns:
+            Formatlangan matn
+        """
+        if stats is None:
+            return "📊 Bu chorak: hali davomat yo'q"
+        
+        rate = ReportGenerator.attendance_rate(stats.present, stats.late, stats.absent)
+        text = f"📊 Bu chorak: {rate:.0f}%\n" if rate is not None else "📊 Bu chorak:\n"
+        text += f"  ✅ Keldi: {stats.present}\n"
+        text += f"  🟡 Kechikdi: {stats.late}\n"
+        text += f"  ❌ Kelmadi: {stats.absent}\n"
+        if stats.absence_streak > 1:
+            text += f"  🔴 Ketma-ket kelmagan: {stats.absence_streak} kun\n"
+        return text
+    
+    @staticmethod
+    def format_import_report(report) -> str:
+        """
+        Import natijasini formatlash (bitta xulosa xabari).
+        
+        Args:
+            report: ImportReport
+        
+        Returns:
+            Formatlangan matn
+        """
+        text = f"📥 Import yakunlandi: {report.total_added} ta qo'shildi.\n"
+        for class_name, count in report.added.items():
+            text += f"  📚 {class_name}: +{count}\n"
+        if report.duplicates:
+            text += f"↩️ Ro'yxatda bor (o'tkazib yuborildi): {report.duplicates} ta\n"
+        return text + ReportGenerator._format_import_errors(report)
+    
+    @staticmethod
+    def format_staff_import_report(report) -> str:
+        """
+        Xodimlar importi natijasini formatlash.
+        
+        Args:
+            report: StaffImportReport
+        
+        Returns:
+            Formatlangan matn
+        """
+        text = f"📥 Import yakunlandi: {report.created} ta yangi xodim.\n"
+        if report.existing:
+            text += f"👤 Bazada bor edi: {report.existing} ta\n"
+        text += f"📚 Yangi sinf biriktirishlari: {report.assigned} ta\n"
+        if report.created:
+            text += "\nYangi xodimlar botga o'z telefon raqami bilan kirishi mumkin.\n"
+        return text + ReportGenerator._format_import_errors(report)
+    
+    @staticmethod
+    def format_transfer_preview(preview, limit: int = 30) -> str:
+        """
+        Ommaviy transfer oldidan ko'rinishni formatlash.
+        
+        Args:
+            preview: TransferPreview
+            limit: Ko'rsatiladigan ismlar soni
+        
+        Returns:
+            Formatlangan matn
+        """
+        text = f"🔀 {preview.from_class_name} → {preview.to_class_name}\n"
+        text += f"👥 O'quvchilar: {len(preview.students)} ta\n\n"
+        for full_name in preview.students[:limit]:
+            text += f"  • {full_name}\n"
+        if len(preview.students) > limit:
+            text += f"  ... va yana {len(preview.students) - limit} ta\n"
+        if preview.name_conflicts:
+            text += (
+                f"\n⚠️ {preview.to_class_name} sinfida shu ismli o'quvchilar bor: "
+                f"{', '.join(preview.name_conflicts[:10])}\n"
+            )
+        return text
+    
+    @staticmethod
+    def _format_import_errors(report) -> str:
+        """Import xatolari ro'yxati (birinchilari)."""
+        if not report.error_count:
+            return ""
+        text = f"\n⚠️ Xatolar: {report.error_count} ta\n"
+        for error in report.errors:
+            text += f"  • {error}\n"
+        if report.error_count > len(report.errors):
+            text += f"  ... va yana {report.error_count - len(report.errors)} ta\n"
+        return text
+    
     @staticmethod
     def format_students_list(students: list, show_status: bool = False) -> str:
         """
@@ -1,10 +1,12 @@
 """Attendance repository - davomat bilan ishlash."""
 from typing import Optional
 from datetime import date, datetime
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, bindparam, func, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
-from core.db.models import AttendanceDay, AttendanceItem, Student
+from core.db.models import AttendanceDay, AttendanceItem, Class, Student
+from repositories.journal import JournalRepository
+from repositories.stats import StatsRepository, StudentStatsRepository
 
 
 class AttendanceRepository:
@@ -12,6 +14,9 @@ class AttendanceRepository:
     
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.stats = StatsRepository(session)
+        self.student_stats = StudentStatsRepository(session)
+        self.journal = JournalRepository(session)
     
     async def get_or_create_attendance_day(
         self,
@@ -43,10 +48,124 @@ class AttendanceRepository:
             marked_by=marked_by,
         )
         self.session.add(attendance_day)
+        await self.session.flush()
+        
+        # Kun xulosasi shu tranzaksiyada yaratiladi
+        total = await self.session.scalar(
+            select(Class.total_students).where(Class.id == class_id)
+        )
+        await self.stats.create_for_day(attendance_day, total or 0)
+        
         await self.session.commit()
         await self.session.refresh(attendance_day, ["class_"])
         return attendance_day
     
+    async def get_day_ids(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> dict[tuple[int, date], int]:
+        """Davomat kunlari ID'lari (oraliq ichida): {(class_id, date): id}."""
+        query = select(AttendanceDay.id, AttendanceDay.class_id, AttendanceDay.date)
+        if start is not None:
+            query = query.where(AttendanceDay.date >= start)
+        if end is not None:
+            query = query.where(AttendanceDay.date <= end)
+        result = await self.session.execute(query)
+        return {(class_id, date_val): day_id for day_id, class_id, date_val in result.all()}
+    
+    async def get_max_day_id(self) -> int:
+        """Eng katta davomat kuni ID'si (bo'sh bo'lsa 0)."""
+        return await self.session.scalar(select(func.max(AttendanceDay.id))) or 0
+    
+    async def bulk_create_days(self, rows: list[dict]) -> int:
+        """
+        Ko'p davomat kunini bitta INSERT bilan yaratish (commit qilmaydi).
+        
+        Kun xulosalari yaratilmaydi - ommaviy yuklashdan keyin
+        ``StatsRepository.rebuild`` chaqiriladi.
+        """
+        if not rows:
+            return 0
+        await self.session.execute(insert(AttendanceDay), rows)
+        return len(rows)
+    
+    async def bulk_create_items(self, rows: list[tuple[int, int, int]]) -> int:
+        """
+        Ko'p davomat yozuvini bitta INSERT bilan yaratish (commit qilmaydi).
+        
+        ``rows``: [(attendance_day_id, student_id, status), ...].
+        
+        Jurnal va hisoblagichlar yangilanmaydi - faqat tarixiy ma'lumotni
+        yuklash uchun, keyin hisoblagichlar qayta quriladi. So'rov bir
+        marta kompilyatsiya qilinadi va qatorlar drayverning executemany
+        metodiga to'g'ridan-to'g'ri beriladi (qator bo'yicha SQLAlchemy
+        parametr ishlovisiz); ``updated_at`` bazada qo'yiladi.
+        """
+        if not rows:
+            return 0
+        columns = ("attendance_day_id", "student_id", "status")
+        connection = await self.session.connection()
+        compiled = (
+            insert(AttendanceItem.__table__)
+            .values(updated_at=func.now(), **{name: bindparam(name) for name in columns})
+            .compile(dialect=connection.dialect)
+        )
+        if connection.dialect.positional:
+            order = [columns.index(name) for name in compiled.positiontup]
+            params = rows if order == [0, 1, 2] else [tuple(row[i] for i in order) for row in rows]
+        else:
+            params = [dict(zip(columns, row)) for row in rows]
+        await connection.exec_driver_sql(str(compiled), params)
+        return len(rows)
+    
+    async def bulk_update_item_statuses(self, rows: list[tuple[int, int, int]]) -> int:
+        """
+        Mavjud yozuvlar statusini yangilash (commit qilmaydi).
+        
+        ``rows``: [(attendance_day_id, student_id, status), ...]. Jurnal va
+        hisoblagichlar yangilanmaydi - ``bulk_create_items`` kabi faqat
+        ommaviy yuklash uchun.
+        """
+        if not rows:
+            return 0
+        await self.session.execute(
+            update(AttendanceItem.__table__)
+            .where(
+                AttendanceItem.attendance_day_id == bindparam("day_id"),
+                AttendanceItem.student_id == bindparam("item_student_id"),
+            )
+            .values(status=bindparam("new_status"), updated_at=func.now()),
+            [
+                {"day_id": day_id, "item_student_id": student_id, "new_status": status}
+                for day_id, student_id, status in rows
+            ],
+        )
+        return len(rows)
+    
+    async def get_item_keys(self, after_day_id: int) -> set[tuple[int, int]]:
+        """``after_day_id`` dan keyingi kunlardagi yozuvlar: {(attendance_day_id, student_id)}."""
+        result = await self.session.execute(
+            select(AttendanceItem.attendance_day_id, AttendanceItem.student_id)
+            .where(AttendanceItem.attendance_day_id > after_day_id)
+        )
+        return {(day_id, student_id) for day_id, student_id in result.all()}
+    
+    async def set_item_indexes(self, enabled: bool) -> None:
+        """
+        ``attendance_items`` indekslarini o'chirish yoki qayta qurish
+        (commit qilmaydi).
+        
+        Ommaviy yuklashda indeks har qatorda yangilanmasligi uchun -
+        yuklashdan oldin o'chiriladi, oxirida bir marta quriladi.
+        """
+        connection = await self.session.connection()
+        for index in AttendanceItem.__table__.indexes:
+            if enabled:
+                await connection.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+            else:
+                await connection.run_sync(lambda sync_conn: index.drop(sync_conn, checkfirst=True))
+    
     async def get_attendance_items(
         self,
         attendance_day_id: int,
@@ -89,10 +208,12 @@ class AttendanceRepository:
         attendance_day_id: int,
         student_id: int,
         status: int,
+        changed_by: Optional[int] = None,
     ) -> AttendanceItem:
-        """O'quvchi statusini belgilash."""
+        """O'quvchi statusini belgilash (o'zgarish jurnalga yoziladi)."""
         # Avval mavjudligini tekshirish
         item = await self.get_attendance_item(attendance_day_id, student_id)
+        old_status = item.status if item else None
         
         if item:
             # Yangilash
@@ -107,6 +228,25 @@ class AttendanceRepository:
             )
             self.session.add(item)
         
+        # Kun xulosasi, o'quvchi hisoblagichlari va jurnal - shu tranzaksiyada
+        await self.stats.apply_status_change(attendance_day_id, old_status, status)
+        day_row = (await self.session.execute(
+            select(AttendanceDay.class_id, AttendanceDay.date)
+            .where(AttendanceDay.id == attendance_day_id)
+        )).one()
+        await self.student_stats.apply_status_change(student_id, day_row.date, old_status, status)
+        if old_status != status:
+            self.journal.record(
+                attendance_day_id=attendance_day_id,
+                class_id=day_row.class_id,
+                date_val=day_row.date,
+                student_id=student_id,
+                old_status=old_status,
+                new_status=status,
+                changed_by=changed_by,
+            )
+            await self.journal.flush()
+        
         await self.session.commit()
         await self.session.refresh(item)
         return item
@@ -131,6 +271,92 @@ class AttendanceRepository:
         """Finalized statusini yangilash."""
         attendance_day = await self.get_attendance_day_by_id(attendance_day_id)
         if attendance_day:
+            total = attendance_day.class_.total_students
             attendance_day.is_finalized = is_finalized
+            attendance_day.total_students = total if is_finalized else None
+            if is_finalized:
+                attendance_day.is_incomplete = False
+            await self.stats.set_finalized(attendance_day_id, is_finalized, total)
             await self.session.commit()
+    
+    async def finalize_complete_days(self, cutoff_date: date) -> tuple[int, int]:
+        """
+        ``cutoff_date`` dan oldingi ochiq kunlarni yakunlash (set-based).
+        
+        To'liq belgilangan kunlar bitta UPDATE bilan yakunlanadi, to'liq
+        bo'lmaganlari esa ``is_incomplete`` deb belgilanadi. Belgilangandan
+        keyin sinf kichraygan bo'lsa (transfer, o'chirish) yozuvlar
+        ``total_students`` dan ko'p bo'ladi - bunday kun ham to'liq.
+        
+        Returns:
+            (yakunlanganlar, to'liq emas deb belgilanganlar)
+        """
+        marked = (
+            select(func.count(AttendanceItem.id))
+            .where(AttendanceItem.attendance_day_id == AttendanceDay.id)
+            .scalar_subquery()
+        )
+        total = (
+            select(Class.total_students)
+            .where(Class.id == AttendanceDay.class_id)
+            .scalar_subquery()
+        )
+        now = datetime.utcnow()
+        
+        finalized = await self.session.execute(
+            update(AttendanceDay)
+            .where(
+                AttendanceDay.is_finalized == False,
+                AttendanceDay.date < cutoff_date,
+                marked >= total,
+            )
+            .values(is_finalized=True, is_incomplete=False, total_students=total, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        flagged = await self.session.execute(
+            update(AttendanceDay)
+            .where(
+                AttendanceDay.is_finalized == False,
+                AttendanceDay.is_incomplete == False,
+                AttendanceDay.date < cutoff_date,
+            )
+            .values(is_incomplete=True, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.stats.sync_finalized(cutoff_date)
+        await self.session.commit()
+        return finalized.rowcount, flagged.rowcount
 
+
+    async def get_unmarked_classes(self, date_val: date) -> list[tuple[int, str, int, int]]:
+        """
+        Davomati to'liq belgilanmagan sinflar (bitta so'rov).
+        
+        Sana uchun AttendanceDay yo'q (anti-join) yoki belgilanganlar soni
+        ``total_students`` dan kam bo'lgan sinflar qaytariladi.
+        
+        Returns:
+            [(class_id, class_name, total_students, marked), ...]
+        """
+        marked = (
+            select(
+                AttendanceDay.class_id.label("class_id"),
+                func.count(AttendanceItem.id).label("marked"),
+            )
+            .select_from(AttendanceDay)
+            .outerjoin(AttendanceItem, AttendanceItem.attendance_day_id == AttendanceDay.id)
+            .where(AttendanceDay.date == date_val)
+            .group_by(AttendanceDay.class_id)
+            .subquery()
+        )
+        marked_count = func.coalesce(marked.c.marked, 0)
+        result = await self.session.execute(
+            select(Class.id, Class.name, Class.total_students, marked_count)
+            .outerjoin(marked, marked.c.class_id == Class.id)
+            .where(
+                Class.total_students > 0,
+                marked_count < Class.total_students,
+            )
+            .order_by(Class.name)
+        )
+        return [tuple(row) for row in result.all()]
@@ -1,8 +1,9 @@
 from typing import Optional
-from sqlalchemy import select, and_, update
+from sqlalchemy import select, and_, func, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from core.db.models import Class, ClassStaff, Student
+from core.db.models import Class, ClassStaff, Student, User
+from repositories.stats import StatsRepository
 
 
 class ClassRepository:
@@ -32,6 +33,22 @@ class ClassRepository:
         )
         return result.scalar_one_or_none()
     
+    async def bulk_create(self, rows: list[dict]) -> int:
+        """Ko'p sinfni bitta INSERT bilan yaratish (commit qilmaydi)."""
+        if not rows:
+            return 0
+        await self.session.execute(insert(Class), rows)
+        return len(rows)
+    
+    async def get_by_names(self, names: set[str]) -> list[Class]:
+        """Nomlar bo'yicha sinflar (katta-kichik harf farqisiz, bitta IN so'rov)."""
+        if not names:
+            return []
+        result = await self.session.execute(
+            select(Class).where(func.lower(Class.name).in_({name.lower() for name in names}))
+        )
+        return list(result.scalars().all())
+    
     async def create(self, name: str) -> Class:
         """Yangi sinf yaratish."""
         class_obj = Class(name=name)
@@ -59,6 +76,29 @@ class ClassRepository:
         )
         return list(result.scalars().all())
     
+    async def get_active_staff_by_classes(
+        self,
+        class_ids: list[int],
+    ) -> dict[int, list[User]]:
+        """Bir nechta sinfning faol xodimlari (bitta so'rov): {class_id: [User]}."""
+        if not class_ids:
+            return {}
+        result = await self.session.execute(
+            select(ClassStaff.class_id, User)
+            .join(User, User.id == ClassStaff.staff_user_id)
+            .where(
+                and_(
+                    ClassStaff.class_id.in_(class_ids),
+                    ClassStaff.active_to.is_(None),
+                    User.is_active == True,
+                )
+            )
+        )
+        staff: dict[int, list[User]] = {}
+        for class_id, user in result.all():
+            staff.setdefault(class_id, []).append(user)
+        return staff
+    
     async def get_students_count(self, class_id: int) -> int:
         """Sinfdagi o'quvchilar sonini olish."""
         result = await self.session.execute(
@@ -82,6 +122,28 @@ class ClassRepository:
         await self.session.refresh(class_staff)
         return class_staff
     
+    async def get_active_assignment_pairs(self, staff_user_ids: set[int]) -> set[tuple[int, int]]:
+        """Xodimlarning faol biriktirishlari: {(class_id, staff_user_id), ...}."""
+        if not staff_user_ids:
+            return set()
+        result = await self.session.execute(
+            select(ClassStaff.class_id, ClassStaff.staff_user_id).where(
+                ClassStaff.staff_user_id.in_(staff_user_ids),
+                ClassStaff.active_to.is_(None),
+            )
+        )
+        return {(class_id, user_id) for class_id, user_id in result.all()}
+    
+    async def bulk_assign_staff(self, pairs: list[tuple[int, int]]) -> int:
+        """Ko'p biriktirishni bitta INSERT bilan yaratish (commit qilmaydi)."""
+        if not pairs:
+            return 0
+        await self.session.execute(
+            insert(ClassStaff),
+            [{"class_id": class_id, "staff_user_id": user_id} for class_id, user_id in pairs],
+        )
+        return len(pairs)
+    
     async def remove_staff(self, class_staff: ClassStaff) -> None:
         """Xodimni sinfdan olib tashlash."""
         from datetime import datetime
@@ -107,19 +169,44 @@ class ClassRepository:
         
     async def increment_student_count(self, class_id: int) -> None:
         """Sinf o'quvchilar sonini oshirish."""
-        await self.session.execute(
-            update(Class)
-            .where(Class.id == class_id)
-            .values(total_students=Class.total_students + 1)
-        )
+        await self.adjust_student_count(class_id, 1)
         await self.session.commit()
 
     async def decrement_student_count(self, class_id: int) -> None:
         """Sinf o'quvchilar sonini kamaytirish."""
+        await self.adjust_student_count(class_id, -1)
+        await self.session.commit()
+
+    async def bump_roster_versions(self, class_ids: set[int]) -> None:
+        """
+        Sinflar ``roster_version`` ini oshirish (commit qilmaydi).
+        
+        Jurnalsiz ommaviy yuklashdan keyin eksport keshlari eskirishi uchun.
+        """
+        if not class_ids:
+            return
         await self.session.execute(
             update(Class)
-            .where(Class.id == class_id)
-            .values(total_students=Class.total_students - 1)
+            .where(Class.id.in_(class_ids))
+            .values(roster_version=Class.roster_version + 1)
         )
-        await self.session.commit()
 
+    async def adjust_student_count(self, class_id: int, delta: int) -> None:
+        """
+        Sinf o'quvchilar sonini ``delta`` ga o'zgartirish (commit qilmaydi).
+
+        Ommaviy amallar sinf uchun bir marta chaqiradi - ``roster_version``
+        ham bir marta oshadi.
+        """
+        if not delta:
+            return
+        await self.session.execute(
+            update(Class)
+            .where(Class.id == class_id)
+            .values(
+                total_students=Class.total_students + delta,
+                roster_version=Class.roster_version + 1,
+            )
+        )
+        # Yakunlanmagan kunlar xulosasidagi jami ham o'zgaradi
+        await StatsRepository(self.session).adjust_open_totals(class_id, delta)
@@ -0,0 +1,191 @@
+"""Export repository - eksportlar uchun oqimli (server-side cursor) so'rovlar."""
+import hashlib
+from datetime import date
+from typing import AsyncIterator, Optional
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from core.db.models import (
+    AttendanceChange,
+    AttendanceDay,
+    AttendanceItem,
+    Class,
+    Student,
+    StudentAttendanceStats,
+    User,
+)
+
+
+class ExportRepository:
+    """
+    Katta hajmdagi o'qishlar.
+
+    Natijalar ``session.stream`` orqali ``EXPORT_FETCH_SIZE`` qatordan
+    olinadi va bittadan qaytariladi - xotirada butun natija saqlanmaydi.
+    """
+
+    def __init__(self, session: AsyncSession, fetch_size: Optional[int] = None):
+        self.session = session
+        self.fetch_size = fetch_size or settings.EXPORT_FETCH_SIZE
+
+    async def stream_roster(self, class_id: int, period: str) -> AsyncIterator[tuple]:
+        """
+        Sinf ro'yxati chorak hisoblagichlari bilan.
+
+        Yields:
+            (full_name, is_active, present, late, absent, absence_streak)
+        """
+        result = await self.session.stream(
+            select(
+                Student.full_name,
+                Student.is_active,
+                StudentAttendanceStats.present,
+                StudentAttendanceStats.late,
+                StudentAttendanceStats.absent,
+                StudentAttendanceStats.absence_streak,
+            )
+            .outerjoin(
+                StudentAttendanceStats,
+                and_(
+                    StudentAttendanceStats.student_id == Student.id,
+                    StudentAttendanceStats.period == period,
+                ),
+            )
+            .where(Student.class_id == class_id, Student.is_active == True)
+            .order_by(Student.full_name, Student.id)
+            .execution_options(yield_per=self.fetch_size)
+        )
+        async for full_name, is_active, present, late, absent, streak in result:
+            yield full_name, is_active, present or 0, late or 0, absent or 0, streak or 0
+
+    async def get_data_version(self, class_id: Optional[int], start: date, end: date) -> str:
+        """
+        Ro'yxat va oraliqdagi davomat versiyasi (eksport keshlari uchun).
+
+        Sinflarning (``class_id=None`` bo'lsa barchasining) ``(id,
+        created_at, roster_version)`` to'plami xeshi va jurnaldagi shu
+        oraliq bo'yicha oxirgi ``seq`` dan tuziladi. Yig'indidan farqli
+        ravishda sinf o'chirilsa, ID qayta ishlatilsa yoki istalgan sinf
+        versiyasi oshsa kalit albatta o'zgaradi; ma'lumot o'zgarmasa
+        qiymat ham o'zgarmaydi.
+        """
+        roster = select(Class.id, Class.created_at, Class.roster_version).order_by(Class.id)
+        changes = select(func.coalesce(func.max(AttendanceChange.seq), 0)).where(
+            AttendanceChange.date >= start,
+            AttendanceChange.date <= end,
+        )
+        if class_id is not None:
+            roster = roster.where(Class.id == class_id)
+            changes = changes.where(AttendanceChange.class_id == class_id)
+
+        digest = hashlib.sha1()
+        count = 0
+        for row_id, created_at, roster_version in (await self.session.execute(roster)).all():
+            digest.update(f"{row_id}:{created_at.isoformat()}:{roster_version};".encode())
+            count += 1
+        last_seq = await self.session.scalar(changes)
+        return f"{count}.{digest.hexdigest()[:16]}.{last_seq}"
+
+    async def get_school_days(self, class_id: int, start: date, end: date) -> list[date]:
+        """Sinf uchun davomat ochilgan kunlar (oraliq ichida)."""
+        result = await self.session.execute(
+            select(AttendanceDay.date)
+            .where(
+                AttendanceDay.class_id == class_id,
+                AttendanceDay.date >= start,
+                AttendanceDay.date <= end,
+            )
+            .order_by(AttendanceDay.date)
+        )
+        return list(result.scalars().all())
+
+    async def stream_status_matrix(
+        self,
+        class_id: int,
+        start: date,
+        end: date,
+    ) -> AsyncIterator[tuple[int, str, dict[date, int]]]:
+        """
+        O'quvchilar × kunlar status matritsasi, o'quvchi bo'yicha qatorma-qator.
+
+        Sinfning faol o'quvchilari va oraliqda shu sinfda belgilangan
+        (keyin ko'chirilgan) o'quvchilar kiradi. Bir vaqtda faqat bitta
+        o'quvchining qatori xotirada bo'ladi.
+
+        Yields:
+            (student_id, full_name, {date: status})
+        """
+        items = (
+            select(
+                AttendanceItem.student_id.label("student_id"),
+                AttendanceDay.date.label("date"),
+                AttendanceItem.status.label("status"),
+            )
+            .join(AttendanceDay, AttendanceDay.id == AttendanceItem.attendance_day_id)
+            .where(
+                AttendanceDay.class_id == class_id,
+                AttendanceDay.date >= start,
+                AttendanceDay.date <= end,
+            )
+            .subquery()
+        )
+        result = await self.session.stream(
+            select(Student.id, Student.full_name, items.c.date, items.c.status)
+            .outerjoin(items, items.c.student_id == Student.id)
+            .where(or_(
+                and_(Student.class_id == class_id, Student.is_active == True),
+                items.c.student_id.isnot(None),
+            ))
+            .order_by(Student.full_name, Student.id, items.c.date)
+            .execution_options(yield_per=self.fetch_size)
+        )
+
+        current_id: Optional[int] = None
+        current_name = ""
+        statuses: dict[date, int] = {}
+        async for student_id, full_name, date_val, status in result:
+            if student_id != current_id:
+                if current_id is not None:
+                    yield current_id, current_name, statuses
+                current_id, current_name, statuses = student_id, full_name, {}
+            if date_val is not None:
+                statuses[date_val] = status
+        if current_id is not None:
+            yield current_id, current_name, statuses
+
+    async def stream_attendance(
+        self,
+        start: date,
+        end: date,
+        class_id: Optional[int] = None,
+    ) -> AsyncIterator[tuple]:
+        """
+        Xom davomat yozuvlari (sana, sinf va o'quvchi bo'yicha tartiblangan).
+
+        Yields:
+            (date, class_name, student_name, status, marked_by_name, updated_at)
+        """
+        criteria = [AttendanceDay.date >= start, AttendanceDay.date <= end]
+        if class_id is not None:
+            criteria.append(AttendanceDay.class_id == class_id)
+
+        result = await self.session.stream(
+            select(
+                AttendanceDay.date,
+                Class.name,
+                Student.full_name,
+                AttendanceItem.status,
+                User.full_name,
+                AttendanceItem.updated_at,
+            )
+            .select_from(AttendanceItem)
+            .join(AttendanceDay, AttendanceDay.id == AttendanceItem.attendance_day_id)
+            .join(Class, Class.id == AttendanceDay.class_id)
+            .join(Student, Student.id == AttendanceItem.student_id)
+            .outerjoin(User, User.id == AttendanceDay.marked_by)
+            .where(*criteria)
+            .order_by(AttendanceDay.date, Class.name, Student.full_name)
+            .execution_options(yield_per=self.fetch_size)
+        )
+        async for row in result:
+            yield tuple(row)
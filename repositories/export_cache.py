@@ -0,0 +1,99 @@
+"""Export cache repository - yuklangan eksport fayllarining file_id'lari."""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db.models import ExportFile
+
+
+class ExportCacheRepository:
+    """
+    ``(kind, class_id, params)`` bo'yicha oxirgi yuklangan fayl.
+
+    Har bir kalit uchun bitta yozuv saqlanadi: versiya o'zgarganda yangi
+    ``file_id`` eskisining ustiga yoziladi.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get(self, kind: str, class_id: int, params: str, version: str) -> Optional[ExportFile]:
+        """Shu versiyadagi fayl (versiya mos kelmasa None)."""
+        result = await self.session.execute(
+            select(ExportFile).where(
+                ExportFile.kind == kind,
+                ExportFile.class_id == class_id,
+                ExportFile.params == params,
+                ExportFile.version == version,
+            )
+        )
+        return result.scalar_one_or_none()
+    
+    async def put(
+        self,
+        kind: str,
+        class_id: int,
+        params: str,
+        version: str,
+        file_id: str,
+        caption: str = "",
+    ) -> None:
+        """Faylni saqlash yoki yangilash."""
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(ExportFile)
+            .where(
+                ExportFile.kind == kind,
+                ExportFile.class_id == class_id,
+                ExportFile.params == params,
+            )
+            .values(version=version, file_id=file_id, caption=caption, created_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await self.session.commit()
+            return
+        
+        self.session.add(ExportFile(
+            kind=kind,
+            class_id=class_id,
+            params=params,
+            version=version,
+            file_id=file_id,
+            caption=caption,
+            created_at=now,
+        ))
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            # Boshqa jarayon bir vaqtda yozdi - uning fayli ham yaroqli
+            await self.session.rollback()
+    
+    async def forget(self, kind: str, class_id: int, params: str) -> None:
+        """Yaroqsiz bo'lib qolgan ``file_id`` ni o'chirish."""
+        await self.session.execute(
+            update(ExportFile)
+            .where(
+                ExportFile.kind == kind,
+                ExportFile.class_id == class_id,
+                ExportFile.params == params,
+            )
+            .values(version="")
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+    
+    async def invalidate_classes(self, class_ids: set[int]) -> int:
+        """
+        Sinflar va umumiy (``class_id=0``) eksportlar keshini o'chirish (commit qilmaydi).
+        
+        Returns:
+            O'chirilgan yozuvlar soni
+        """
+        result = await self.session.execute(
+            delete(ExportFile)
+            .where(ExportFile.class_id.in_(class_ids | {0}))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
@@ -0,0 +1,114 @@
+"""Journal repository - davomat o'zgarishlari jurnali va iste'molchi kursorlari."""
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db.models import AttendanceChange, JournalCursor
+
+
+class JournalRepository:
+    """
+    Jurnalga yozish va undan o'qish.
+
+    ``record`` yozuvlarni xotirada to'playdi, ``flush`` ularni bitta
+    ko'p qatorli INSERT bilan joriy tranzaksiyaga qo'shadi. ``flush``
+    commit qilmaydi - jurnal davomat yozuvlari bilan birga saqlanadi
+    yoki birga bekor qilinadi.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._pending: list[dict] = []
+
+    def record(
+        self,
+        attendance_day_id: int,
+        class_id: int,
+        date_val: date,
+        student_id: int,
+        old_status: Optional[int],
+        new_status: int,
+        changed_by: Optional[int] = None,
+    ) -> None:
+        """O'zgarishni navbatdagi ``flush`` uchun qo'shish."""
+        self._pending.append({
+            "attendance_day_id": attendance_day_id,
+            "class_id": class_id,
+            "date": date_val,
+            "student_id": student_id,
+            "old_status": old_status,
+            "new_status": new_status,
+            "changed_by": changed_by,
+            "changed_at": datetime.utcnow(),
+        })
+
+    async def flush(self) -> int:
+        """To'plangan yozuvlarni bazaga yozish (commit qilmaydi)."""
+        if not self._pending:
+            return 0
+        rows, self._pending = self._pending, []
+        await self.session.execute(insert(AttendanceChange), rows)
+        return len(rows)
+
+    async def last_seq(self) -> int:
+        """Jurnaldagi oxirgi ``seq`` (bo'sh bo'lsa 0)."""
+        result = await self.session.execute(select(func.max(AttendanceChange.seq)))
+        return result.scalar() or 0
+
+    async def read_since(self, after_seq: int, limit: int = 1000) -> list[AttendanceChange]:
+        """``after_seq`` dan keyingi yozuvlar, ``seq`` bo'yicha tartiblangan."""
+        result = await self.session.execute(
+            select(AttendanceChange)
+            .where(AttendanceChange.seq > after_seq)
+            .order_by(AttendanceChange.seq)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_for_student(self, student_id: int, limit: int = 50) -> list[AttendanceChange]:
+        """O'quvchi bo'yicha oxirgi o'zgarishlar (audit uchun)."""
+        result = await self.session.execute(
+            select(AttendanceChange)
+            .where(AttendanceChange.student_id == student_id)
+            .order_by(AttendanceChange.seq.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_cursor(self, consumer: str) -> int:
+        """Iste'molchining oxirgi qayta ishlangan ``seq`` qiymati."""
+        result = await self.session.execute(
+            select(JournalCursor.last_seq).where(JournalCursor.consumer == consumer)
+        )
+        return result.scalar() or 0
+
+    async def advance_cursor(self, consumer: str, seq: int) -> bool:
+        """
+        Kursorni ``seq`` gacha surish (commit qilmaydi).
+
+        Faqat oldinga suriladi: boshqa jarayon allaqachon kattaroq
+        qiymat yozgan bo'lsa, False qaytadi.
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(JournalCursor)
+            .where(JournalCursor.consumer == consumer, JournalCursor.last_seq < seq)
+            .values(last_seq=seq, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            return True
+
+        exists = await self.session.execute(
+            select(JournalCursor.consumer).where(JournalCursor.consumer == consumer)
+        )
+        if exists.scalar() is not None:
+            return False
+
+        try:
+            async with self.session.begin_nested():
+                self.session.add(JournalCursor(consumer=consumer, last_seq=seq, updated_at=now))
+        except IntegrityError:
+            return False
+        return True
@@ -0,0 +1,87 @@
+"""Lease repository - fon ishlari uchun taqsimlangan qulf."""
+from datetime import datetime, timedelta
+from sqlalchemy import case, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db.models import JobLease
+
+
+class LeaseRepository:
+    """
+    Lease'larni olish, yangilash va bo'shatish.
+    
+    Barcha o'zgarishlar shartli UPDATE orqali bajariladi, shuning uchun
+    bir vaqtda urinayotgan jarayonlardan faqat bittasi muvaffaqiyatga
+    erishadi (SQLite va boshqa SQL bazalarda bir xil ishlaydi).
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def try_acquire(self, name: str, holder: str, ttl: float) -> bool:
+        """
+        Lease'ni olish: bo'sh, muddati o'tgan yoki allaqachon shu
+        jarayonniki bo'lsa muvaffaqiyatli.
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl)
+        
+        result = await self.session.execute(
+            update(JobLease)
+            .where(
+                JobLease.name == name,
+                or_(JobLease.holder == holder, JobLease.expires_at < now),
+            )
+            .values(
+                holder=holder,
+                token=case((JobLease.holder == holder, JobLease.token), else_=JobLease.token + 1),
+                acquired_at=now,
+                expires_at=expires_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await self.session.commit()
+            return True
+        
+        # Yozuv hali yo'q - birinchi bo'lib yaratgan jarayon oladi
+        self.session.add(JobLease(
+            name=name,
+            holder=holder,
+            token=1,
+            acquired_at=now,
+            expires_at=expires_at,
+        ))
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            return False
+        return True
+    
+    async def renew(self, name: str, holder: str, ttl: float) -> bool:
+        """Lease muddatini uzaytirish (faqat egasi va muddati o'tmagan bo'lsa)."""
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(JobLease)
+            .where(
+                JobLease.name == name,
+                JobLease.holder == holder,
+                JobLease.expires_at >= now,
+            )
+            .values(expires_at=now + timedelta(seconds=ttl))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return bool(result.rowcount)
+    
+    async def release(self, name: str, holder: str) -> bool:
+        """Lease'ni bo'shatish - boshqa jarayon darhol olishi mumkin."""
+        result = await self.session.execute(
+            update(JobLease)
+            .where(JobLease.name == name, JobLease.holder == holder)
+            .values(expires_at=datetime(1970, 1, 1))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return bool(result.rowcount)
@@ -0,0 +1,458 @@
+"""Stats repository - davomat xulosalari va o'quvchilar hisoblagichlari."""
+from dataclasses import dataclass
+from datetime import date
+from typing import AsyncIterator, Optional
+from sqlalchemy import case, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from core.db.models import (
+    AttendanceDay,
+    AttendanceDayStats,
+    AttendanceItem,
+    Class,
+    StudentAttendanceStats,
+)
+from utils.dates import get_academic_period, parse_term_starts
+
+# Status -> xulosa ustuni
+STATUS_COLUMNS = {
+    settings.STATUS_PRESENT: "present",
+    settings.STATUS_LATE: "late",
+    settings.STATUS_ABSENT: "absent",
+}
+
+
+class StatsRepository:
+    """
+    Kunlik xulosalarni yuritish.
+
+    Metodlar commit qilmaydi - ular chaqiruvchi repository'ning
+    tranzaksiyasi ichida (davomat yozuvi bilan birga) bajariladi.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_for_day(self, attendance_day: AttendanceDay, total: int) -> None:
+        """Yangi davomat kuni uchun bo'sh xulosa qo'shish."""
+        self.session.add(AttendanceDayStats(
+            attendance_day_id=attendance_day.id,
+            class_id=attendance_day.class_id,
+            date=attendance_day.date,
+            present=0,
+            late=0,
+            absent=0,
+            marked=0,
+            total=total,
+            is_finalized=False,
+        ))
+
+    async def apply_status_change(
+        self,
+        attendance_day_id: int,
+        old_status: Optional[int],
+        new_status: int,
+    ) -> None:
+        """Eski status hisoblagichini kamaytirib, yangisini oshirish."""
+        if old_status == new_status:
+            return
+
+        values = {}
+        new_column = STATUS_COLUMNS[new_status]
+        values[new_column] = getattr(AttendanceDayStats, new_column) + 1
+        if old_status is None:
+            values["marked"] = AttendanceDayStats.marked + 1
+        else:
+            old_column = STATUS_COLUMNS[old_status]
+            values[old_column] = getattr(AttendanceDayStats, old_column) - 1
+
+        result = await self.session.execute(
+            update(AttendanceDayStats)
+            .where(AttendanceDayStats.attendance_day_id == attendance_day_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            # Xulosa hali yo'q (eski kun) - yozuvlardan to'liq hisoblash
+            await self.session.flush()
+            await self.recompute_day(attendance_day_id)
+
+    async def set_finalized(self, attendance_day_id: int, is_finalized: bool, total: int) -> None:
+        """Bitta kunning yakunlanganlik belgisi va jamisini yangilash."""
+        await self.session.execute(
+            update(AttendanceDayStats)
+            .where(AttendanceDayStats.attendance_day_id == attendance_day_id)
+            .values(is_finalized=is_finalized, total=total)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def sync_finalized(self, before_date: date) -> None:
+        """``before_date`` dan oldingi xulosalardagi belgi va jamini davomat kunlaridan olish."""
+        day = select(AttendanceDay).where(AttendanceDay.id == AttendanceDayStats.attendance_day_id)
+        await self.session.execute(
+            update(AttendanceDayStats)
+            .where(
+                AttendanceDayStats.date < before_date,
+                AttendanceDayStats.is_finalized == False,
+            )
+            .values(
+                is_finalized=day.with_only_columns(AttendanceDay.is_finalized).scalar_subquery(),
+                total=func.coalesce(
+                    day.with_only_columns(AttendanceDay.total_students).scalar_subquery(),
+                    AttendanceDayStats.total,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def adjust_open_totals(self, class_id: int, delta: int) -> None:
+        """Sinf o'quvchilar soni o'zgarganda yakunlanmagan kunlar jamisini tuzatish."""
+        await self.session.execute(
+            update(AttendanceDayStats)
+            .where(
+                AttendanceDayStats.class_id == class_id,
+                AttendanceDayStats.is_finalized == False,
+            )
+            .values(total=AttendanceDayStats.total + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_by_day(self, attendance_day_id: int) -> Optional[AttendanceDayStats]:
+        """Bitta kun xulosasi."""
+        result = await self.session.execute(
+            select(AttendanceDayStats)
+            .where(AttendanceDayStats.attendance_day_id == attendance_day_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_for_date(self, date_val: date) -> list[tuple[AttendanceDayStats, str]]:
+        """Sana bo'yicha barcha sinflar xulosalari: [(stats, class_name), ...]."""
+        result = await self.session.execute(
+            select(AttendanceDayStats, Class.name)
+            .join(Class, Class.id == AttendanceDayStats.class_id)
+            .where(AttendanceDayStats.date == date_val)
+            .order_by(Class.name)
+        )
+        return [(stats, class_name) for stats, class_name in result.all()]
+
+    async def get_missing_day_ids(self, date_val: date) -> list[int]:
+        """Sana bo'yicha xulosasi yo'q davomat kunlari (migratsiyadan oldingi kunlar)."""
+        result = await self.session.execute(
+            select(AttendanceDay.id)
+            .outerjoin(
+                AttendanceDayStats,
+                AttendanceDayStats.attendance_day_id == AttendanceDay.id,
+            )
+            .where(
+                AttendanceDay.date == date_val,
+                AttendanceDayStats.attendance_day_id.is_(None),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_class_totals(self, start: date, end: date) -> list[tuple]:
+        """
+        Oraliq bo'yicha har bir sinf jami (kunlik xulosalardan, bitta so'rov).
+        
+        Returns:
+            [(class_id, class_name, total_students, days, present, late, absent), ...]
+        """
+        result = await self.session.execute(
+            select(
+                Class.id,
+                Class.name,
+                Class.total_students,
+                func.count(AttendanceDayStats.attendance_day_id),
+                func.coalesce(func.sum(AttendanceDayStats.present), 0),
+                func.coalesce(func.sum(AttendanceDayStats.late), 0),
+                func.coalesce(func.sum(AttendanceDayStats.absent), 0),
+            )
+            .outerjoin(
+                AttendanceDayStats,
+                (AttendanceDayStats.class_id == Class.id)
+                & (AttendanceDayStats.date >= start)
+                & (AttendanceDayStats.date <= end),
+            )
+            .group_by(Class.id, Class.name, Class.total_students)
+            .order_by(Class.name)
+        )
+        return [tuple(row) for row in result.all()]
+    
+    async def recompute_day(self, attendance_day_id: int) -> None:
+        """Bitta kun xulosasini yozuvlardan qayta hisoblash."""
+        await self.session.execute(
+            delete(AttendanceDayStats)
+            .where(AttendanceDayStats.attendance_day_id == attendance_day_id)
+        )
+        await self.session.execute(
+            self._insert_from_items(AttendanceDay.id == attendance_day_id)
+        )
+
+    async def rebuild(self) -> int:
+        """
+        Barcha xulosalarni yozuvlardan qayta yaratish (backfill / tuzatish).
+
+        Returns:
+            Yaratilgan xulosalar soni
+        """
+        await self.session.execute(delete(AttendanceDayStats))
+        await self.session.execute(self._insert_from_items())
+        result = await self.session.execute(
+            select(func.count()).select_from(AttendanceDayStats)
+        )
+        return result.scalar() or 0
+
+    @staticmethod
+    def _insert_from_items(*criteria):
+        """INSERT ... SELECT: kunlar bo'yicha yozuvlarni guruhlab hisoblash."""
+        def count_status(status: int):
+            return func.coalesce(func.sum(case((AttendanceItem.status == status, 1), else_=0)), 0)
+
+        marked = func.count(AttendanceItem.id)
+        query = (
+            select(
+                AttendanceDay.id,
+                AttendanceDay.class_id,
+                AttendanceDay.date,
+                count_status(settings.STATUS_PRESENT),
+                count_status(settings.STATUS_LATE),
+                count_status(settings.STATUS_ABSENT),
+                marked,
+                # Yakunlangan kunda jami - yakunlash paytidagi ro'yxat (kundagi
+                # total_students); u yo'q bo'lsa (import) - belgilanganlar
+                case(
+                    (
+                        (AttendanceDay.is_finalized == True)
+                        & AttendanceDay.total_students.is_not(None),
+                        AttendanceDay.total_students,
+                    ),
+                    (AttendanceDay.is_finalized == True, marked),
+                    else_=Class.total_students,
+                ),
+                AttendanceDay.is_finalized,
+            )
+            .select_from(AttendanceDay)
+            .join(Class, Class.id == AttendanceDay.class_id)
+            .outerjoin(AttendanceItem, AttendanceItem.attendance_day_id == AttendanceDay.id)
+            .where(*criteria)
+            .group_by(
+                AttendanceDay.id,
+                AttendanceDay.class_id,
+                AttendanceDay.date,
+                AttendanceDay.is_finalized,
+                AttendanceDay.total_students,
+                Class.total_students,
+            )
+        )
+        return insert(AttendanceDayStats).from_select(
+            [
+                "attendance_day_id",
+                "class_id",
+                "date",
+                "present",
+                "late",
+                "absent",
+                "marked",
+                "total",
+                "is_finalized",
+            ],
+            query,
+        )
+
+
+@dataclass
+class StudentCounters:
+    """O'quvchining bitta davr bo'yicha hisoblagichlari (qayta hisoblash uchun)."""
+
+    present: int = 0
+    late: int = 0
+    absent: int = 0
+    absence_streak: int = 0
+    last_date: Optional[date] = None
+
+    def add(self, date_val: date, status: int) -> None:
+        """Navbatdagi (sana bo'yicha o'sib boruvchi) yozuvni qo'shish."""
+        column = STATUS_COLUMNS.get(status)
+        if column is None:
+            return
+        setattr(self, column, getattr(self, column) + 1)
+        self.absence_streak = self.absence_streak + 1 if status == settings.STATUS_ABSENT else 0
+        self.last_date = date_val
+
+    def as_tuple(self) -> tuple:
+        return (self.present, self.late, self.absent, self.absence_streak, self.last_date)
+
+
+class StudentStatsRepository:
+    """
+    O'quvchilar hisoblagichlari (student_attendance_stats).
+
+    Har bir status yozuvida bitta shartli UPDATE bilan yangilanadi.
+    Metodlar commit qilmaydi.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.term_starts = parse_term_starts(settings.ACADEMIC_TERMS)
+
+    def period_for(self, date_val: date) -> str:
+        return get_academic_period(date_val, self.term_starts)
+
+    async def apply_status_change(
+        self,
+        student_id: int,
+        date_val: date,
+        old_status: Optional[int],
+        new_status: int,
+    ) -> None:
+        """Hisoblagichlarni va ketma-ket kelmaslik seriyasini yangilash."""
+        if old_status == new_status:
+            return
+
+        period = self.period_for(date_val)
+        counters = {}
+        new_column = STATUS_COLUMNS[new_status]
+        counters[new_column] = getattr(StudentAttendanceStats, new_column) + 1
+        if old_status is not None:
+            old_column = STATUS_COLUMNS[old_status]
+            counters[old_column] = getattr(StudentAttendanceStats, old_column) - 1
+
+        # Yangi kun uchun seriya shu yerning o'zida hisoblanadi. O'sha kun
+        # "kelmadi" ga tuzatilsa, seriya avvalgi belgilashda 0 ga tushgan va
+        # undan oldingi qiymat saqlanmagan - bu holat qayta hisoblanadi.
+        is_absent = new_status == settings.STATUS_ABSENT
+        was_absent = old_status == settings.STATUS_ABSENT
+        streak = StudentAttendanceStats.absence_streak
+        last_date = StudentAttendanceStats.last_date
+        in_place = last_date < date_val if is_absent and not was_absent else last_date <= date_val
+        result = await self.session.execute(
+            update(StudentAttendanceStats)
+            .where(
+                StudentAttendanceStats.student_id == student_id,
+                StudentAttendanceStats.period == period,
+                or_(last_date.is_(None), in_place),
+            )
+            .values(**counters, absence_streak=streak + 1 if is_absent else 0, last_date=date_val)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            return
+
+        # Eski kun o'zgartirildi yoki yozuv hali yo'q - shu o'quvchi davrini qayta hisoblash
+        await self.session.flush()
+        await self.recompute_student(student_id, period)
+
+    async def get_for_students(
+        self,
+        student_ids: list[int],
+        period: str,
+    ) -> dict[int, StudentAttendanceStats]:
+        """Bir nechta o'quvchi hisoblagichlari (bitta so'rov)."""
+        if not student_ids:
+            return {}
+        result = await self.session.execute(
+            select(StudentAttendanceStats).where(
+                StudentAttendanceStats.student_id.in_(student_ids),
+                StudentAttendanceStats.period == period,
+            )
+        )
+        return {row.student_id: row for row in result.scalars().all()}
+
+    async def recompute_student(self, student_id: int, period: str) -> None:
+        """Bitta o'quvchining bitta davr hisoblagichlarini yozuvlardan qayta hisoblash."""
+        counters: dict[str, StudentCounters] = {}
+        async for row_student_id, date_val, status in self._stream_items(
+            AttendanceItem.student_id == student_id
+        ):
+            row_period = self.period_for(date_val)
+            if row_period == period:
+                counters.setdefault(period, StudentCounters()).add(date_val, status)
+
+        await self.session.execute(
+            delete(StudentAttendanceStats).where(
+                StudentAttendanceStats.student_id == student_id,
+                StudentAttendanceStats.period == period,
+            )
+        )
+        if period in counters:
+            await self._insert_rows([(student_id, period, counters[period])])
+
+    async def compute_all(self) -> dict[tuple[int, str], StudentCounters]:
+        """Barcha hisoblagichlarni yozuvlardan hisoblash (saqlamasdan)."""
+        counters: dict[tuple[int, str], StudentCounters] = {}
+        periods: dict[date, str] = {}  # kunlar soni kam - davr har sana uchun bir marta
+        async for student_id, date_val, status in self._stream_items():
+            period = periods.get(date_val)
+            if period is None:
+                period = periods[date_val] = self.period_for(date_val)
+            key = (student_id, period)
+            counters.setdefault(key, StudentCounters()).add(date_val, status)
+        return counters
+
+    async def rebuild(self, batch_size: int = 5000) -> int:
+        """
+        Barcha hisoblagichlarni qayta yaratish (backfill / tuzatish).
+
+        Returns:
+            Yaratilgan yozuvlar soni
+        """
+        counters = await self.compute_all()
+        await self.session.execute(delete(StudentAttendanceStats))
+        rows = [(student_id, period, value) for (student_id, period), value in counters.items()]
+        for start in range(0, len(rows), batch_size):
+            await self._insert_rows(rows[start:start + batch_size])
+        return len(rows)
+
+    async def check(self) -> list[tuple[int, str, Optional[tuple], Optional[tuple]]]:
+        """
+        Saqlangan hisoblagichlarni yozuvlardan hisoblangani bilan solishtirish.
+
+        Returns:
+            Farqlar: [(student_id, period, saqlangan, kutilgan), ...]
+        """
+        expected = {key: value.as_tuple() for key, value in (await self.compute_all()).items()}
+        result = await self.session.execute(select(StudentAttendanceStats))
+        stored = {
+            (row.student_id, row.period): (
+                row.present, row.late, row.absent, row.absence_streak, row.last_date,
+            )
+            for row in result.scalars().all()
+        }
+        mismatches = []
+        for key in sorted(set(expected) | set(stored)):
+            if expected.get(key) != stored.get(key):
+                mismatches.append((key[0], key[1], stored.get(key), expected.get(key)))
+        return mismatches
+
+    async def _stream_items(self, *criteria) -> AsyncIterator[tuple[int, date, int]]:
+        """(student_id, date, status) - o'quvchi va sana bo'yicha tartiblangan."""
+        result = await self.session.stream(
+            select(AttendanceItem.student_id, AttendanceDay.date, AttendanceItem.status)
+            .join(AttendanceDay, AttendanceDay.id == AttendanceItem.attendance_day_id)
+            .where(*criteria)
+            .order_by(AttendanceItem.student_id, AttendanceDay.date)
+            .execution_options(yield_per=5000)
+        )
+        # Paketlab o'qish - har qator uchun alohida greenlet almashuvi bo'lmaydi
+        async for partition in result.partitions():
+            for row in partition:
+                yield row[0], row[1], row[2]
+
+    async def _insert_rows(self, rows: list[tuple[int, str, StudentCounters]]) -> None:
+        if not rows:
+            return
+        await self.session.execute(
+            insert(StudentAttendanceStats),
+            [
+                {
+                    "student_id": student_id,
+                    "period": period,
+                    "present": value.present,
+                    "late": value.late,
+                    "absent": value.absent,
+                    "absence_streak": value.absence_streak,
+                    "last_date": value.last_date,
+                }
+                for student_id, period, value in rows
+            ],
+        )
@@ -1,8 +1,8 @@
 """Student repository - o'quvchilar bilan ishlash."""
 from typing import Optional
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from core.db.models import Student
+from core.db.models import Student, StudentAttendanceStats
 
 
 class StudentRepository:
@@ -23,6 +23,26 @@ class StudentRepository:
         result = await self.session.execute(query)
         return list(result.scalars().all())
     
+    async def get_by_class_with_stats(
+        self,
+        class_id: int,
+        period: str,
+    ) -> list[tuple[Student, Optional[StudentAttendanceStats]]]:
+        """Sinfdagi faol o'quvchilar va ularning davr hisoblagichlari (bitta so'rov)."""
+        result = await self.session.execute(
+            select(Student, StudentAttendanceStats)
+            .outerjoin(
+                StudentAttendanceStats,
+                and_(
+                    StudentAttendanceStats.student_id == Student.id,
+                    StudentAttendanceStats.period == period,
+                ),
+            )
+            .where(Student.class_id == class_id, Student.is_active == True)
+            .order_by(Student.full_name)
+        )
+        return [(student, stats) for student, stats in result.all()]
+    
     async def get_by_id(self, student_id: int) -> Optional[Student]:
         """ID bo'yicha o'quvchini topish."""
         result = await self.session.execute(
@@ -42,11 +62,61 @@ class StudentRepository:
         await self.session.refresh(student)
         return student
     
+    async def get_active_names(self, class_id: int) -> list[str]:
+        """Sinfdagi faol o'quvchilar ismlari (takrorlarni tekshirish uchun)."""
+        result = await self.session.execute(
+            select(Student.full_name)
+            .where(Student.class_id == class_id, Student.is_active == True)
+        )
+        return list(result.scalars().all())
+    
+    async def get_names(
+        self,
+        class_ids: Optional[set[int]] = None,
+    ) -> list[tuple[int, int, str]]:
+        """Barcha (yoki berilgan sinflardagi) o'quvchilar: [(id, class_id, full_name), ...]."""
+        query = select(Student.id, Student.class_id, Student.full_name)
+        if class_ids is not None:
+            query = query.where(Student.class_id.in_(class_ids))
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+    
+    async def bulk_create(self, rows: list[dict]) -> int:
+        """Ko'p o'quvchini bitta INSERT bilan qo'shish (commit qilmaydi)."""
+        if not rows:
+            return 0
+        await self.session.execute(insert(Student), rows)
+        return len(rows)
+    
     async def delete(self, student: Student) -> None:
         """O'quvchini o'chirish (soft delete)."""
         student.is_active = False
         await self.session.commit()
     
+    async def move_students(
+        self,
+        from_class_id: int,
+        to_class_id: int,
+        student_ids: Optional[list[int]] = None,
+    ) -> int:
+        """
+        Sinfning faol o'quvchilarini (yoki ``student_ids``) boshqa sinfga
+        bitta UPDATE bilan o'tkazish (commit qilmaydi).
+        
+        Returns:
+            O'tkazilgan o'quvchilar soni
+        """
+        query = (
+            update(Student)
+            .where(Student.class_id == from_class_id, Student.is_active == True)
+            .values(class_id=to_class_id)
+            .execution_options(synchronize_session=False)
+        )
+        if student_ids is not None:
+            query = query.where(Student.id.in_(student_ids))
+        result = await self.session.execute(query)
+        return result.rowcount
+    
     async def transfer_student(self, student: Student, to_class_id: int) -> None:
         """O'quvchini boshqa sinfga o'tkazish."""
         student.class_id = to_class_id
@@ -1,10 +1,10 @@
 """Transfer repository - transfer bilan ishlash."""
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import insert, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from core.db.models import Transfer
+from core.db.models import Student, Transfer
 
 
 class TransferRepository:
@@ -33,6 +33,47 @@ class TransferRepository:
         await self.session.refresh(transfer)
         return transfer
     
+    async def bulk_create(self, rows: list[dict]) -> int:
+        """Ko'p transferni bitta INSERT bilan yaratish (commit qilmaydi)."""
+        if not rows:
+            return 0
+        await self.session.execute(insert(Transfer), rows)
+        return len(rows)
+    
+    async def create_for_students(
+        self,
+        from_class_id: int,
+        to_class_id: int,
+        by_user_id: int,
+        student_ids: Optional[list[int]] = None,
+    ) -> int:
+        """
+        Sinfning faol o'quvchilari (yoki ``student_ids``) uchun transferlar -
+        bitta INSERT ... SELECT (commit qilmaydi).
+        
+        ``StudentRepository.move_students`` dan oldin chaqiriladi.
+        
+        Returns:
+            Yozilgan transferlar soni
+        """
+        source = select(
+            Student.id,
+            Student.class_id,
+            literal(to_class_id),
+            literal(datetime.utcnow()),
+            literal(by_user_id),
+        ).where(Student.class_id == from_class_id, Student.is_active == True)
+        if student_ids is not None:
+            source = source.where(Student.id.in_(student_ids))
+        
+        result = await self.session.execute(
+            insert(Transfer).from_select(
+                ["student_id", "from_class_id", "to_class_id", "transferred_at", "by_user_id"],
+                source,
+            )
+        )
+        return result.rowcount
+    
     async def get_by_student(self, student_id: int) -> list[Transfer]:
         """O'quvchi transferlarini olish."""
         result = await self.session.execute(
@@ -1,6 +1,6 @@
 """User repository - foydalanuvchilar bilan ishlash."""
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.db.models import User
 
@@ -25,6 +25,22 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_by_phones(self, phones: set[str]) -> dict[str, User]:
+        """Telefon raqamlar bo'yicha foydalanuvchilar (bitta IN so'rov): {phone: User}."""
+        if not phones:
+            return {}
+        result = await self.session.execute(
+            select(User).where(User.phone.in_(phones))
+        )
+        return {user.phone: user for user in result.scalars().all()}
+    
+    async def bulk_create(self, rows: list[dict]) -> int:
+        """Ko'p foydalanuvchini bitta INSERT bilan yaratish (commit qilmaydi)."""
+        if not rows:
+            return 0
+        await self.session.execute(insert(User), rows)
+        return len(rows)
+    
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """ID bo'yicha foydalanuvchini topish."""
         result = await self.session.execute(
@@ -0,0 +1,348 @@
+"""Repository va servislarning asosiy yo'llari uchun mikro-benchmarklar.
+
+Har bir to'plam (``small``, ``medium``, ``district``) vaqtinchalik SQLite
+faylga ``generate_data`` orqali yoziladi (bir xil seed - bir xil
+ma'lumot), keyin har bir amal ``--warmup`` marta qizdirilib ``--repeat``
+marta o'lchanadi. Har bir o'lchov - handlerlardagidek alohida sessiya.
+
+Natija JSON faylga yoziladi va saqlangan baseline bilan solishtiriladi:
+tanlangan ko'rsatkich (standart ``p50``) ``--threshold`` dan ko'proq
+sekinlashgan bo'lsa, script 1 kodi bilan tugaydi.
+
+    python scripts/benchmark.py                              # small, medium
+    python scripts/benchmark.py --datasets small,medium,district --repeat 100
+    python scripts/benchmark.py --update-baseline            # baseline'ni yangilash
+
+Ishchi baza (``DATABASE_URL``) ishlatilmaydi.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Ishchi bazaga ulanmaslik uchun - modullar import qilinishidan oldin
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"
+
+# Parent directory'ni sys.path ga qo'shish
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import platform
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable
+
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core.db import Base
+from core.db import models  # noqa: F401 - metadata uchun kerak
+from repositories.attendance import AttendanceRepository
+from repositories.class_repo import ClassRepository
+from repositories.student import StudentRepository
+from repositories.user import UserRepository
+from scripts.generate_data import SchoolSpec, generate_school
+from services.attendance_service import AttendanceService
+from services.report_service import ReportService
+from services.student_service import StudentService
+
+DATASETS = {
+    "small": SchoolSpec(classes=10, students_per_class=25, staff=10, years=1, transfers=20),
+    "medium": SchoolSpec(classes=40, students_per_class=30, staff=40, years=2, transfers=100),
+    "district": SchoolSpec(classes=150, students_per_class=32, staff=150, years=5, transfers=500),
+}
+METRICS = ("p50", "p90", "p95", "p99", "mean")
+
+TARGET_CLASSES = 8   # o'qish/belgilash amallari aylanadigan sinflar
+MOVERS = 10          # transfer amalida oldinga-orqaga ko'chiriladigan o'quvchilar
+HISTORY_DAYS = 60    # hisobotlar uchun oxirgi kunlar oralig'i
+
+
+class BenchmarkContext:
+    """
+    Bitta to'plam uchun o'lchov ma'lumotlari: sinflar, o'quvchilar, kunlar.
+
+    Amallar ``(session, i)`` ko'rinishida - ``i`` takrorlash raqami,
+    shu bo'yicha sinf/o'quvchi/kun aylantiriladi.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker):
+        self.session_maker = session_maker
+        self.admin_id = 0
+        self.classes: list[int] = []
+        self.students: dict[int, list[int]] = {}
+        self.today_days: list[int] = []
+        self.history: list[tuple[int, date]] = []
+        self.history_days: list[int] = []
+        self.transfer_pair: tuple[int, int] = (0, 0)
+        self.movers: dict[int, int] = {}  # student_id -> hozirgi sinf
+
+    async def load(self, end: date) -> None:
+        """Ma'lumotlarni o'qish va bugungi davomat kunlarini ochish."""
+        async with self.session_maker() as session:
+            self.admin_id = (await UserRepository(session).get_all_admins())[0].id
+            class_ids = [class_obj.id for class_obj in await ClassRepository(session).get_all()]
+            # Oxirgi ikki sinf - transfer uchun, qolganlari o'qish/belgilash uchun
+            self.transfer_pair = (class_ids[-2], class_ids[-1])
+            rest = class_ids[:-2] or class_ids
+            step = max(1, len(rest) // TARGET_CLASSES)
+            self.classes = rest[::step][:TARGET_CLASSES]
+
+            student_repo = StudentRepository(session)
+            for class_id in self.classes:
+                self.students[class_id] = [student.id for student in await student_repo.get_by_class(class_id)]
+            source = self.transfer_pair[0]
+            for student in (await student_repo.get_by_class(source))[:MOVERS]:
+                self.movers[student.id] = source
+
+            day_ids = await AttendanceRepository(session).get_day_ids(end - timedelta(days=HISTORY_DAYS), end)
+            targets = set(self.classes)
+            self.history = sorted(key for key in day_ids if key[0] in targets)
+            self.history_days = [day_ids[key] for key in self.history]
+
+        for class_id in self.classes:
+            async with self.session_maker() as session:
+                day, _ = await AttendanceService(session).get_today_attendance(class_id, self.admin_id)
+                self.today_days.append(day.id)
+
+    def cases(self) -> dict[str, Callable[[AsyncSession, int], Awaitable]]:
+        """O'lchanadigan amallar (o'qishlar avval, yozishlar oxirida)."""
+        return {
+            "get_today_attendance": self._today_attendance,
+            "get_roster": self._roster,
+            "get_students_by_class": self._students_by_class,
+            "get_attendance_summary": self._attendance_summary,
+            "get_daily_report": self._daily_report,
+            "mark_attendance": self._mark_attendance,
+            "transfer_student": self._transfer_student,
+        }
+
+    async def _today_attendance(self, session: AsyncSession, i: int) -> None:
+        await AttendanceService(session).get_today_attendance(self._class(i), self.admin_id)
+
+    async def _roster(self, session: AsyncSession, i: int) -> None:
+        await StudentService(session).get_roster(self._class(i))
+
+    async def _students_by_class(self, session: AsyncSession, i: int) -> None:
+        await StudentService(session).get_students_by_class(self._class(i))
+
+    async def _attendance_summary(self, session: AsyncSession, i: int) -> None:
+        # Navbat bilan bugungi (ochiq) va o'tgan (yakunlangan) kunlar
+        if i % 2:
+            day_id = self.today_days[i // 2 % len(self.today_days)]
+        else:
+            day_id = self.history_days[i // 2 % len(self.history_days)]
+        await AttendanceService(session).get_attendance_summary(day_id)
+
+    async def _daily_report(self, session: AsyncSession, i: int) -> None:
+        class_id, date_val = self.history[i * 7 % len(self.history)]
+        await ReportService(session).get_daily_report(class_id, date_val)
+
+    async def _mark_attendance(self, session: AsyncSession, i: int) -> None:
+        index = i % len(self.today_days)
+        students = self.students[self.classes[index]]
+        await AttendanceService(session).mark_attendance(
+            self.today_days[index],
+            students[i // len(self.today_days) % len(students)],
+            1 + i % 3,
+            self.admin_id,
+        )
+
+    async def _transfer_student(self, session: AsyncSession, i: int) -> None:
+        student_ids = list(self.movers)
+        student_id = student_ids[i % len(student_ids)]
+        first, second = self.transfer_pair
+        target = second if self.movers[student_id] == first else first
+        success, error = await StudentService(session).transfer_student(student_id, target, self.admin_id)
+        if not success:
+            raise RuntimeError(error)
+        self.movers[student_id] = target
+
+    def _class(self, i: int) -> int:
+        return self.classes[i % len(self.classes)]
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    """Millisekundlardagi o'lchovlar bo'yicha foizliklar."""
+    ordered = sorted(timings)
+
+    def percentile(q: float) -> float:
+        # Chiziqli interpolyatsiya (numpy "linear" bilan bir xil)
+        position = (len(ordered) - 1) * q
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    return {
+        "min": round(ordered[0], 4),
+        "p50": round(percentile(0.50), 4),
+        "p90": round(percentile(0.90), 4),
+        "p95": round(percentile(0.95), 4),
+        "p99": round(percentile(0.99), 4),
+        "max": round(ordered[-1], 4),
+        "mean": round(sum(ordered) / len(ordered), 4),
+    }
+
+
+async def measure(
+    session_maker: async_sessionmaker,
+    operation: Callable[[AsyncSession, int], Awaitable],
+    warmup: int,
+    repeat: int,
+) -> dict[str, float]:
+    """Amalni qizdirish va o'lchash (har bir chaqiruv - yangi sessiya)."""
+    for i in range(warmup):
+        async with session_maker() as session:
+            await operation(session, i)
+
+    timings = []
+    for i in range(warmup, warmup + repeat):
+        started = time.perf_counter()
+        async with session_maker() as session:
+            await operation(session, i)
+        timings.append((time.perf_counter() - started) * 1000)
+    return summarize(timings)
+
+
+async def run_dataset(name: str, spec: SchoolSpec, warmup: int, repeat: int, workdir: Path) -> dict:
+    """To'plamni vaqtinchalik bazaga yozish va barcha amallarni o'lchash."""
+    url = f"sqlite+aiosqlite:///{workdir / f'{name}.db'}"
+
+    print(f"\n📦 {name}: {spec.classes} sinf × {spec.students_per_class}, {spec.years} yil")
+    started = time.monotonic()
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        counts = await generate_school(session, spec, log=lambda message: None)
+    # Yuklashdagi PRAGMA'lar o'lchovga ta'sir qilmasligi uchun - yangi ulanishlar
+    await engine.dispose()
+    seed_seconds = time.monotonic() - started
+    print(f"  ✅ {counts['attendance_items']:,} yozuv ({seed_seconds:.1f} s)")
+
+    engine = create_async_engine(url)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        context = BenchmarkContext(session_maker)
+        await context.load(spec.end_date)
+        cases = {}
+        for case, operation in context.cases().items():
+            cases[case] = await measure(session_maker, operation, warmup, repeat)
+            stats = cases[case]
+            print(
+                f"  {case:<24} p50 {stats['p50']:>8.2f} ms   p95 {stats['p95']:>8.2f} ms"
+                f"   p99 {stats['p99']:>8.2f} ms   max {stats['max']:>8.2f} ms"
+            )
+    finally:
+        await engine.dispose()
+
+    return {
+        "spec": {key: value for key, value in asdict(spec).items() if key != "end"},
+        "counts": counts,
+        "seed_seconds": round(seed_seconds, 2),
+        "cases": cases,
+    }
+
+
+def compare(results: dict, baseline: dict, metric: str, threshold: float) -> list[str]:
+    """
+    Natijalarni baseline bilan solishtirish.
+
+    Returns:
+        Sekinlashgan amallar ro'yxati ("dataset/case")
+    """
+    regressions = []
+    print(f"\n📊 Baseline bilan solishtirish ({metric}, chegara +{threshold:.0%}):")
+    for dataset, data in results["datasets"].items():
+        base_cases = baseline.get("datasets", {}).get(dataset, {}).get("cases", {})
+        for case, stats in data["cases"].items():
+            base = base_cases.get(case, {}).get(metric)
+            if not base:
+                print(f"  {dataset}/{case}: baseline'da yo'q")
+                continue
+            current = stats[metric]
+            change = current / base - 1
+            mark = "✅"
+            if change > threshold:
+                mark = "⚠️"
+                regressions.append(f"{dataset}/{case}")
+            print(f"  {mark} {dataset}/{case}: {base:.2f} → {current:.2f} ms ({change:+.0%})")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    print("=" * 50)
+    print("BENCHMARKLAR")
+    print("=" * 50)
+
+    results = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+        },
+        "datasets": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="davomat-bench-") as workdir:
+        for name in args.datasets:
+            results["datasets"][name] = await run_dataset(
+                name, DATASETS[name], args.warmup, args.repeat, Path(workdir),
+            )
+
+    args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n💾 Natijalar: {args.output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Baseline yangilandi: {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"ℹ️ Baseline topilmadi ({args.baseline}) - --update-baseline bilan yarating")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.metric, args.threshold)
+    if regressions:
+        print(f"❌ Sekinlashgan: {', '.join(regressions)}")
+        return 1
+    print("✅ Sekinlashish yo'q")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Repository va servislar benchmarklari")
+    parser.add_argument("--datasets", default="small,medium",
+                        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+                        help=f"to'plamlar, vergul bilan ({', '.join(DATASETS)})")
+    parser.add_argument("--warmup", type=int, default=5, help="qizdirish chaqiruvlari")
+    parser.add_argument("--repeat", type=int, default=50, help="o'lchanadigan chaqiruvlar")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"),
+                        help="natijalar JSON fayli")
+    parser.add_argument("--baseline", type=Path, default=Path("benchmark_baseline.json"),
+                        help="solishtiriladigan baseline JSON")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="natijalarni baseline sifatida saqlash")
+    parser.add_argument("--metric", choices=METRICS, default="p50", help="solishtiriladigan ko'rsatkich")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="ruxsat etilgan sekinlashish ulushi (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.datasets if name not in DATASETS]
+    if unknown or not args.datasets:
+        print(f"❌ Noma'lum to'plam: {', '.join(unknown)} (mavjud: {', '.join(DATASETS)})")
+        sys.exit(2)
+    if args.repeat < 1:
+        print("❌ --repeat kamida 1 bo'lishi kerak")
+        sys.exit(2)
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
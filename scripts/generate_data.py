@@ -0,0 +1,487 @@
+"""Sinov uchun sun'iy maktab ma'lumotlarini yaratish.
+
+Yuklama sinovlari va benchmarklar uchun: sinflar, o'quvchilar, xodimlar,
+transferlar va bir necha o'quv yili davomat tarixi. Bir xil ``--seed`` bilan
+har safar aynan bir xil ma'lumot hosil bo'ladi.
+
+Davomat realistik taqsimlanadi: har bir o'quvchining o'z kelmaslik
+moyilligi bor (ko'pchilik kam, bir nechtasi tez-tez kelmaydi), kasallik
+ketma-ket kunlarga cho'ziladi, qishda va dushanba/shanba kunlari
+kelmaslik ko'proq. Ta'til va bayram kunlari dars bo'lmaydi.
+
+Faqat bo'sh bazaga yoziladi (``DATABASE_URL``). Yozuvlar ko'p qatorli
+INSERT paketlari bilan, yuklash vaqtida ``attendance_items`` indeksi
+o'chiriladi; oxirida kun xulosalari va o'quvchi hisoblagichlari qayta
+hisoblanadi.
+
+    python scripts/generate_data.py                    # 100 sinf x 30, 5 yil
+    python scripts/generate_data.py --classes 20 --years 1 --seed 7
+"""
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+# Parent directory'ni sys.path ga qo'shish
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, select, text
+
+from core.config import settings
+from core.db import get_session, init_db
+from core.db.models import Class
+from repositories.attendance import AttendanceRepository
+from repositories.class_repo import ClassRepository
+from repositories.stats import StatsRepository, StudentStatsRepository
+from repositories.student import StudentRepository
+from repositories.transfer import TransferRepository
+from repositories.user import UserRepository
+from services.user import pending_telegram_id
+from utils.dates import get_academic_year_start, parse_term_starts
+
+MALE_NAMES = (
+    "Aziz", "Bobur", "Doniyor", "Eldor", "Farrux", "G'ayrat", "Husan", "Ilhom",
+    "Jasur", "Kamol", "Laziz", "Mirzo", "Nodir", "Otabek", "Rustam", "Sardor",
+    "Temur", "Ulug'bek", "Xurshid", "Shoxrux", "Javohir", "Sherzod", "Abdulla",
+    "Behruz", "Islom", "Muhammad", "Akmal", "Sanjar", "Oybek", "Asadbek",
+)
+FEMALE_NAMES = (
+    "Aziza", "Barno", "Dilnoza", "Feruza", "Gulnora", "Hilola", "Iroda", "Kamola",
+    "Laylo", "Madina", "Nigora", "Ozoda", "Robiya", "Sevara", "Shahnoza", "Tanzila",
+    "Umida", "Xadicha", "Zarina", "Mohinur", "Sabina", "Munisa", "Malika", "Nilufar",
+    "Dildora", "Gulsanam", "Maftuna", "Sitora", "Zilola", "Oydin",
+)
+# Erkak shakli; ayollar uchun oxiriga "a" qo'shiladi (Aliyev -> Aliyeva)
+SURNAMES = (
+    "Aliyev", "Karimov", "Rahimov", "Yusupov", "Tursunov", "Ismoilov", "Qodirov",
+    "Nazarov", "Ergashev", "Xolmatov", "Sobirov", "Mirzayev", "Abdullayev",
+    "Hasanov", "Usmonov", "Jo'rayev", "Saidov", "Rasulov", "Sultonov", "Umarov",
+    "Normatov", "Toshpo'latov", "Valiyev", "Ortiqov", "Boboyev", "Sharipov",
+    "Haydarov", "Qurbonov", "Mahmudov", "Raximov",
+)
+CLASS_LETTERS = "ABVGDEJZIKLMNOPRSTUF"
+
+# Dam olish kunlari (oy, kun)
+HOLIDAYS = {(1, 1), (1, 2), (3, 8), (3, 21), (3, 22), (5, 9), (10, 1), (12, 8)}
+SCHOOL_YEAR_END = (5, 25)
+BREAK_DAYS = 7  # har bir chorak oldidan ta'til (birinchisidan tashqari)
+
+# Kelmaslikning oylar va hafta kunlari bo'yicha koeffitsientlari
+MONTH_FACTORS = {9: 0.7, 10: 0.9, 11: 1.0, 12: 1.2, 1: 1.3, 2: 1.3, 3: 1.0, 4: 0.9, 5: 1.1}
+WEEKDAY_FACTORS = (1.15, 1.0, 0.95, 0.95, 1.0, 1.2)
+# Kecha kelmagan o'quvchining bugun ham kelmaslik ehtimoli (kasallik)
+STREAK_CONTINUE = 0.5
+# O'quvchilar orasidagi farq (lognormal, o'rtachasi 1)
+PROPENSITY_SIGMA = 0.9
+
+ITEM_BATCH_SIZE = 50000
+
+
+@dataclass(frozen=True)
+class SchoolSpec:
+    """Yaratiladigan maktab parametrlari."""
+
+    classes: int = 100
+    students_per_class: int = 30
+    staff: int = 100
+    years: int = 5
+    transfers: int = 300
+    absence_rate: float = 0.05
+    late_rate: float = 0.03
+    seed: int = 42
+    end: Optional[date] = None  # oxirgi kun (standart - kecha)
+
+    @property
+    def end_date(self) -> date:
+        return self.end or date.today() - timedelta(days=1)
+
+
+@dataclass
+class _Student:
+    full_name: str
+    class_index: int          # hozirgi sinf
+    absence: float            # kunlik kelmaslik ehtimoli (koeffitsientlarsiz)
+    late: float
+    from_class_index: int = -1  # transfer bo'lgan bo'lsa - oldingi sinf
+    transfer_date: Optional[date] = None
+    id: int = 0
+
+
+def school_days(start: date, end: date, term_starts: list[tuple[int, int]]) -> list[date]:
+    """
+    Oraliqdagi dars kunlari: dushanba-shanba, yozgi va choraklararo
+    ta'tillar hamda bayramlardan tashqari.
+    """
+    days = []
+    breaks: set[date] = set()
+    for year in range(start.year - 1, end.year + 1):
+        first = term_starts[0]
+        for month, day in term_starts[1:]:
+            term_start = date(year if (month, day) >= first else year + 1, month, day)
+            breaks.update(term_start - timedelta(days=i) for i in range(1, BREAK_DAYS + 1))
+
+    current = start
+    while current <= end:
+        year_start = get_academic_year_start(current, term_starts)
+        year_end = date(year_start.year + 1, *SCHOOL_YEAR_END)
+        if (
+            current.weekday() < 6
+            and current <= year_end
+            and current not in breaks
+            and (current.month, current.day) not in HOLIDAYS
+        ):
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def class_names(count: int) -> list[str]:
+    """``1-A`` ... ``11-A``, ``1-B`` ... ko'rinishidagi sinf nomlari."""
+    names = []
+    for index in range(count):
+        letter = CLASS_LETTERS[index // 11 % len(CLASS_LETTERS)]
+        suffix = str(index // (11 * len(CLASS_LETTERS)) + 1) if index >= 11 * len(CLASS_LETTERS) else ""
+        names.append(f"{index % 11 + 1}-{letter}{suffix}")
+    return names
+
+
+class SchoolGenerator:
+    """
+    Maktab ma'lumotlarini xotirada rejalashtirish va bazaga paketlab yozish.
+
+    Barcha tasodifiy qiymatlar bitta ``random.Random(seed)`` dan olinadi
+    va bir xil tartibda - natija seed'ga to'liq bog'liq.
+    """
+
+    def __init__(self, session, spec: SchoolSpec, log: Callable[[str], None] = print):
+        self.session = session
+        self.spec = spec
+        self.log = log
+        self.rng = random.Random(spec.seed)
+        self.attendance_repo = AttendanceRepository(session)
+        self.class_repo = ClassRepository(session)
+
+        self.class_ids: list[int] = []
+        self.class_staff: list[int] = []  # sinf indeksi -> kunlarni belgilagan xodim ID
+        self.admin_id = 0
+        self.students: list[_Student] = []
+        self.counts: dict[str, int] = {}
+
+        # Tarix: oxirgi ``years`` o'quv yili, ``end`` gacha
+        self.term_starts = parse_term_starts(settings.ACADEMIC_TERMS)
+        year_start = get_academic_year_start(spec.end_date, self.term_starts)
+        self.start = year_start.replace(year=year_start.year - spec.years + 1)
+
+    async def run(self) -> dict[str, int]:
+        """Hammasini yaratish. Returns: jadvallar bo'yicha yozuvlar soni."""
+        if await self.session.scalar(select(func.count()).select_from(Class)):
+            raise ValueError("Baza bo'sh emas - sun'iy ma'lumot faqat yangi bazaga yoziladi")
+
+        if self.session.bind.dialect.name == "sqlite":
+            await self.session.execute(text("PRAGMA synchronous=OFF"))
+
+        self._plan_students()
+        self._plan_transfers()
+        await self._write_users_and_classes()
+        await self._write_students()
+        await self._write_transfers()
+        await self.session.commit()
+
+        await self.attendance_repo.set_item_indexes(enabled=False)
+        await self.session.commit()
+        await self._write_attendance()
+        stage = time.monotonic()
+        await self.attendance_repo.set_item_indexes(enabled=True)
+        await StatsRepository(self.session).rebuild()
+        await StudentStatsRepository(self.session).rebuild()
+        await self.session.commit()
+        self.log(f"✅ Indekslar va hisoblagichlar ({time.monotonic() - stage:.1f} s)")
+        return self.counts
+
+    def _plan_students(self) -> None:
+        """Sinf hajmlari, ismlar va har bir o'quvchining moyilliklari."""
+        spec = self.spec
+        absence_base = spec.absence_rate * (1 - STREAK_CONTINUE)
+        normalizer = math.exp(PROPENSITY_SIGMA ** 2 / 2)
+        for class_index in range(spec.classes):
+            size = max(1, round(self.rng.gauss(spec.students_per_class, spec.students_per_class * 0.1)))
+            used: set[str] = set()
+            while len(used) < size:
+                surname = self.rng.choice(SURNAMES)
+                if self.rng.random() < 0.5:
+                    full_name = f"{surname} {self.rng.choice(MALE_NAMES)}"
+                else:
+                    full_name = f"{surname}a {self.rng.choice(FEMALE_NAMES)}"
+                if full_name in used:
+                    continue
+                used.add(full_name)
+                propensity = self.rng.lognormvariate(0, PROPENSITY_SIGMA) / normalizer
+                self.students.append(_Student(
+                    full_name=full_name,
+                    class_index=class_index,
+                    absence=min(absence_base * propensity, 0.5),
+                    late=min(spec.late_rate * self.rng.lognormvariate(0, 0.6) / math.exp(0.18), 0.4),
+                ))
+
+    def _plan_transfers(self) -> None:
+        """Tasodifiy o'quvchilar tarix davomida boshqa sinfdan ko'chib kelgan."""
+        spec = self.spec
+        if spec.classes < 2 or not self.students:
+            return
+        span = (spec.end_date - self.start).days
+        for student in self.rng.sample(self.students, min(spec.transfers, len(self.students))):
+            # Iloji bo'lsa parallel sinfdan (5-A -> 5-B)
+            same_grade = range(student.class_index % 11, spec.classes, 11)
+            choices = [index for index in same_grade if index != student.class_index]
+            if not choices:
+                choices = [index for index in range(spec.classes) if index != student.class_index]
+            student.from_class_index = self.rng.choice(choices)
+            student.transfer_date = self.start + timedelta(days=self.rng.randrange(1, span + 1))
+
+    async def _write_users_and_classes(self) -> None:
+        spec = self.spec
+        user_repo = UserRepository(self.session)
+        phones = [f"99890{index:07d}" for index in range(spec.staff + 1)]
+        # Telegram ID - "kutilayotgan" (manfiy): eslatmalar yuborilmaydi
+        await user_repo.bulk_create([
+            {
+                "telegram_id": pending_telegram_id(phone),
+                "phone": phone,
+                "full_name": "Admin" if index == 0 else (
+                    f"{self.rng.choice(SURNAMES)}a {self.rng.choice(FEMALE_NAMES)}"
+                    if self.rng.random() < 0.7
+                    else f"{self.rng.choice(SURNAMES)} {self.rng.choice(MALE_NAMES)}"
+                ),
+                "role": settings.ROLE_ADMIN if index == 0 else settings.ROLE_STAFF,
+                "is_active": True,
+            }
+            for index, phone in enumerate(phones)
+        ])
+        users = await user_repo.get_by_phones(set(phones))
+        self.admin_id = users[phones[0]].id
+        staff_ids = [users[phone].id for phone in phones[1:]] or [self.admin_id]
+
+        sizes = [0] * spec.classes
+        for student in self.students:
+            sizes[student.class_index] += 1
+        names = class_names(spec.classes)
+        await self.class_repo.bulk_create([
+            {"name": name, "total_students": size, "roster_version": 0}
+            for name, size in zip(names, sizes)
+        ])
+        by_name = {class_obj.name: class_obj.id for class_obj in await self.class_repo.get_all()}
+        self.class_ids = [by_name[name] for name in names]
+
+        self.class_staff = [staff_ids[index % len(staff_ids)] for index in range(spec.classes)]
+        if spec.staff:
+            await self.class_repo.bulk_assign_staff(list(zip(self.class_ids, self.class_staff)))
+        self.counts["users"] = len(phones)
+        self.counts["classes"] = spec.classes
+
+    async def _write_students(self) -> None:
+        student_repo = StudentRepository(self.session)
+        await student_repo.bulk_create([
+            {
+                "class_id": self.class_ids[student.class_index],
+                "full_name": student.full_name,
+                "is_active": True,
+            }
+            for student in self.students
+        ])
+        ids = {
+            (class_id, full_name): student_id
+            for student_id, class_id, full_name in await student_repo.get_names()
+        }
+        for student in self.students:
+            student.id = ids[(self.class_ids[student.class_index], student.full_name)]
+        self.counts["students"] = len(self.students)
+
+    async def _write_transfers(self) -> None:
+        rows = [
+            {
+                "student_id": student.id,
+                "from_class_id": self.class_ids[student.from_class_index],
+                "to_class_id": self.class_ids[student.class_index],
+                "transferred_at": datetime.combine(student.transfer_date, datetime.min.time()),
+                "by_user_id": self.admin_id,
+            }
+            for student in self.students
+            if student.transfer_date is not None
+        ]
+        self.counts["transfers"] = await TransferRepository(self.session).bulk_create(rows)
+
+    async def _write_attendance(self) -> None:
+        """Kunlar va yozuvlar - oyma-oy, har oy bitta tranzaksiya."""
+        spec = self.spec
+        start = self.start
+        days = school_days(start, spec.end_date, self.term_starts)
+
+        # Sinf ro'yxatlari tarix boshidagi holatda; transferlar sanasi kelganda qo'llanadi
+        rosters: list[list[int]] = [[] for _ in range(spec.classes)]
+        for index, student in enumerate(self.students):
+            if student.transfer_date is not None and student.transfer_date > start:
+                rosters[student.from_class_index].append(index)
+            else:
+                rosters[student.class_index].append(index)
+        moves = sorted(
+            (student.transfer_date, index)
+            for index, student in enumerate(self.students)
+            if student.transfer_date is not None and student.transfer_date > start
+        )
+
+        absence = [student.absence for student in self.students]
+        late = [student.late for student in self.students]
+        ids = [student.id for student in self.students]
+        was_absent = [False] * len(self.students)
+        rnd = self.rng.random
+        present, late_status, absent = (
+            settings.STATUS_PRESENT, settings.STATUS_LATE, settings.STATUS_ABSENT,
+        )
+
+        started = time.monotonic()
+        total_items = 0
+        total_days = 0
+        statuses = {present: 0, late_status: 0, absent: 0}
+        by_month: dict[tuple[int, int], list[date]] = {}
+        for day in days:
+            by_month.setdefault((day.year, day.month), []).append(day)
+
+        for month_days in by_month.values():
+            await self.attendance_repo.bulk_create_days([
+                {
+                    "class_id": class_id,
+                    "date": day,
+                    "marked_by": self.class_staff[class_index],
+                    "is_finalized": True,
+                    "is_incomplete": False,
+                    "updated_at": datetime.combine(day, datetime.min.time()),
+                }
+                for day in month_days
+                for class_index, class_id in enumerate(self.class_ids)
+            ])
+            day_ids = await self.attendance_repo.get_day_ids(month_days[0], month_days[-1])
+
+            items = []
+            for day in month_days:
+                while moves and moves[0][0] <= day:
+                    _, index = moves.pop(0)
+                    student = self.students[index]
+                    rosters[student.from_class_index].remove(index)
+                    rosters[student.class_index].append(index)
+
+                factor = MONTH_FACTORS.get(day.month, 1.0) * WEEKDAY_FACTORS[day.weekday()]
+                for class_index, roster in enumerate(rosters):
+                    day_id = day_ids[(self.class_ids[class_index], day)]
+                    for index in roster:
+                        chance = absence[index] * factor
+                        if was_absent[index] and chance < STREAK_CONTINUE:
+                            chance = STREAK_CONTINUE
+                        roll = rnd()
+                        if roll < chance:
+                            status = absent
+                            was_absent[index] = True
+                        else:
+                            status = late_status if roll < chance + late[index] else present
+                            was_absent[index] = False
+                        items.append((day_id, ids[index], status))
+
+            for offset in range(0, len(items), ITEM_BATCH_SIZE):
+                await self.attendance_repo.bulk_create_items(items[offset:offset + ITEM_BATCH_SIZE])
+            await self.session.commit()
+
+            for _, _, status in items:
+                statuses[status] += 1
+            total_items += len(items)
+            total_days += len(day_ids)
+            elapsed = time.monotonic() - started
+            self.log(
+                f"\r  {month_days[-1]:%Y-%m}: {total_items:,} yozuv "
+                f"({total_items / elapsed if elapsed else 0:,.0f}/s)"
+            )
+
+        self.counts["attendance_days"] = total_days
+        self.counts["attendance_items"] = total_items
+        if total_items:
+            self.log(
+                f"\n📊 Kelmagan: {statuses[absent] / total_items:.1%}, "
+                f"kechikkan: {statuses[late_status] / total_items:.1%} "
+                f"({len(days)} dars kuni, {time.monotonic() - started:.1f} s)"
+            )
+
+
+async def generate_school(session, spec: SchoolSpec, log: Callable[[str], None] = print) -> dict[str, int]:
+    """
+    Bo'sh bazaga sun'iy maktab yozish.
+
+    Raises:
+        ValueError: Bazada sinflar bo'lsa
+    """
+    return await SchoolGenerator(session, spec, log).run()
+
+
+async def generate(spec: SchoolSpec) -> bool:
+    """Script rejimi. Returns: muvaffaqiyatli bo'lsa True."""
+    print("=" * 50)
+    print("SUN'IY MAKTAB MA'LUMOTLARI")
+    print("=" * 50)
+
+    await init_db()
+
+    async for session in get_session():
+        started = time.monotonic()
+        try:
+            counts = await generate_school(
+                session,
+                spec,
+                log=lambda message: print(message, end="" if message.startswith("\r") else "\n", flush=True),
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+        for table, count in counts.items():
+            print(f"  {table}: {count:,}")
+        print(f"✅ Tayyor ({time.monotonic() - started:.1f} s, seed={spec.seed})")
+    return True
+
+
+def main() -> None:
+    defaults = SchoolSpec()
+    parser = argparse.ArgumentParser(description="Sinov uchun sun'iy maktab ma'lumotlari")
+    parser.add_argument("--classes", type=int, default=defaults.classes, help="sinflar soni")
+    parser.add_argument("--students-per-class", type=int, default=defaults.students_per_class,
+                        help="sinfdagi o'rtacha o'quvchilar")
+    parser.add_argument("--staff", type=int, default=defaults.staff, help="xodimlar soni")
+    parser.add_argument("--years", type=int, default=defaults.years, help="o'quv yillari tarixi")
+    parser.add_argument("--transfers", type=int, default=defaults.transfers,
+                        help="tarix davomidagi transferlar")
+    parser.add_argument("--absence-rate", type=float, default=defaults.absence_rate,
+                        help="o'rtacha kelmaslik ulushi")
+    parser.add_argument("--late-rate", type=float, default=defaults.late_rate,
+                        help="o'rtacha kechikish ulushi")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="tasodifiy seed")
+    parser.add_argument("--end", type=date.fromisoformat, default=None,
+                        help="oxirgi kun YYYY-MM-DD (standart - kecha)")
+    args = parser.parse_args()
+
+    spec = SchoolSpec(
+        classes=args.classes,
+        students_per_class=args.students_per_class,
+        staff=args.staff,
+        years=args.years,
+        transfers=args.transfers,
+        absence_rate=args.absence_rate,
+        late_rate=args.late_rate,
+        seed=args.seed,
+        end=args.end,
+    )
+    sys.exit(0 if asyncio.run(generate(spec)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""Qog'oz va jadval jurnallaridagi eski davomatni import qilish.
+
+Fayl (CSV yoki XLSX) - har qatorda bitta o'quvchining bitta kundagi belgisi:
+
+    Sana       | Sinf | O'quvchi       | Status
+    2023-09-04 | 5A   | Aliyev Vali    | +
+    04.09.2023 | 5A   | Karimova Zarina | kelmadi
+
+Status: ``1``/``+``/``keldi``, ``2``/``K``/``kechikdi``, ``3``/``Y``/``kelmadi``.
+Sarlavha bo'lmasa ustunlar shu tartibda deb olinadi. Bitta o'quvchining
+bitta kuni bir necha marta kelsa, fayldagi oxirgi qator olinadi.
+
+Sinf va o'quvchi nomlari bir marta yuklangan xotiradagi lug'atlar orqali
+topiladi, kunlar va yozuvlar ko'p qatorli INSERT paketlari bilan
+yoziladi. Yuklash vaqtida ``attendance_items`` indeksi o'chiriladi va
+oxirida qayta quriladi (botni to'xtatib ishga tushiring yoki
+``--keep-indexes``). Oxirida kun xulosalari va o'quvchi hisoblagichlari
+qayta hisoblanadi, sinflar ``roster_version`` i oshiriladi (eksport
+keshlari eskiradi).
+
+Har bir paket bilan birga fayldagi o'rin ``journal_cursors`` ga yoziladi:
+to'xtab qolsa, xuddi shu buyruqni qayta ishga tushiring - import
+to'xtagan joyidan davom etadi. Import boshlanishidan oldin bazada
+bo'lgan kunlar (bot orqali belgilangan) o'zgartirilmaydi, ularning
+qatorlari o'tkazib yuboriladi.
+
+    python scripts/import_history.py davomat.csv
+    python scripts/import_history.py davomat.xlsx --create-students --marked-by 998901234567
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+# Parent directory'ni sys.path ga qo'shish
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from core.config import settings
+from core.db import get_session, init_db
+from repositories.attendance import AttendanceRepository
+from repositories.class_repo import ClassRepository
+from repositories.journal import JournalRepository
+from repositories.stats import StatsRepository, StudentStatsRepository
+from repositories.student import StudentRepository
+from repositories.user import UserRepository
+from services.import_service import STUDENT_COLUMNS
+from utils.import_files import find_columns, iter_table_rows, name_key, normalize_name
+from utils.phone import normalize_phone
+
+COLUMNS = {
+    "date": {"sana", "kun", "date", "дата"},
+    "class": STUDENT_COLUMNS["class"],
+    "student": STUDENT_COLUMNS["name"],
+    "status": {"status", "holat", "davomat", "belgi", "статус"},
+}
+
+STATUS_VALUES = {
+    "1": settings.STATUS_PRESENT, "+": settings.STATUS_PRESENT,
+    "keldi": settings.STATUS_PRESENT, "bor": settings.STATUS_PRESENT,
+    "2": settings.STATUS_LATE, "k": settings.STATUS_LATE,
+    "kechikdi": settings.STATUS_LATE, "kech": settings.STATUS_LATE,
+    "3": settings.STATUS_ABSENT, "y": settings.STATUS_ABSENT, "-": settings.STATUS_ABSENT,
+    "kelmadi": settings.STATUS_ABSENT, "yo'q": settings.STATUS_ABSENT,
+}
+
+DEFAULT_BATCH_SIZE = 50000
+
+
+class HistoryImport:
+    """
+    Import holati: nomlar lug'atlari, kunlar va kursor.
+
+    Har bir xom qiymat (sana matni, sinf va o'quvchi nomi) bir marta
+    tahlil qilinadi va keshlanadi - qator bo'yicha ish lug'atdan olishdan
+    iborat.
+    """
+
+    def __init__(self, session, marked_by: int, create_students: bool, checkpoint: str):
+        self.session = session
+        self.marked_by = marked_by
+        self.create_students = create_students
+        self.checkpoint = checkpoint
+        self.attendance_repo = AttendanceRepository(session)
+        self.student_repo = StudentRepository(session)
+        self.journal_repo = JournalRepository(session)
+
+        self.classes: dict[str, int] = {}               # name_key -> class_id
+        self.students: dict[tuple[int, str], int] = {}  # (class_id, name_key) -> student_id
+        self.days: dict[tuple[int, date], int] = {}     # (class_id, date) -> day_id
+        self.watermark = 0  # shu ID gacha bo'lgan kunlar import'dan oldin bor edi
+        # Shu import yozgan (day_id, student_id) - paketlar orasidagi takrorlar uchun
+        self.imported: set[tuple[int, int]] = set()
+
+        self._dates: dict = {}
+        self._class_cache: dict = {}
+        self._student_cache: dict = {}
+
+        self.touched_classes: set[int] = set()
+        self.created_students = 0
+        self.created_days = 0
+        self.inserted = 0
+        self.replaced = 0
+        self.skipped_existing = 0
+        self.errors: dict[str, int] = {}
+
+    async def load(self) -> int:
+        """
+        Lug'atlarni yuklash va kursorni o'qish.
+
+        Returns:
+            Oldingi ishga tushirishda qayta ishlangan qatorlar soni
+        """
+        for class_obj in await ClassRepository(self.session).get_all():
+            self.classes[name_key(class_obj.name)] = class_obj.id
+        for student_id, class_id, full_name in await self.student_repo.get_names():
+            self.students.setdefault((class_id, name_key(full_name)), student_id)
+        self.days = await self.attendance_repo.get_day_ids()
+
+        rows_done = await self.journal_repo.get_cursor(f"{self.checkpoint}:rows")
+        self.watermark = await self.journal_repo.get_cursor(f"{self.checkpoint}:days")
+        if not rows_done:
+            self.watermark = await self.attendance_repo.get_max_day_id()
+            await self.journal_repo.advance_cursor(f"{self.checkpoint}:days", self.watermark)
+            await self.session.commit()
+        else:
+            self.imported = await self.attendance_repo.get_item_keys(self.watermark)
+        return rows_done
+
+    async def import_chunk(self, chunk: list[list], columns: dict[str, int], rows_done: int) -> None:
+        """Bitta paketni yozish va kursorni surish (bitta tranzaksiya)."""
+        parsed = []
+        missing: dict[tuple[int, str], str] = {}
+        date_col, class_col = columns["date"], columns["class"]
+        student_col, status_col = columns["student"], columns["status"]
+        width = max(columns.values()) + 1
+        for row in chunk:
+            if len(row) < width:
+                self._error("ustunlar yetarli emas")
+                continue
+            date_val = self._parse_date(row[date_col])
+            if date_val is None:
+                self._error("sana noto'g'ri")
+                continue
+            status = STATUS_VALUES.get(str(row[status_col]).lower())
+            if status is None:
+                self._error("status noto'g'ri")
+                continue
+            class_id = self._class_id(row[class_col])
+            if class_id is None:
+                self._error("sinf topilmadi")
+                continue
+            raw_name = row[student_col]
+            student_id = self._student_id(class_id, raw_name)
+            if student_id is None:
+                full_name = normalize_name(raw_name)
+                if not full_name:
+                    self._error("o'quvchi ko'rsatilmagan")
+                    continue
+                if not self.create_students:
+                    self._error("o'quvchi topilmadi")
+                    continue
+                missing.setdefault((class_id, name_key(full_name)), full_name)
+            parsed.append((date_val, class_id, raw_name, student_id, status))
+
+        if missing:
+            await self._create_students(missing)
+
+        items: dict[tuple[int, int], int] = {}
+        new_days: set[tuple[int, date]] = set()
+        resolved = []
+        for date_val, class_id, raw_name, student_id, status in parsed:
+            key = (class_id, date_val)
+            day_id = self.days.get(key)
+            if day_id is not None and day_id <= self.watermark:
+                self.skipped_existing += 1
+                continue
+            if day_id is None:
+                new_days.add(key)
+            if student_id is None:
+                student_id = self._student_id(class_id, raw_name)
+            resolved.append((key, student_id, status))
+
+        if new_days:
+            await self._create_days(new_days)
+
+        for key, student_id, status in resolved:
+            # Paket ichidagi takroriy qatorlardan oxirgisi olinadi
+            items[(self.days[key], student_id)] = status
+            self.touched_classes.add(key[0])
+
+        # Oldingi paketlarda yozilgan yozuv qayta kelsa - yangisi ustiga yoziladi
+        # (attendance_items'da (kun, o'quvchi) bo'yicha unique cheklov yo'q)
+        new_rows, repeated_rows = [], []
+        for (day_id, student_id), status in items.items():
+            if (day_id, student_id) in self.imported:
+                repeated_rows.append((day_id, student_id, status))
+            else:
+                self.imported.add((day_id, student_id))
+                new_rows.append((day_id, student_id, status))
+        self.inserted += await self.attendance_repo.bulk_create_items(new_rows)
+        self.replaced += await self.attendance_repo.bulk_update_item_statuses(repeated_rows)
+        await self.journal_repo.advance_cursor(f"{self.checkpoint}:rows", rows_done)
+        await self.session.commit()
+
+    async def _create_students(self, missing: dict[tuple[int, str], str]) -> None:
+        """Topilmagan o'quvchilarni (faol emas) yaratish va lug'atga qo'shish."""
+        await self.student_repo.bulk_create([
+            {"class_id": class_id, "full_name": full_name, "is_active": False}
+            for (class_id, _), full_name in missing.items()
+        ])
+        class_ids = {class_id for class_id, _ in missing}
+        for student_id, class_id, full_name in await self.student_repo.get_names(class_ids):
+            self.students.setdefault((class_id, name_key(full_name)), student_id)
+        self.created_students += len(missing)
+
+    async def _create_days(self, keys: set[tuple[int, date]]) -> None:
+        """Yangi kunlarni (yakunlangan holda) yaratish va ID'larini olish."""
+        now = datetime.utcnow()
+        await self.attendance_repo.bulk_create_days([
+            {
+                "class_id": class_id,
+                "date": date_val,
+                "marked_by": self.marked_by,
+                "is_finalized": True,
+                "is_incomplete": False,
+                "updated_at": now,
+            }
+            for class_id, date_val in keys
+        ])
+        dates = [date_val for _, date_val in keys]
+        self.days.update(await self.attendance_repo.get_day_ids(min(dates), max(dates)))
+        self.created_days += len(keys)
+
+    def _parse_date(self, value) -> date | None:
+        if isinstance(value, date):
+            return value
+        try:
+            return self._dates[value]
+        except KeyError:
+            pass
+        parsed = None
+        raw = str(value).strip()
+        for fmt in ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%d.%m.%y"):
+            try:
+                parsed = datetime.strptime(raw, fmt).date()
+                break
+            except ValueError:
+                continue
+        self._dates[value] = parsed
+        return parsed
+
+    def _class_id(self, value) -> int | None:
+        try:
+            return self._class_cache[value]
+        except KeyError:
+            class_id = self.classes.get(name_key(value))
+            self._class_cache[value] = class_id
+            return class_id
+
+    def _student_id(self, class_id: int, value) -> int | None:
+        cache_key = (class_id, value)
+        student_id = self._student_cache.get(cache_key)
+        if student_id is None:
+            student_id = self.students.get((class_id, name_key(value)))
+            if student_id is not None:
+                self._student_cache[cache_key] = student_id
+        return student_id
+
+    def _error(self, reason: str) -> None:
+        self.errors[reason] = self.errors.get(reason, 0) + 1
+
+
+async def import_history(
+    path: Path,
+    create_students: bool,
+    marked_by_phone: str,
+    batch_size: int,
+    keep_indexes: bool,
+) -> bool:
+    """Faylni import qilish. Returns: muvaffaqiyatli bo'lsa True."""
+    print("=" * 50)
+    print("ESKI DAVOMATNI IMPORT QILISH")
+    print("=" * 50)
+
+    await init_db()
+
+    async for session in get_session():
+        user_repo = UserRepository(session)
+        if marked_by_phone:
+            marker = await user_repo.get_by_phone(normalize_phone(marked_by_phone))
+        else:
+            admins = await user_repo.get_all_admins()
+            marker = admins[0] if admins else None
+        if marker is None:
+            print("❌ Belgilovchi foydalanuvchi topilmadi (--marked-by yoki avval admin yarating)")
+            return False
+
+        if session.bind.dialect.name == "sqlite":
+            # Bir martalik yuklash: har commit'da diskka majburiy yozish shart emas
+            await session.execute(text("PRAGMA synchronous=OFF"))
+
+        checkpoint = f"history:{path.name}:{path.stat().st_size}"[:90]
+        job = HistoryImport(session, marker.id, create_students, checkpoint)
+        rows_done = await job.load()
+        if rows_done:
+            print(f"↻ Davom ettirilmoqda: {rows_done} qator avval import qilingan")
+
+        if not keep_indexes:
+            await job.attendance_repo.set_item_indexes(enabled=False)
+            await session.commit()
+
+        with path.open("rb") as fileobj:
+            rows = iter_table_rows(fileobj, path.name)
+            first = next(rows, None)
+            if first is None:
+                print("❌ Fayl bo'sh")
+                return False
+            columns = find_columns(first, COLUMNS)
+            if columns and COLUMNS.keys() <= columns.keys():
+                position = 1
+            else:
+                columns = {"date": 0, "class": 1, "student": 2, "status": 3}
+                rows = itertools.chain([first], rows)
+                position = 0
+
+            if rows_done > position:
+                for _ in itertools.islice(rows, rows_done - position):
+                    pass
+                position = rows_done
+
+            started = time.monotonic()
+            processed = 0
+            while chunk := list(itertools.islice(rows, batch_size)):
+                position += len(chunk)
+                processed += len(chunk)
+                await job.import_chunk(chunk, columns, position)
+                elapsed = time.monotonic() - started
+                print(
+                    f"\r  {position} qator, {job.inserted} yozuv, "
+                    f"{processed / elapsed if elapsed else 0:,.0f} qator/s",
+                    end="",
+                    flush=True,
+                )
+            print()
+
+        elapsed = time.monotonic() - started
+        print(f"✅ Yozuvlar: {job.inserted} ta, kunlar: {job.created_days} ta ({elapsed:.1f} s)")
+        if job.created_students:
+            print(f"👤 Yangi (faol emas) o'quvchilar: {job.created_students} ta")
+        if job.replaced:
+            print(f"🔁 Takroriy qatorlar (oxirgisi olindi): {job.replaced} ta")
+        if job.skipped_existing:
+            print(f"↩️ Bazada bor kunlar uchun o'tkazib yuborildi: {job.skipped_existing} qator")
+        for reason, count in job.errors.items():
+            print(f"⚠️ {reason}: {count} qator")
+
+        if not keep_indexes:
+            stage = time.monotonic()
+            await job.attendance_repo.set_item_indexes(enabled=True)
+            await session.commit()
+            print(f"✅ Indekslar qayta qurildi ({time.monotonic() - stage:.1f} s)")
+
+        stage = time.monotonic()
+        await StatsRepository(session).rebuild()
+        await StudentStatsRepository(session).rebuild()
+        # Jurnalga yozilmagan o'zgarishlar - eksport keshlari versiyasini oshirish
+        await ClassRepository(session).bump_roster_versions(job.touched_classes)
+        await session.commit()
+        print(f"✅ Xulosalar va hisoblagichlar qayta hisoblandi ({time.monotonic() - stage:.1f} s)")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Eski davomatni CSV/XLSX fayldan import qilish")
+    parser.add_argument("file", type=Path, help="CSV yoki XLSX fayl")
+    parser.add_argument("--create-students", action="store_true",
+                        help="topilmagan o'quvchilarni (faol emas) yaratish")
+    parser.add_argument("--marked-by", default="",
+                        help="kunlarni belgilagan foydalanuvchi telefoni (standart - birinchi admin)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"bitta tranzaksiyadagi qatorlar (standart {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--keep-indexes", action="store_true",
+                        help="indekslarni o'chirmaslik (bot ishlab turganda)")
+    args = parser.parse_args()
+
+    if not args.file.exists():
+        print(f"❌ Fayl topilmadi: {args.file}")
+        sys.exit(1)
+
+    ok = asyncio.run(import_history(
+        args.file, args.create_students, args.marked_by, args.batch_size, args.keep_indexes,
+    ))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
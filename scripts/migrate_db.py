@@ -25,6 +25,36 @@ async def migrate():
         except Exception as e:
             logger.warning(f"Failed to add is_finalized (maybe exists): {e}")
 
+        # 2b. Add is_incomplete to attendance_days
+        try:
+            logger.info("Adding is_incomplete to attendance_days...")
+            await conn.execute(text("ALTER TABLE attendance_days ADD COLUMN is_incomplete BOOLEAN NOT NULL DEFAULT 0"))
+            logger.info("is_incomplete added.")
+        except Exception as e:
+            logger.warning(f"Failed to add is_incomplete (maybe exists): {e}")
+
+        # 2b2. Add total_students to attendance_days (yakunlangan kundagi ro'yxat)
+        try:
+            logger.info("Adding total_students to attendance_days...")
+            await conn.execute(text("ALTER TABLE attendance_days ADD COLUMN total_students INTEGER"))
+            # Yakunlangan kunlar uchun hozirgi xulosadagi jami saqlanadi
+            await conn.execute(text(
+                "UPDATE attendance_days SET total_students = (SELECT total FROM attendance_day_stats "
+                "WHERE attendance_day_stats.attendance_day_id = attendance_days.id) "
+                "WHERE is_finalized = 1"
+            ))
+            logger.info("attendance_days.total_students added.")
+        except Exception as e:
+            logger.warning(f"Failed to add attendance_days.total_students (maybe exists): {e}")
+
+        # 2c. Add roster_version to classes
+        try:
+            logger.info("Adding roster_version to classes...")
+            await conn.execute(text("ALTER TABLE classes ADD COLUMN roster_version INTEGER NOT NULL DEFAULT 0"))
+            logger.info("roster_version added.")
+        except Exception as e:
+            logger.warning(f"Failed to add roster_version (maybe exists): {e}")
+
         # 3. Populate total_students
         try:
             logger.info("Populating total_students from existing students count...")
@@ -33,6 +63,16 @@ async def migrate():
         except Exception as e:
             logger.error(f"Failed to populate total_students: {e}")
 
+        # 4. Indexes for unmarked-classes lookups
+        try:
+            logger.info("Creating attendance indexes...")
+            await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_attendance_days_date_class ON attendance_days (date, class_id)"))
+            await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_attendance_items_day ON attendance_items (attendance_day_id)"))
+            await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_attendance_changes_class_date ON attendance_changes (class_id, date)"))
+            logger.info("Attendance indexes created.")
+        except Exception as e:
+            logger.error(f"Failed to create attendance indexes: {e}")
+
 
 if __name__ == "__main__":
     asyncio.run(migrate())
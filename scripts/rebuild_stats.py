@@ -0,0 +1,71 @@
+"""Davomat xulosalarini qayta hisoblash uchun script.
+
+Kunlik xulosalar (attendance_day_stats) va o'quvchilarning chorak
+hisoblagichlari (student_attendance_stats) yangi jadvallarni eski
+ma'lumotlar bilan to'ldirish yoki ular davomat yozuvlaridan farq qilib
+qolganda tuzatish uchun qayta yaratiladi.
+
+    python scripts/rebuild_stats.py          # qayta hisoblash
+    python scripts/rebuild_stats.py --check  # faqat tekshirish
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Parent directory'ni sys.path ga qo'shish
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.db import get_session, init_db
+from repositories.stats import StatsRepository, StudentStatsRepository
+
+
+async def rebuild_stats():
+    """Barcha kunlik xulosalar va o'quvchi hisoblagichlarini qayta yaratish."""
+    print("=" * 50)
+    print("DAVOMAT XULOSALARINI QAYTA HISOBLASH")
+    print("=" * 50)
+    
+    await init_db()
+    
+    async for session in get_session():
+        started = time.monotonic()
+        count = await StatsRepository(session).rebuild()
+        await session.commit()
+        print(f"✅ Kunlik xulosalar: {count} ta ({time.monotonic() - started:.1f} s)")
+        
+        started = time.monotonic()
+        count = await StudentStatsRepository(session).rebuild()
+        await session.commit()
+        print(f"✅ O'quvchi hisoblagichlari: {count} ta ({time.monotonic() - started:.1f} s)")
+
+
+async def check_stats() -> bool:
+    """O'quvchi hisoblagichlarini davomat yozuvlari bilan solishtirish."""
+    print("=" * 50)
+    print("O'QUVCHI HISOBLAGICHLARINI TEKSHIRISH")
+    print("=" * 50)
+    
+    await init_db()
+    
+    async for session in get_session():
+        mismatches = await StudentStatsRepository(session).check()
+    
+    if not mismatches:
+        print("✅ Farq topilmadi")
+        return True
+    
+    print(f"❌ Farqlar: {len(mismatches)} ta")
+    print("   (present, late, absent, streak, last_date)")
+    for student_id, period, stored, expected in mismatches[:50]:
+        print(f"   o'quvchi {student_id}, {period}: saqlangan={stored}, kutilgan={expected}")
+    if len(mismatches) > 50:
+        print(f"   ... va yana {len(mismatches) - 50} ta")
+    print("Tuzatish uchun: python scripts/rebuild_stats.py")
+    return False
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if asyncio.run(check_stats()) else 1)
+    asyncio.run(rebuild_stats())
@@ -1,6 +1,6 @@
 """Attendance service - davomat biznes mantiq."""
 from typing import Optional
-from datetime import date
+from datetime import date, datetime, time, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.db.models import AttendanceDay, AttendanceItem, Student
 from core.config import settings
@@ -68,10 +68,13 @@ class AttendanceService:
         attendance_day_id: int,
         student_id: int,
         status: int,
+        user_id: Optional[int] = None,
     ) -> tuple[bool, str]:
         """
         Davomat belgilash.
         
+        ``user_id`` - belgilagan foydalanuvchi (o'zgarishlar jurnali uchun).
+        
         Returns:
             (True, "") - muvaffaqiyatli
             (False, "error message") - xato
@@ -90,6 +93,7 @@ class AttendanceService:
             attendance_day_id=attendance_day_id,
             student_id=student_id,
             status=status,
+            changed_by=user_id,
         )
         
         return True, ""
@@ -129,6 +133,21 @@ class AttendanceService:
         await self.attendance_repo.update_finalized_status(attendance_day_id, True)
         return True, ""
 
+    async def auto_finalize(self, now: datetime, cutoff: time) -> tuple[int, int]:
+        """
+        Muddati o'tgan davomat kunlarini avtomatik yakunlash.
+        
+        Kun ``cutoff`` vaqtidan keyin muddati o'tgan hisoblanadi. To'liq
+        kunlar yakunlanadi, qolganlari to'liq emas deb belgilanadi.
+        
+        Returns:
+            (yakunlanganlar, to'liq emas deb belgilanganlar)
+        """
+        cutoff_date = now.date()
+        if now.time() >= cutoff:
+            cutoff_date += timedelta(days=1)
+        return await self.attendance_repo.finalize_complete_days(cutoff_date)
+
     async def reopen_attendance(self, attendance_day_id: int) -> tuple[bool, str]:
         """Davomatni qayta ochish (faqat admin)."""
         await self.attendance_repo.update_finalized_status(attendance_day_id, False)
@@ -153,24 +172,26 @@ class AttendanceService:
                 "is_finalized": False,
             }
         
-        # O'quvchilar soni (DB dan)
-        total = attendance_day.class_.total_students
-        
-        # Davomat yozuvlari
-        items = await self.attendance_repo.get_attendance_items(attendance_day_id)
-        
-        present = sum(1 for item in items if item.status == settings.STATUS_PRESENT)
-        late = sum(1 for item in items if item.status == settings.STATUS_LATE)
-        absent = sum(1 for item in items if item.status == settings.STATUS_ABSENT)
-        not_marked = total - len(items)
+        # Kun xulosasi (attendance_day_stats) - yozuvlarni sanamasdan
+        stats = await self.attendance_repo.stats.get_by_day(attendance_day_id)
+        if stats is None:
+            # Eski kun - xulosani bir marta hisoblab saqlash
+            await self.attendance_repo.stats.recompute_day(attendance_day_id)
+            await self.attendance_repo.session.commit()
+            stats = await self.attendance_repo.stats.get_by_day(attendance_day_id)
         
+        return self.stats_to_summary(stats, attendance_day.is_finalized)
+    
+    @staticmethod
+    def stats_to_summary(stats, is_finalized: bool) -> dict:
+        """Kun xulosasini summary dict ko'rinishiga keltirish."""
         return {
-            "total": total,
-            "present": present,
-            "late": late,
-            "absent": absent,
-            "not_marked": not_marked,
-            "is_finalized": attendance_day.is_finalized,
+            "total": stats.total,
+            "present": stats.present,
+            "late": stats.late,
+            "absent": stats.absent,
+            "not_marked": stats.total - stats.marked,
+            "is_finalized": is_finalized,
         }
     
     def _get_status_text(self, status: Optional[int]) -> str:
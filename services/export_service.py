@@ -0,0 +1,332 @@
+"""Export service - katta eksport fayllarini oqim bilan yaratish."""
+import asyncio
+import io
+import re
+import shutil
+import tempfile
+import zipfile
+from collections import Counter, OrderedDict
+from datetime import date
+from typing import AsyncContextManager, AsyncIterator, BinaryIO, Callable, Hashable, Iterable, Optional, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from core.lanes import heavy_lane
+from core.metrics import metrics
+from core.db.models import ExportFile
+from repositories.export import ExportRepository
+from repositories.export_cache import ExportCacheRepository
+from repositories.stats import StatsRepository
+from utils.csv_export import AttendanceCsvWriter, write_summary_csv
+from utils.dates import get_academic_period, get_month_name, get_month_range
+from utils.excel import STATUS_CODES, AttendanceWorkbook
+from utils.pdf import RegisterMatrix, render_register_pdf
+
+T = TypeVar("T")
+
+render_cache_requests = metrics.counter("export_render_cache_total", "Render keshiga murojaatlar")
+
+
+class RenderCache:
+    """Tayyor fayllar uchun kichik LRU kesh (kalitda ma'lumot versiyasi bo'ladi)."""
+    
+    def __init__(self, name: str, max_items: int = 64):
+        self.name = name
+        self.max_items = max(1, max_items)
+        self._items: OrderedDict[Hashable, bytes] = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[bytes]:
+        content = self._items.get(key)
+        if content is None:
+            render_cache_requests.inc(cache=self.name, result="miss")
+            return None
+        self._items.move_to_end(key)
+        render_cache_requests.inc(cache=self.name, result="hit")
+        return content
+    
+    def put(self, key: Hashable, content: bytes) -> None:
+        self._items[key] = content
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+
+register_cache = RenderCache("pdf_register", max_items=settings.PDF_CACHE_SIZE)
+
+
+class ExportService:
+    """
+    Eksportlar servisi.
+
+    Qatorlar DB kursoridan ``EXPORT_FETCH_SIZE`` bo'laklarda olinadi va
+    har bir bo'lak alohida thread'da faylga yoziladi - event loop
+    bloklanmaydi, xotirada esa bir vaqtda bitta bo'lak turadi.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.export_repo = ExportRepository(session)
+        self.cache_repo = ExportCacheRepository(session)
+    
+    async def get_data_version(self, class_id: Optional[int], start: date, end: date) -> str:
+        """Ro'yxat va oraliqdagi davomat versiyasi (bitta yengil so'rov)."""
+        return await self.export_repo.get_data_version(class_id, start, end)
+    
+    async def get_cached_file(
+        self,
+        kind: str,
+        class_id: int,
+        params: str,
+        version: str,
+    ) -> Optional[ExportFile]:
+        """Shu versiya uchun avval yuklangan fayl (``file_id`` va izoh)."""
+        cached = await self.cache_repo.get(kind, class_id, params, version)
+        render_cache_requests.inc(cache=f"file_id_{kind}", result="hit" if cached else "miss")
+        return cached
+    
+    async def remember_file(
+        self,
+        kind: str,
+        class_id: int,
+        params: str,
+        version: str,
+        file_id: str,
+        caption: str,
+    ) -> None:
+        """Yuklangan faylning ``file_id`` sini saqlash."""
+        await self.cache_repo.put(kind, class_id, params, version, file_id, caption)
+    
+    async def forget_file(self, kind: str, class_id: int, params: str) -> None:
+        """Telegram qabul qilmagan ``file_id`` ni o'chirish."""
+        await self.cache_repo.forget(kind, class_id, params)
+    
+    async def write_class_workbook(
+        self,
+        class_id: int,
+        class_name: str,
+        year: int,
+        month: int,
+        fileobj: BinaryIO,
+    ) -> int:
+        """
+        Sinf uchun ``.xlsx``: ro'yxat va oylik davomat matritsasi.
+        
+        Returns:
+            Ro'yxatdagi o'quvchilar soni
+        """
+        start, end = get_month_range(year, month)
+        return await self.write_class_range_workbook(
+            class_id,
+            class_name,
+            start,
+            end,
+            f"{class_name}, {get_month_name(month)} {year}",
+            fileobj,
+            period=get_academic_period(date.today()),
+        )
+    
+    async def write_class_range_workbook(
+        self,
+        class_id: int,
+        class_name: str,
+        start: date,
+        end: date,
+        title: str,
+        fileobj: BinaryIO,
+        period: Optional[str] = None,
+    ) -> int:
+        """
+        Sinf uchun ``.xlsx``: ro'yxat (``period`` chorak hisoblagichlari bilan)
+        va ``start``..``end`` oralig'idagi davomat matritsasi.
+        
+        Returns:
+            Ro'yxatdagi o'quvchilar soni
+        """
+        workbook = AttendanceWorkbook()
+        
+        workbook.start_roster(class_name)
+        students = await self._write_chunks(
+            self.export_repo.stream_roster(class_id, period or get_academic_period(start)),
+            workbook.append_roster,
+        )
+        
+        days = await self.export_repo.get_school_days(class_id, start, end)
+        workbook.start_matrix(title, days)
+        await self._write_chunks(
+            (
+                (full_name, statuses)
+                async for _, full_name, statuses in self.export_repo.stream_status_matrix(
+                    class_id, start, end
+                )
+            ),
+            workbook.append_matrix,
+        )
+        
+        await asyncio.to_thread(workbook.save, fileobj)
+        return students
+    
+    async def write_school_archive(
+        self,
+        start: date,
+        end: date,
+        title: str,
+        fileobj: BinaryIO,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        workers: Optional[int] = None,
+    ) -> int:
+        """
+        Maktab arxivi (ZIP): har bir sinf uchun ``.xlsx`` va umumiy ``xulosa.csv``.
+        
+        Sinf fayllari ``workers`` ta parallel ishchida, har biri o'z DB
+        session'ida va o'z vaqtinchalik faylida yaratiladi. Tayyor fayl
+        darhol ZIP'ga ko'chiriladi va yopiladi - xotirada bir ishchiga
+        bittadan ortiq sinf ma'lumoti turmaydi. ZIP ``fileobj`` ga
+        bo'laklab yoziladi.
+        
+        Chaqiruvchining session'i ishchilar boshlanishidan oldin commit
+        qilinadi - uning ulanishi pulga qaytadi va ishchilar bilan bir
+        vaqtda band turmaydi (og'ir ishlar uchun ulanishlar puli kichik).
+        
+        Returns:
+            Arxivdagi sinflar soni
+        """
+        totals = await StatsRepository(self.export_repo.session).get_class_totals(start, end)
+        await self.export_repo.session.commit()
+        period = get_academic_period(start)
+        filenames = _archive_filenames((row[0], row[1]) for row in totals)
+        
+        archive = zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED)
+        archive_lock = asyncio.Lock()
+        slots = asyncio.Semaphore(max(1, workers or settings.ARCHIVE_WORKERS))
+        
+        summary = io.BytesIO()
+        await asyncio.to_thread(write_summary_csv, summary, title, totals)
+        summary.seek(0)
+        await asyncio.to_thread(_copy_into_zip, archive, "xulosa.csv", summary)
+        
+        async def build(class_id: int, class_name: str) -> None:
+            async with slots:
+                with tempfile.SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_SIZE) as spool:
+                    async with session_factory() as session:
+                        await ExportService(session).write_class_range_workbook(
+                            class_id, class_name, start, end,
+                            f"{class_name}, {title}", spool, period=period,
+                        )
+                    spool.seek(0)
+                    async with archive_lock:
+                        await asyncio.to_thread(
+                            _copy_into_zip, archive, filenames[class_id], spool
+                        )
+        
+        try:
+            await asyncio.gather(*(build(row[0], row[1]) for row in totals))
+        finally:
+            await asyncio.to_thread(archive.close)
+        return len(totals)
+    
+    async def write_attendance_csv(
+        self,
+        start: date,
+        end: date,
+        fileobj: BinaryIO,
+        class_id: Optional[int] = None,
+    ) -> int:
+        """
+        Xom davomat yozuvlari CSV: sana, sinf, o'quvchi, status, belgilagan, yangilangan.
+        
+        Args:
+            start, end: Sanalar oralig'i (ikkalasi ham kiradi)
+            fileobj: Yoziladigan fayl (odatda ``SpooledTemporaryFile``)
+            class_id: Faqat shu sinf (None - barcha sinflar)
+        
+        Returns:
+            Yozilgan qatorlar soni
+        """
+        writer = AttendanceCsvWriter(fileobj)
+        writer.write_header()
+        return await self._write_chunks(
+            self.export_repo.stream_attendance(start, end, class_id),
+            writer.write_rows,
+        )
+    
+    async def get_register_pdf(
+        self,
+        class_id: int,
+        class_name: str,
+        year: int,
+        month: int,
+    ) -> bytes:
+        """
+        Oylik sinf davomat jurnali (PDF).
+        
+        Natija ``(sinf, oy, ma'lumot versiyasi)`` bo'yicha keshlanadi:
+        ro'yxat yoki shu oy davomati o'zgarmagan bo'lsa qayta chizilmaydi.
+        Chizish process pulda bajariladi, unga faqat ixcham matritsa
+        uzatiladi.
+        """
+        start, end = get_month_range(year, month)
+        version = await self.export_repo.get_data_version(class_id, start, end)
+        key = (class_id, year, month, class_name, version)
+        content = register_cache.get(key)
+        if content is not None:
+            return content
+        
+        days = await self.export_repo.get_school_days(class_id, start, end)
+        rows = []
+        async for _, full_name, statuses in self.export_repo.stream_status_matrix(class_id, start, end):
+            codes = "".join(STATUS_CODES.get(statuses.get(day), " ") for day in days)
+            rows.append((full_name, codes))
+        
+        matrix = RegisterMatrix(
+            class_name=class_name,
+            title=f"{get_month_name(month)} {year}",
+            days=tuple(day.day for day in days),
+            rows=tuple(rows),
+            font_path=settings.PDF_FONT_PATH,
+        )
+        content = await heavy_lane.run_in_process(render_register_pdf, matrix)
+        register_cache.put(key, content)
+        return content
+    
+    async def _write_chunks(
+        self,
+        rows: AsyncIterator[T],
+        write: Callable[[list[T]], None],
+    ) -> int:
+        """Qatorlarni bo'laklab ``write`` ga (thread'da) uzatish."""
+        count = 0
+        chunk: list[T] = []
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.export_repo.fetch_size:
+                await asyncio.to_thread(write, chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            await asyncio.to_thread(write, chunk)
+            count += len(chunk)
+        return count
+
+
+def _copy_into_zip(archive: zipfile.ZipFile, name: str, source: BinaryIO) -> None:
+    """Fayl obyektini ZIP ichiga bo'laklab ko'chirish."""
+    with archive.open(name, "w", force_zip64=True) as target:
+        shutil.copyfileobj(source, target, length=1024 * 1024)
+
+
+def _safe_filename(name: str) -> str:
+    return re.sub(r'[\\/:*?"<>|]+', "_", name).strip() or "sinf"
+
+
+def _archive_filenames(classes: Iterable[tuple[int, str]]) -> dict[int, str]:
+    """
+    Arxivdagi sinf fayllari nomlari: {class_id: "5-A.xlsx"}.
+    
+    Tozalangandan keyin bir xil bo'lib qoladigan nomlarga (katta-kichik
+    harf farqisiz) sinf ID'si qo'shiladi - ZIP'da fayllar bir-birini
+    almashtirmaydi.
+    """
+    classes = [(class_id, _safe_filename(name)) for class_id, name in classes]
+    counts = Counter(safe.casefold() for _, safe in classes)
+    return {
+        class_id: f"{safe}_{class_id}.xlsx" if counts[safe.casefold()] > 1 else f"{safe}.xlsx"
+        for class_id, safe in classes
+    }
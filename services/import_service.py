@@ -0,0 +1,306 @@
+"""Import service - o'quvchilarni fayldan ommaviy qo'shish."""
+import asyncio
+import itertools
+import re
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from repositories.class_repo import ClassRepository
+from repositories.student import StudentRepository
+from repositories.user import UserRepository
+from services.user import pending_telegram_id
+from utils.phone import is_valid_uzbek_phone, normalize_phone
+from utils.import_files import cell, find_columns, name_key, normalize_name
+
+# Sarlavha qatoridagi ustun nomlari (kichik harflarda)
+STUDENT_COLUMNS = {
+    "name": {
+        "ism", "ism familiya", "familiya ism", "f.i.sh", "f.i.sh.", "fish",
+        "o'quvchi", "fio", "ф.и.о", "ф.и.о.", "фио", "full_name", "name",
+    },
+    "class": {"sinf", "sinf nomi", "класс", "class"},
+}
+
+STAFF_COLUMNS = {
+    "name": STUDENT_COLUMNS["name"] | {"xodim", "ism-familiya"},
+    "phone": {"telefon", "telefon raqam", "telefon raqami", "tel", "phone", "телефон"},
+    "classes": {"sinf", "sinflar", "sinf nomi", "класс", "классы", "class", "classes"},
+}
+
+# Bitta katakdagi sinflar ajratuvchisi: "5A, 6B" yoki "5A; 6B"
+_CLASS_SEPARATORS = re.compile(r"[,;/|]")
+
+# Xulosa xabarida ko'rsatiladigan xatolar soni
+MAX_LISTED_ERRORS = 10
+
+
+@dataclass
+class ImportErrors:
+    """Qator xatolari (xabarda faqat birinchi ``MAX_LISTED_ERRORS`` tasi)."""
+
+    error_count: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def add_error(self, line: int, text: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_LISTED_ERRORS:
+            self.errors.append(f"{line}-qator: {text}" if line else text)
+
+
+@dataclass
+class ImportReport(ImportErrors):
+    """O'quvchilar importi natijasi (bitta xulosa xabari uchun)."""
+
+    added: dict[str, int] = field(default_factory=dict)  # sinf nomi -> qo'shilganlar
+    duplicates: int = 0
+
+    @property
+    def total_added(self) -> int:
+        return sum(self.added.values())
+
+
+@dataclass
+class StaffImportReport(ImportErrors):
+    """Xodimlar importi natijasi."""
+
+    created: int = 0    # yangi xodimlar
+    existing: int = 0   # telefon raqami bazada bor edi
+    assigned: int = 0   # yangi sinf biriktirishlari
+
+
+class ImportService:
+    """
+    Fayldan ommaviy import.
+
+    Qatorlar ``IMPORT_BATCH_SIZE`` bo'laklab o'qiladi (fayl tahlili
+    thread'da, event loop bloklanmaydi) va har bir bo'lak bitta
+    ko'p qatorli INSERT bilan yoziladi. Hammasi bitta tranzaksiyada:
+    xato bo'lsa hech narsa saqlanmaydi.
+    """
+
+    def __init__(self, session: AsyncSession, batch_size: Optional[int] = None):
+        self.session = session
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.student_repo = StudentRepository(session)
+        self.class_repo = ClassRepository(session)
+        self.user_repo = UserRepository(session)
+
+    async def import_students(
+        self,
+        rows: Iterator[list[Any]],
+        class_id: Optional[int] = None,
+    ) -> ImportReport:
+        """
+        O'quvchilarni jadval qatorlaridan qo'shish.
+
+        Birinchi qator sarlavha bo'lsa, ustunlar nomi bo'yicha topiladi,
+        aks holda birinchi ustun - ism. ``Sinf`` ustuni bo'lmasa (yoki
+        katak bo'sh bo'lsa) o'quvchi ``class_id`` sinfiga qo'shiladi.
+
+        Sinfda bor (faol) ismlar va fayl ichidagi takrorlar o'tkazib
+        yuboriladi. ``total_students`` har bir sinf uchun bir marta
+        yangilanadi.
+
+        Raises:
+            ValueError: Faylni o'qib bo'lmasa
+        """
+        report = ImportReport()
+        classes = {name_key(c.name): c for c in await self.class_repo.get_all()}
+        class_names = {c.id: c.name for c in classes.values()}
+        if class_id is not None and class_id not in class_names:
+            report.add_error(0, "Sinf topilmadi")
+            return report
+
+        known: dict[int, set[str]] = {}
+        added: dict[int, int] = {}
+        columns: Optional[dict[str, int]] = None
+        line = 0
+
+        try:
+            async for chunk in self._read_chunks(rows):
+                if columns is None:
+                    columns = find_columns(chunk[0], STUDENT_COLUMNS)
+                    if columns and "name" in columns:
+                        chunk, line = chunk[1:], 1
+                    else:
+                        columns = {"name": 0}
+
+                pending = []
+                for row in chunk:
+                    line += 1
+                    full_name = normalize_name(cell(row, columns["name"]))
+                    if not full_name:
+                        continue
+                    error = self._validate_name(full_name)
+                    if error:
+                        report.add_error(line, error)
+                        continue
+
+                    target = class_id
+                    class_value = normalize_name(cell(row, columns.get("class")))
+                    if class_value:
+                        class_obj = classes.get(name_key(class_value))
+                        if class_obj is None:
+                            report.add_error(line, f"'{class_value}' sinfi topilmadi")
+                            continue
+                        target = class_obj.id
+                    if target is None:
+                        report.add_error(line, "sinf ko'rsatilmagan")
+                        continue
+
+                    if target not in known:
+                        known[target] = {
+                            name_key(name) for name in await self.student_repo.get_active_names(target)
+                        }
+                    key = name_key(full_name)
+                    if key in known[target]:
+                        report.duplicates += 1
+                        continue
+                    known[target].add(key)
+
+                    pending.append({"class_id": target, "full_name": full_name, "is_active": True})
+                    added[target] = added.get(target, 0) + 1
+
+                await self.student_repo.bulk_create(pending)
+
+            for target, count in added.items():
+                await self.class_repo.adjust_student_count(target, count)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        report.added = {class_names[target]: count for target, count in sorted(
+            added.items(), key=lambda item: class_names[item[0]]
+        )}
+        return report
+
+    async def import_staff(self, rows: Iterator[list[Any]]) -> StaffImportReport:
+        """
+        Xodimlarni jadvaldan qo'shish va sinflarga biriktirish.
+
+        Ustunlar: ism familiya, telefon, sinflar (ixtiyoriy, vergul bilan).
+        Sarlavha bo'lmasa shu tartibda deb olinadi. Har bir bo'lak uchun
+        telefonlar bir martada normalizatsiya qilinadi, bor
+        foydalanuvchilar, sinflar va biriktirishlar ``IN`` so'rovlari
+        bilan topiladi. Bazada bor xodimga faqat yangi sinflar
+        biriktiriladi. Hammasi bitta tranzaksiyada.
+
+        Raises:
+            ValueError: Faylni o'qib bo'lmasa
+        """
+        report = StaffImportReport()
+        classes: dict[str, Optional[int]] = {}  # name_key -> class_id (topilmasa None)
+        seen_phones: set[str] = set()
+        columns: Optional[dict[str, int]] = None
+        line = 0
+
+        try:
+            async for chunk in self._read_chunks(rows):
+                if columns is None:
+                    columns = find_columns(chunk[0], STAFF_COLUMNS)
+                    if columns and {"name", "phone"} <= columns.keys():
+                        chunk, line = chunk[1:], 1
+                    else:
+                        columns = {"name": 0, "phone": 1, "classes": 2}
+
+                # 1. Qatorlarni tahlil qilish va telefonlarni normalizatsiya
+                parsed = []
+                for row in chunk:
+                    line += 1
+                    full_name = normalize_name(cell(row, columns["name"]))
+                    raw_phone = str(cell(row, columns["phone"]))
+                    if not full_name and not raw_phone:
+                        continue
+                    phone = normalize_phone(raw_phone)
+                    error = self._validate_name(full_name) if full_name else "ism ko'rsatilmagan"
+                    if not error and not is_valid_uzbek_phone(phone):
+                        error = f"'{raw_phone}' noto'g'ri telefon raqam"
+                    if not error and phone in seen_phones:
+                        error = f"{phone} raqami faylda takrorlangan"
+                    if error:
+                        report.add_error(line, error)
+                        continue
+                    seen_phones.add(phone)
+                    class_names = [
+                        normalize_name(name)
+                        for name in _CLASS_SEPARATORS.split(str(cell(row, columns.get("classes"))))
+                        if normalize_name(name)
+                    ]
+                    parsed.append((line, full_name, phone, class_names))
+                if not parsed:
+                    continue
+
+                # 2. Bor foydalanuvchilar va yangi sinf nomlari - IN so'rovlari
+                users = await self.user_repo.get_by_phones({phone for _, _, phone, _ in parsed})
+                unknown = {
+                    name for *_, class_names in parsed for name in class_names
+                    if name_key(name) not in classes
+                }
+                for class_obj in await self.class_repo.get_by_names(unknown):
+                    classes[name_key(class_obj.name)] = class_obj.id
+                for name in unknown:
+                    classes.setdefault(name_key(name), None)
+
+                # 3. Yangi xodimlar - bitta INSERT, keyin ID'lar IN bilan
+                new_rows = [
+                    {
+                        "telegram_id": pending_telegram_id(phone),
+                        "phone": phone,
+                        "full_name": full_name,
+                        "role": settings.ROLE_STAFF,
+                        "is_active": True,
+                    }
+                    for _, full_name, phone, _ in parsed
+                    if phone not in users
+                ]
+                report.existing += len(parsed) - len(new_rows)
+                report.created += await self.user_repo.bulk_create(new_rows)
+                if new_rows:
+                    users.update(await self.user_repo.get_by_phones({row["phone"] for row in new_rows}))
+
+                # 4. Sinf biriktirishlari (faollari takrorlanmaydi)
+                assigned = await self.class_repo.get_active_assignment_pairs(
+                    {users[phone].id for _, _, phone, _ in parsed}
+                )
+                pairs = []
+                for row_line, _, phone, class_names in parsed:
+                    user = users[phone]
+                    if class_names and user.role != settings.ROLE_STAFF:
+                        report.add_error(row_line, f"{phone} - {user.role}, sinfga biriktirilmadi")
+                        continue
+                    for name in class_names:
+                        class_id = classes[name_key(name)]
+                        if class_id is None:
+                            report.add_error(row_line, f"'{name}' sinfi topilmadi")
+                            continue
+                        if (class_id, user.id) not in assigned:
+                            assigned.add((class_id, user.id))
+                            pairs.append((class_id, user.id))
+                report.assigned += await self.class_repo.bulk_assign_staff(pairs)
+
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return report
+
+    async def _read_chunks(self, rows: Iterator[list[Any]]) -> AsyncIterator[list[list[Any]]]:
+        """Qatorlarni bo'laklab o'qish (fayl tahlili thread'da)."""
+        while True:
+            chunk = await asyncio.to_thread(list, itertools.islice(rows, self.batch_size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _validate_name(full_name: str) -> str:
+        """Ism xatosi matni (to'g'ri bo'lsa bo'sh satr)."""
+        if len(full_name) > 255:
+            return "ism juda uzun"
+        if not any(char.isalpha() for char in full_name):
+            return f"'{full_name}' ism emas"
+        return ""
+
@@ -0,0 +1,83 @@
+"""Journal service - davomat o'zgarishlari jurnalini iste'mol qilish."""
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db.models import AttendanceChange
+from repositories.journal import JournalRepository
+
+
+class JournalService:
+    """
+    Jurnal iste'molchilari (yig'indilar, keshlar, tashqi sinxronizatsiya).
+
+    Har bir iste'molchi nomi bo'yicha o'z kursoriga ega va faqat undan
+    keyingi yozuvlarni oladi - jadvalni qayta skanerlash kerak emas.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.journal_repo = JournalRepository(session)
+
+    async def consume(
+        self,
+        consumer: str,
+        handler: Callable[[list[AttendanceChange]], Awaitable[None]],
+        batch_size: int = 1000,
+        settle: float = 5.0,
+    ) -> int:
+        """
+        Yangi yozuvlarni paketlab ``handler`` ga berish.
+
+        Har bir paketdan keyin kursor suriladi va commit qilinadi.
+        ``handler`` shu session orqali yozsa, uning natijasi va kursor
+        bitta tranzaksiyada saqlanadi (har bir yozuv bir marta
+        qayta ishlanadi).
+
+        ``seq`` raqamlari tranzaksiyalar commit bo'lish tartibida
+        ko'rinmasligi mumkin: ``seq`` da bo'shliq bo'lsa va undan keyingi
+        yozuv ``settle`` soniyadan yoshroq bo'lsa, o'qish shu joyda
+        to'xtaydi (bo'shliq hali commit bo'lmagan tranzaksiya bo'lishi
+        mumkin). Eskiroq bo'shliqlar bekor qilingan tranzaksiya deb
+        hisoblanadi.
+
+        Returns:
+            Qayta ishlangan yozuvlar soni
+        """
+        processed = 0
+        last_seq = await self.journal_repo.get_cursor(consumer)
+
+        while True:
+            changes = await self.journal_repo.read_since(last_seq, limit=batch_size)
+            changes = self._settled_prefix(changes, last_seq, settle)
+            if not changes:
+                break
+
+            await handler(changes)
+            last_seq = changes[-1].seq
+            await self.journal_repo.advance_cursor(consumer, last_seq)
+            await self.session.commit()
+            processed += len(changes)
+
+            if len(changes) < batch_size:
+                break
+
+        return processed
+
+    async def get_lag(self, consumer: str) -> int:
+        """Iste'molchi hali ko'rmagan yozuvlar soni (taxminiy, ``seq`` farqi)."""
+        return await self.journal_repo.last_seq() - await self.journal_repo.get_cursor(consumer)
+
+    @staticmethod
+    def _settled_prefix(
+        changes: list[AttendanceChange],
+        after_seq: int,
+        settle: float,
+    ) -> list[AttendanceChange]:
+        """Bo'shliqsiz (yoki bo'shlig'i eskirgan) boshlang'ich qism."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settle)
+        expected = after_seq + 1
+        for index, change in enumerate(changes):
+            if change.seq != expected and change.changed_at > cutoff:
+                return changes[:index]
+            expected = change.seq + 1
+        return changes
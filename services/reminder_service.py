@@ -0,0 +1,66 @@
+"""Reminder service - belgilanmagan davomat uchun eslatmalar."""
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from repositories.attendance import AttendanceRepository
+from repositories.class_repo import ClassRepository
+
+
+class ReminderService:
+    """Davomati belgilanmagan sinflar bo'yicha eslatmalar servisi."""
+    
+    def __init__(self, session: AsyncSession):
+        self.attendance_repo = AttendanceRepository(session)
+        self.class_repo = ClassRepository(session)
+    
+    async def get_unmarked_classes(self, date_val: date) -> list[dict]:
+        """
+        Davomati to'liq belgilanmagan sinflar.
+        
+        Returns:
+            [{"class_id", "class_name", "total", "marked"}, ...]
+        """
+        rows = await self.attendance_repo.get_unmarked_classes(date_val)
+        return [
+            {
+                "class_id": class_id,
+                "class_name": class_name,
+                "total": total,
+                "marked": marked,
+            }
+            for class_id, class_name, total, marked in rows
+        ]
+    
+    async def build_staff_reminders(self, date_val: date) -> list[tuple[int, str]]:
+        """
+        Xodimlarga yuboriladigan eslatmalar.
+        
+        Har bir xodimga bitta xabar: unga biriktirilgan barcha belgilanmagan
+        sinflar ro'yxati.
+        
+        Returns:
+            [(telegram_id, text), ...]
+        """
+        unmarked = await self.get_unmarked_classes(date_val)
+        if not unmarked:
+            return []
+        
+        staff_by_class = await self.class_repo.get_active_staff_by_classes(
+            [row["class_id"] for row in unmarked]
+        )
+        
+        lines_by_chat: dict[int, list[str]] = {}
+        for row in unmarked:
+            for staff_user in staff_by_class.get(row["class_id"], []):
+                if staff_user.telegram_id <= 0:  # botga hali kirmagan
+                    continue
+                lines_by_chat.setdefault(staff_user.telegram_id, []).append(
+                    f"📚 {row['class_name']}: {row['marked']}/{row['total']}"
+                )
+        
+        return [
+            (
+                chat_id,
+                "⏰ Eslatma: bugungi davomat to'liq belgilanmagan\n\n" + "\n".join(lines),
+            )
+            for chat_id, lines in lines_by_chat.items()
+        ]
@@ -66,6 +66,35 @@ class ReportService:
         
         return report, True
     
+    async def get_school_daily_reports(self, date_val: date) -> list[str]:
+        """
+        Barcha sinflarning kunlik hisobotlari.
+        
+        Sinflar soniga teng qator o'qiladi (attendance_day_stats), o'quvchilar
+        yozuvlari sanalmaydi. Xulosasi yo'q kunlar (eski kunlar) bir marta
+        yozuvlardan hisoblab saqlanadi - get_attendance_summary'dagi kabi.
+        """
+        stats_repo = self.attendance_repo.stats
+        missing = await stats_repo.get_missing_day_ids(date_val)
+        if missing:
+            for attendance_day_id in missing:
+                await stats_repo.recompute_day(attendance_day_id)
+            await self.attendance_repo.session.commit()
+        
+        reports = []
+        for stats, class_name in await stats_repo.get_for_date(date_val):
+            summary = AttendanceService.stats_to_summary(stats, stats.is_finalized)
+            reports.append(ReportGenerator.generate_daily_summary(
+                date_val=date_val,
+                class_name=class_name,
+                total=summary['total'],
+                present=summary['present'],
+                late=summary['late'],
+                absent=summary['absent'],
+                not_marked=summary['not_marked'],
+            ))
+        return reports
+    
     async def get_class_report(self, class_id: int) -> tuple[str, bool]:
         """
         Sinf hisoboti olish.
@@ -1,9 +1,23 @@
 """Student service - o'quvchilar biznes mantiq."""
+from dataclasses import dataclass
+from datetime import date
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from core.db.models import Student
+from core.db.models import Class, Student, StudentAttendanceStats
 from repositories.student import StudentRepository
 from repositories.class_repo import ClassRepository
+from repositories.transfer import TransferRepository
+from utils.import_files import name_key
+
+
+@dataclass
+class TransferPreview:
+    """Ommaviy transfer oldidan ko'rinish."""
+    
+    from_class_name: str
+    to_class_name: str
+    students: list[str]          # o'tkaziladigan o'quvchilar ismlari
+    name_conflicts: list[str]    # maqsad sinfda shu ismli o'quvchi bor
 
 
 class StudentService:
@@ -63,6 +77,25 @@ class StudentService:
         """Sinfdagi o'quvchilarni olish."""
         return await self.student_repo.get_by_class(class_id)
     
+    async def get_roster(
+        self,
+        class_id: int,
+    ) -> list[tuple[Student, Optional[StudentAttendanceStats]]]:
+        """Sinf ro'yxati joriy chorak davomat hisoblagichlari bilan."""
+        from utils.dates import get_academic_period
+        return await self.student_repo.get_by_class_with_stats(
+            class_id, get_academic_period(date.today())
+        )
+    
+    async def get_student_stats(self, student_id: int) -> Optional[StudentAttendanceStats]:
+        """O'quvchining joriy chorak hisoblagichlari."""
+        from repositories.stats import StudentStatsRepository
+        from utils.dates import get_academic_period
+        stats = await StudentStatsRepository(self.student_repo.session).get_for_students(
+            [student_id], get_academic_period(date.today())
+        )
+        return stats.get(student_id)
+    
     async def transfer_student(
         self,
         student_id: int,
@@ -81,33 +114,116 @@ class StudentService:
         if not student:
             return False, "❌ O'quvchi topilmadi."
         
-        from_class_id = student.class_id
-        
-        # Maqsad sinfni tekshirish
-        to_class = await self.class_repo.get_by_id(to_class_id)
-        if not to_class:
-            return False, "❌ Maqsad sinf topilmadi."
-        
         # Bir xil sinfga o'tkazish tekshiruvi
-        if from_class_id == to_class_id:
+        if student.class_id == to_class_id:
             return False, "❌ O'quvchi allaqachon shu sinfda."
         
-        # Transfer yaratish
-        from repositories.transfer import TransferRepository
-        transfer_repo = TransferRepository(self.student_repo.session)
-        
-        await transfer_repo.create(
-            student_id=student_id,
-            from_class_id=from_class_id,
-            to_class_id=to_class_id,
-            by_user_id=by_user_id,
+        moved, error = await self.transfer_students(
+            student.class_id, to_class_id, by_user_id, student_ids=[student_id]
         )
+        if error:
+            return False, error
+        if not moved:
+            return False, "❌ O'quvchi topilmadi."
         
-        # O'quvchini o'tkazish
-        await self.student_repo.transfer_student(student, to_class_id)
+        return True, ""
+    
+    async def preview_transfer(
+        self,
+        from_class_id: int,
+        to_class_id: int,
+        student_ids: Optional[list[int]] = None,
+    ) -> tuple[Optional[TransferPreview], str]:
+        """
+        Ommaviy transferni oldindan ko'rish (hech narsa o'zgartirilmaydi).
         
-        # Total students ni yangilash
-        await self.class_repo.decrement_student_count(from_class_id)
-        await self.class_repo.increment_student_count(to_class_id)
+        Returns:
+            (TransferPreview, "") - muvaffaqiyatli
+            (None, "error message") - xato
+        """
+        from_class, to_class, error = await self._get_transfer_classes(from_class_id, to_class_id)
+        if error:
+            return None, error
+        
+        students = await self.student_repo.get_by_class(from_class_id)
+        if student_ids is not None:
+            selected = set(student_ids)
+            students = [student for student in students if student.id in selected]
+        if not students:
+            return None, "❌ O'tkaziladigan o'quvchilar yo'q."
+        
+        target_names = {
+            name_key(name) for name in await self.student_repo.get_active_names(to_class_id)
+        }
+        conflicts = [s.full_name for s in students if name_key(s.full_name) in target_names]
+        
+        return TransferPreview(
+            from_class_name=from_class.name,
+            to_class_name=to_class.name,
+            students=[student.full_name for student in students],
+            name_conflicts=conflicts,
+        ), ""
+    
+    async def transfer_students(
+        self,
+        from_class_id: int,
+        to_class_id: int,
+        by_user_id: int,
+        student_ids: Optional[list[int]] = None,
+        dry_run: bool = False,
+    ) -> tuple[int, str]:
+        """
+        Sinfning barcha faol o'quvchilarini (yoki ``student_ids``) boshqa
+        sinfga o'tkazish.
         
-        return True, ""
+        Transferlar bitta INSERT ... SELECT, o'quvchilar bitta UPDATE
+        bilan yoziladi; ikkala sinf hisoblagichi (``total_students``,
+        ``roster_version``, ochiq kunlar jamisi) shu tranzaksiyada
+        yangilanadi. ``dry_run=True`` - hammasi bajariladi va natija
+        sanab bo'lingach bekor qilinadi (rollback).
+        
+        Returns:
+            (o'tkazilganlar soni, "") - muvaffaqiyatli
+            (0, "error message") - xato
+        """
+        _, _, error = await self._get_transfer_classes(from_class_id, to_class_id)
+        if error:
+            return 0, error
+        
+        session = self.student_repo.session
+        transfer_repo = TransferRepository(session)
+        try:
+            await transfer_repo.create_for_students(
+                from_class_id, to_class_id, by_user_id, student_ids
+            )
+            moved = await self.student_repo.move_students(from_class_id, to_class_id, student_ids)
+            await self.class_repo.adjust_student_count(from_class_id, -moved)
+            await self.class_repo.adjust_student_count(to_class_id, moved)
+            if dry_run:
+                await session.rollback()
+            else:
+                await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        
+        return moved, ""
+    
+    async def _get_transfer_classes(
+        self,
+        from_class_id: int,
+        to_class_id: int,
+    ) -> tuple[Optional[Class], Optional[Class], str]:
+        """Transfer sinflarini tekshirish."""
+        if from_class_id == to_class_id:
+            return None, None, "❌ O'quvchilar allaqachon shu sinfda."
+        
+        from_class = await self.class_repo.get_by_id(from_class_id)
+        if not from_class:
+            return None, None, "❌ Sinf topilmadi."
+        
+        to_class = await self.class_repo.get_by_id(to_class_id)
+        if not to_class:
+            return None, None, "❌ Maqsad sinf topilmadi."
+        
+        return from_class, to_class, ""
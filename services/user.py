@@ -6,6 +6,17 @@ from repositories.user import UserRepository
 from utils.phone import normalize_phone
 
 
+def pending_telegram_id(phone: str) -> int:
+    """
+    Botga hali kirmagan foydalanuvchi uchun vaqtinchalik ``telegram_id``.
+
+    ``telegram_id`` unikal, shuning uchun telefon raqamdan manfiy son
+    olinadi - haqiqiy ID bilan to'qnashmaydi. Foydalanuvchi botga
+    kirganda ``get_or_create_user`` uni haqiqiysiga almashtiradi.
+    """
+    return -int(phone)
+
+
 class UserService:
     """Foydalanuvchilar bilan ishlash servisi."""
     
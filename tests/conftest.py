@@ -0,0 +1,43 @@
+"""Testlar uchun umumiy fixture'lar - vaqtinchalik SQLite baza."""
+import os
+import tempfile
+from pathlib import Path
+
+# Sozlamalar import paytida o'qiladi - core'dan oldin o'rnatiladi
+_DB_PATH = Path(tempfile.gettempdir()) / f"davomat_test_{os.getpid()}.db"
+os.environ.setdefault("BOT_TOKEN", "1:test")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+
+import pytest_asyncio  # noqa: E402
+
+from core.db import Base, engine  # noqa: E402
+from core.db.engine import async_session_maker  # noqa: E402
+from core.db.models import Class, Student, User  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Har bir test uchun bo'sh jadvallar va yangi session."""
+    from core.db import models  # noqa: F401 - metadata uchun kerak
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_maker() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def school(session):
+    """Bitta sinf, xodim va ``students`` ta o'quvchi: (class, user, [student, ...])."""
+    class_obj = Class(name="5A", total_students=2)
+    user = User(telegram_id=1, phone="+998900000000", full_name="Xodim", role="xodim")
+    session.add_all([class_obj, user])
+    await session.flush()
+    students = [
+        Student(class_id=class_obj.id, full_name=name) for name in ("Ali Valiyev", "Vali Aliyev")
+    ]
+    session.add_all(students)
+    await session.commit()
+    return class_obj, user, students
@@ -0,0 +1,69 @@
+"""Kun xulosalari: har yozuvda yangilangani va qayta qurilgani bir xil."""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from core.config import settings
+from core.db.models import AttendanceDayStats
+from repositories.attendance import AttendanceRepository
+from repositories.class_repo import ClassRepository
+
+pytestmark = pytest.mark.asyncio
+
+MON, TUE = date(2026, 10, 12), date(2026, 10, 13)
+
+
+async def snapshot(session):
+    session.expire_all()
+    result = await session.execute(
+        select(AttendanceDayStats).order_by(AttendanceDayStats.attendance_day_id)
+    )
+    return [
+        (row.present, row.late, row.absent, row.marked, row.total, row.is_finalized)
+        for row in result.scalars().all()
+    ]
+
+
+async def assert_rebuild_matches(session, repo):
+    incremental = await snapshot(session)
+    await repo.stats.rebuild()
+    await session.commit()
+    assert await snapshot(session) == incremental
+    return incremental
+
+
+async def test_partly_marked_finalized_day_keeps_total(session, school):
+    class_obj, user, (ali, _) = school
+    repo = AttendanceRepository(session)
+    day_id = (await repo.get_or_create_attendance_day(class_obj.id, MON, user.id)).id
+    await repo.set_attendance_status(day_id, ali.id, settings.STATUS_PRESENT)
+    await repo.update_finalized_status(day_id, True)
+
+    assert await assert_rebuild_matches(session, repo) == [(1, 0, 0, 1, 2, True)]
+
+    await repo.update_finalized_status(day_id, False)
+    assert await assert_rebuild_matches(session, repo) == [(1, 0, 0, 1, 2, False)]
+
+
+async def test_auto_finalize_and_incomplete_days(session, school):
+    class_obj, user, (ali, vali) = school
+    repo = AttendanceRepository(session)
+    classes = ClassRepository(session)
+    await classes.adjust_student_count(class_obj.id, 1)
+    await session.commit()
+    full = await repo.get_or_create_attendance_day(class_obj.id, MON, user.id)
+    await repo.set_attendance_status(full.id, ali.id, settings.STATUS_PRESENT)
+    await repo.set_attendance_status(full.id, vali.id, settings.STATUS_ABSENT)
+    partial = await repo.get_or_create_attendance_day(class_obj.id, TUE, user.id)
+    await repo.set_attendance_status(partial.id, ali.id, settings.STATUS_LATE)
+
+    # Belgilangandan keyin sinf kichraydi (3 -> 2) - MON endi to'liq
+    await classes.adjust_student_count(class_obj.id, -1)
+    await session.commit()
+    assert await repo.finalize_complete_days(date(2026, 10, 14)) == (1, 1)
+
+    assert await assert_rebuild_matches(session, repo) == [
+        (1, 0, 1, 2, 2, True),
+        (0, 1, 0, 1, 2, False),
+    ]
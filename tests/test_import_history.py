@@ -0,0 +1,45 @@
+"""Eski davomat importi: paketlar orasidagi takroriy qatorlar."""
+import pytest
+from sqlalchemy import func, select
+
+from core.config import settings
+from core.db.models import AttendanceDayStats, AttendanceItem, User
+from repositories.attendance import AttendanceRepository
+from scripts.import_history import import_history
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 100])
+async def test_repeated_rows_keep_last_value(session, school, tmp_path, batch_size):
+    class_obj, _, (ali, vali) = school
+    session.add(User(telegram_id=2, phone="+998900000001", full_name="Admin", role=settings.ROLE_ADMIN))
+    await session.commit()
+
+    path = tmp_path / "davomat.csv"
+    path.write_text(
+        "Sana,Sinf,O'quvchi,Status\n"
+        "2026-10-12,5A,Ali Valiyev,+\n"
+        "2026-10-12,5A,Vali Aliyev,+\n"
+        "2026-10-12,5A,Ali Valiyev,kelmadi\n",
+        encoding="utf-8",
+    )
+    assert await import_history(path, False, "", batch_size, keep_indexes=False)
+
+    rows = (await session.execute(
+        select(AttendanceItem.student_id, func.count(), func.max(AttendanceItem.status))
+        .group_by(AttendanceItem.attendance_day_id, AttendanceItem.student_id)
+        .order_by(AttendanceItem.student_id)
+    )).all()
+    assert rows == [
+        (ali.id, 1, settings.STATUS_ABSENT),
+        (vali.id, 1, settings.STATUS_PRESENT),
+    ]
+
+    stats = (await session.execute(select(AttendanceDayStats))).scalar_one()
+    assert (stats.present, stats.absent, stats.marked) == (1, 1, 2)
+
+    # Keyingi tahrir bitta yozuvni topadi
+    repo = AttendanceRepository(session)
+    await repo.set_attendance_status(stats.attendance_day_id, ali.id, settings.STATUS_PRESENT)
+    assert await repo.student_stats.check() == []
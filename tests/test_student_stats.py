@@ -0,0 +1,52 @@
+"""O'quvchilar hisoblagichlari: bir kunni tuzatishlar va seriya."""
+from datetime import date
+
+import pytest
+
+from core.config import settings
+from core.db.models import StudentAttendanceStats
+from repositories.attendance import AttendanceRepository
+
+pytestmark = pytest.mark.asyncio
+
+MON, TUE, WED = date(2026, 10, 12), date(2026, 10, 13), date(2026, 10, 14)
+PRESENT, LATE, ABSENT = settings.STATUS_PRESENT, settings.STATUS_LATE, settings.STATUS_ABSENT
+
+
+async def mark(repo, class_obj, user, student, date_val, status):
+    day = await repo.get_or_create_attendance_day(class_obj.id, date_val, user.id)
+    await repo.set_attendance_status(day.id, student.id, status, changed_by=user.id)
+
+
+async def stored_streak(session, student):
+    row = (await session.execute(
+        StudentAttendanceStats.__table__.select().where(
+            StudentAttendanceStats.student_id == student.id
+        )
+    )).one()
+    return row.absence_streak
+
+
+@pytest.mark.parametrize(
+    "marks, streak",
+    [
+        # Oxirgi kun kelmadi deb tuzatildi - oldingi seriya davom etadi
+        ([(MON, ABSENT), (TUE, ABSENT), (WED, PRESENT), (WED, ABSENT)], 3),
+        ([(MON, ABSENT), (TUE, ABSENT), (WED, LATE), (WED, PRESENT), (WED, ABSENT)], 3),
+        ([(MON, ABSENT), (TUE, PRESENT), (WED, ABSENT), (WED, PRESENT), (WED, ABSENT)], 1),
+        # Kelmadi -> keldi -> kelmadi
+        ([(MON, ABSENT), (TUE, ABSENT), (TUE, PRESENT), (TUE, ABSENT)], 2),
+        ([(MON, ABSENT), (TUE, ABSENT), (WED, ABSENT), (WED, PRESENT)], 0),
+        # Eski kun tuzatildi
+        ([(MON, PRESENT), (TUE, ABSENT), (WED, ABSENT), (MON, ABSENT)], 3),
+        ([(MON, ABSENT), (TUE, ABSENT), (WED, ABSENT), (TUE, PRESENT)], 1),
+    ],
+)
+async def test_corrections_keep_counters_consistent(session, school, marks, streak):
+    class_obj, user, (student, _) = school
+    repo = AttendanceRepository(session)
+    for date_val, status in marks:
+        await mark(repo, class_obj, user, student, date_val, status)
+
+    assert await stored_streak(session, student) == streak
+    assert await repo.student_stats.check() == []
@@ -0,0 +1,118 @@
+"""Takroriy callback'lar: kalit update qayta ishlanib bo'lgach bo'shaydi."""
+import asyncio
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from aiogram import Bot, Dispatcher, F, Router
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from bot.middlewares.lanes import LaneMiddleware
+from bot.middlewares.ordering import ChatOrderedExecutor, ChatOrderingMiddleware
+from bot.middlewares.throttling import ThrottlingMiddleware
+from core.lanes import LANE_HEAVY, HeavyLane
+
+pytestmark = pytest.mark.asyncio
+
+USER = User(id=5, is_bot=False, first_name="Ali")
+
+
+@pytest_asyncio.fixture
+async def bot_env(monkeypatch):
+    """main.create_dispatcher tartibidagi middleware'lar va sinov handler'lari."""
+    async def answer(self, *args, **kwargs):
+        return True
+
+    monkeypatch.setattr(CallbackQuery, "answer", answer)
+
+    calls: list[str] = []
+    router = Router()
+
+    @router.callback_query(F.data == "toggle")
+    async def toggle(callback: CallbackQuery):
+        calls.append("toggle")
+        await asyncio.sleep(0.05)
+
+    @router.callback_query(F.data == "fail")
+    async def fail(callback: CallbackQuery):
+        calls.append("fail")
+        raise RuntimeError("handler xatosi")
+
+    @router.callback_query(F.data == "export", flags={"lane": LANE_HEAVY})
+    async def export(callback: CallbackQuery):
+        calls.append("export")
+        await asyncio.sleep(0.3)
+
+    lane = HeavyLane(workers=2)
+    executor = ChatOrderedExecutor(workers=4)
+    throttling = ThrottlingMiddleware(rate=100, burst=100)
+    dp = Dispatcher()
+    dp.include_router(router)
+    dp.update.outer_middleware(throttling)
+    dp.update.outer_middleware(ChatOrderingMiddleware(executor))
+    dp.update.outer_middleware(throttling.release_middleware)
+    dp.callback_query.middleware(LaneMiddleware(lane))
+    await executor.start()
+
+    bot = Bot("1:test")
+    update_ids = iter(range(1, 1000))
+
+    async def tap(data: str) -> None:
+        update_id = next(update_ids)
+        message = Message(message_id=1, date=datetime.now(), chat=Chat(id=USER.id, type="private"))
+        await dp.feed_update(bot, Update(
+            update_id=update_id,
+            callback_query=CallbackQuery(
+                id=str(update_id), from_user=USER, chat_instance="c", data=data, message=message,
+            ),
+        ))
+
+    yield tap, calls, throttling
+    await executor.close()
+    await lane.close()
+    await bot.session.close()
+
+
+async def test_sequential_taps_are_handled(bot_env):
+    tap, calls, throttling = bot_env
+    for _ in range(2):
+        await tap("toggle")
+        await asyncio.sleep(0.1)
+    assert calls == ["toggle", "toggle"]
+    assert len(throttling.in_flight) == 0
+
+
+async def test_double_tap_in_flight_is_dropped(bot_env):
+    tap, calls, _ = bot_env
+    await tap("toggle")
+    await tap("toggle")
+    await asyncio.sleep(0.2)
+    assert calls == ["toggle"]
+
+
+async def test_unmatched_and_failed_callbacks_release_key(bot_env):
+    tap, calls, throttling = bot_env
+    await tap("eskirgan-tugma")
+    await asyncio.sleep(0.05)
+    assert len(throttling.in_flight) == 0
+
+    await tap("fail")
+    await asyncio.sleep(0.05)
+    await tap("fail")
+    await asyncio.sleep(0.05)
+    assert calls == ["fail", "fail"]
+    assert len(throttling.in_flight) == 0
+
+
+async def test_heavy_job_holds_key_until_done(bot_env):
+    tap, calls, throttling = bot_env
+    await tap("export")
+    await asyncio.sleep(0.05)
+    await tap("export")
+    await asyncio.sleep(0.4)
+    assert calls == ["export"]
+    assert len(throttling.in_flight) == 0
+
+    await tap("export")
+    await asyncio.sleep(0.4)
+    assert calls == ["export", "export"]
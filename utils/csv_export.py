@@ -0,0 +1,88 @@
+"""CSV export - davomat yozuvlarini qismlab CSV faylga yozish."""
+import csv
+import io
+from datetime import date, datetime
+from typing import BinaryIO, Iterable, Optional
+
+from core.config import settings
+
+STATUS_NAMES = {
+    settings.STATUS_PRESENT: "Keldi",
+    settings.STATUS_LATE: "Kechikdi",
+    settings.STATUS_ABSENT: "Kelmadi",
+}
+
+ATTENDANCE_HEADER = ("Sana", "Sinf", "O'quvchi", "Status", "Belgilagan", "Yangilangan")
+
+
+class AttendanceCsvWriter:
+    """
+    Davomat yozuvlarini UTF-8 (BOM bilan, Excel uchun) CSV'ga yozish.
+
+    Har bir ``write_rows`` chaqiruvi qatorlarni kodlab darhol fayl
+    obyektiga yozadi - butun fayl xotirada yig'ilmaydi.
+    """
+
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.rows = 0
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def write_header(self) -> None:
+        self.fileobj.write(b"\xef\xbb\xbf")
+        self._writer.writerow(ATTENDANCE_HEADER)
+        self._flush()
+
+    def write_rows(
+        self,
+        rows: Iterable[tuple[date, str, str, int, Optional[str], datetime]],
+    ) -> None:
+        """
+        Args:
+            rows: (date, class_name, student_name, status, marked_by, updated_at)
+        """
+        for date_val, class_name, student_name, status, marked_by, updated_at in rows:
+            self._writer.writerow((
+                date_val.strftime("%Y-%m-%d"),
+                class_name,
+                student_name,
+                STATUS_NAMES.get(status, status),
+                marked_by or "",
+                updated_at.strftime("%Y-%m-%d %H:%M:%S") if updated_at else "",
+            ))
+            self.rows += 1
+        self._flush()
+
+    def _flush(self) -> None:
+        self.fileobj.write(self._buffer.getvalue().encode("utf-8"))
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+
+def write_summary_csv(fileobj: BinaryIO, title: str, totals: Iterable[tuple]) -> None:
+    """
+    Maktab bo'yicha xulosa: har bir sinf va umumiy jami.
+
+    Args:
+        totals: (class_id, class_name, total_students, days, present, late, absent)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow((f"Maktab davomati xulosasi - {title}",))
+    writer.writerow(("Sinf", "O'quvchilar", "Kunlar", "Keldi", "Kechikdi", "Kelmadi", "Davomat %"))
+
+    sums = [0, 0, 0, 0, 0]
+    for _, class_name, students, days, present, late, absent in totals:
+        writer.writerow((class_name, students, days, present, late, absent, _rate(present, late, absent)))
+        for index, value in enumerate((students, days, present, late, absent)):
+            sums[index] += value
+    writer.writerow(("Jami", *sums, _rate(*sums[2:])))
+
+    fileobj.write(b"\xef\xbb\xbf")
+    fileobj.write(buffer.getvalue().encode("utf-8"))
+
+
+def _rate(present: int, late: int, absent: int) -> str:
+    total = present + late + absent
+    return f"{(present + late) / total * 100:.1f}" if total else ""
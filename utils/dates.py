@@ -34,6 +34,19 @@ def get_week_dates(start_date: Optional[date] = None) -> list[date]:
     return [monday + timedelta(days=i) for i in range(7)]
 
 
+def get_month_range(year: int, month: int) -> tuple[date, date]:
+    """Oyning birinchi va oxirgi kuni."""
+    first = date(year, month, 1)
+    next_first = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first, next_first - timedelta(days=1)
+
+
+def shift_month(year: int, month: int, delta: int) -> tuple[int, int]:
+    """Oyni ``delta`` oyga surish: (2026, 1), -1 -> (2025, 12)."""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
 def get_month_name(month: int) -> str:
     """Oy nomini olish (o'zbekcha)."""
     months = {
@@ -65,3 +78,74 @@ def get_weekday_name(weekday: int) -> str:
         6: "Yakshanba",
     }
     return weekdays.get(weekday, "")
+
+
+def parse_term_starts(value: str) -> list[tuple[int, int]]:
+    """"09-01,11-04,..." ko'rinishidagi chorak boshlanish sanalarini (oy, kun) ro'yxatiga aylantirish."""
+    starts = []
+    for part in value.split(","):
+        part = part.strip()
+        if part:
+            month, day = part.split("-")
+            starts.append((int(month), int(day)))
+    if not starts:
+        raise ValueError("Chorak boshlanish sanalari bo'sh")
+    return starts
+
+
+def get_academic_period(date_val: date, term_starts: Optional[list[tuple[int, int]]] = None) -> str:
+    """
+    Sana qaysi o'quv davriga (chorakka) tegishli ekanini aniqlash.
+    
+    Birinchi element - o'quv yili boshi. Natija: "2026-2027/1".
+    """
+    if term_starts is None:
+        from core.config import settings
+        term_starts = parse_term_starts(settings.ACADEMIC_TERMS)
+    
+    first = term_starts[0]
+    year = date_val.year if (date_val.month, date_val.day) >= first else date_val.year - 1
+    
+    term = 1
+    for index, (month, day) in enumerate(term_starts, 1):
+        start_year = year if (month, day) >= first else year + 1
+        if date(start_year, month, day) <= date_val:
+            term = index
+    return f"{year}-{year + 1}/{term}"
+
+
+def get_academic_year_start(date_val: date, term_starts: Optional[list[tuple[int, int]]] = None) -> date:
+    """Sana tegishli o'quv yilining birinchi kuni."""
+    if term_starts is None:
+        from core.config import settings
+        term_starts = parse_term_starts(settings.ACADEMIC_TERMS)
+    
+    month, day = term_starts[0]
+    year = date_val.year if (date_val.month, date_val.day) >= (month, day) else date_val.year - 1
+    return date(year, month, day)
+
+
+def get_term_range(
+    date_val: date,
+    offset: int = 0,
+    term_starts: Optional[list[tuple[int, int]]] = None,
+) -> tuple[date, date]:
+    """
+    Sana tegishli chorakning (``offset`` - oldingi/keyingi chorak) birinchi va oxirgi kuni.
+    
+    Oxirgi chorak keyingi o'quv yili boshlanishidan bir kun oldin tugaydi.
+    """
+    if term_starts is None:
+        from core.config import settings
+        term_starts = parse_term_starts(settings.ACADEMIC_TERMS)
+    
+    year_start = get_academic_year_start(date_val, term_starts)
+    first = term_starts[0]
+    starts = []
+    for year in (year_start.year - 1, year_start.year, year_start.year + 1):
+        for month, day in term_starts:
+            starts.append(date(year if (month, day) >= first else year + 1, month, day))
+    starts.sort()
+    
+    index = max(i for i, start in enumerate(starts) if start <= date_val) + offset
+    return starts[index], starts[index + 1] - timedelta(days=1)
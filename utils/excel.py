@@ -1,37 +1,159 @@
-"""Excel export - o'quvchilar ro'yxatini Excel faylda yaratish."""
-import io
+"""Excel export - o'quvchilar ro'yxati va davomat matritsasini Excel faylda yaratish."""
 from datetime import date
+from typing import BinaryIO, Iterable
 
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
 
-def generate_students_excel(class_name: str, students: list) -> io.BytesIO:
+from core.config import settings
+
+# Matritsadagi status belgilari
+STATUS_CODES = {
+    settings.STATUS_PRESENT: "+",
+    settings.STATUS_LATE: "K",
+    settings.STATUS_ABSENT: "Y",
+}
+STATUS_FILLS = {
+    "+": "C6EFCE",  # yashil
+    "K": "FFEB9C",  # sariq
+    "Y": "FFC7CE",  # qizil
+}
+
+
+class AttendanceWorkbook:
     """
-    O'quvchilar ro'yxatini CSV formatida yaratish (Excel ochishi mumkin).
-    
-    Args:
-        class_name: Sinf nomi
-        students: O'quvchilar ro'yxati
-    
-    Returns:
-        BytesIO obyekti (fayl)
+    Haqiqiy ``.xlsx`` fayl: o'quvchilar ro'yxati va oylik davomat matritsasi.
+
+    openpyxl'ning write-only rejimida ishlaydi: qatorlar ``append_*``
+    orqali qismlab qo'shiladi va darhol vaqtinchalik faylga yoziladi,
+    shuning uchun xotira sinf hajmi va sanalar oralig'iga bog'liq emas.
+    Funksiya DB'ga murojaat qilmaydi - qatorlarni chaqiruvchi uzatadi.
     """
-    # CSV yaratish (Excel ochishi mumkin)
-    output = io.BytesIO()
-    
-    # UTF-8 BOM qo'shish (Excel uchun)
-    output.write(b'\xef\xbb\xbf')
-    
-    # Header
-    header = f"{class_name} - O'quvchilar ro'yxati\n"
-    header += f"Sana: {date.today().strftime('%d.%m.%Y')}\n\n"
-    header += "№,Ism Familiya,Status\n"
-    
-    output.write(header.encode('utf-8'))
-    
-    # O'quvchilar
-    for i, student in enumerate(students, 1):
-        status = "Faol" if student.is_active else "Nofaol"
-        line = f"{i},{student.full_name},{status}\n"
-        output.write(line.encode('utf-8'))
-    
-    output.seek(0)
-    return output
+
+    HEADER_FONT = Font(bold=True)
+
+    def __init__(self):
+        self.workbook = Workbook(write_only=True)
+        self._roster = None
+        self._roster_count = 0
+        self._matrix = None
+        self._matrix_days: list[date] = []
+        self._matrix_count = 0
+
+    def start_roster(self, class_name: str) -> None:
+        """"Ro'yxat" varag'ini ochish."""
+        sheet = self.workbook.create_sheet("Ro'yxat")
+        sheet.column_dimensions["A"].width = 6
+        sheet.column_dimensions["B"].width = 32
+        for column in "CDEFGH":
+            sheet.column_dimensions[column].width = 12
+        sheet.freeze_panes = "A4"
+
+        sheet.append([self._bold(sheet, f"{class_name} - O'quvchilar ro'yxati")])
+        sheet.append([f"Sana: {date.today().strftime('%d.%m.%Y')}"])
+        sheet.append([self._bold(sheet, text) for text in (
+            "№", "Ism Familiya", "Status", "Davomat %",
+            "Keldi", "Kechikdi", "Kelmadi", "Ketma-ket kelmagan",
+        )])
+        self._roster = sheet
+
+    def append_roster(self, rows: Iterable[tuple]) -> None:
+        """
+        Ro'yxat qatorlari.
+
+        Args:
+            rows: (full_name, is_active, present, late, absent, absence_streak)
+        """
+        for full_name, is_active, present, late, absent, streak in rows:
+            self._roster_count += 1
+            total = present + late + absent
+            self._roster.append([
+                self._roster_count,
+                full_name,
+                "Faol" if is_active else "Nofaol",
+                round((present + late) / total * 100) if total else None,
+                present,
+                late,
+                absent,
+                streak,
+            ])
+
+    def start_matrix(self, title: str, days: list[date]) -> None:
+        """
+        Oylik matritsa varag'ini ochish.
+
+        Args:
+            title: Varaq sarlavhasi (masalan "5-A, Oktabr 2026")
+            days: Davomat ochilgan kunlar (ustunlar, bir yoki bir necha oy)
+        """
+        sheet = self.workbook.create_sheet("Davomat")
+        # Bir necha oy bo'lsa ustun sarlavhasida oy ham ko'rsatiladi
+        day_format = "%d" if len({(day.year, day.month) for day in days}) <= 1 else "%d.%m"
+        day_width = 4 if day_format == "%d" else 6
+        sheet.column_dimensions["A"].width = 6
+        sheet.column_dimensions["B"].width = 32
+        for index in range(len(days)):
+            sheet.column_dimensions[get_column_letter(3 + index)].width = day_width
+        sheet.freeze_panes = "C3"
+
+        sheet.append([self._bold(sheet, title)])
+        sheet.append(
+            [self._bold(sheet, "№"), self._bold(sheet, "Ism Familiya")]
+            + [self._bold(sheet, day.strftime(day_format)) for day in days]
+            + [self._bold(sheet, text) for text in ("Keldi", "Kechikdi", "Kelmadi", "%")]
+        )
+        self._matrix = sheet
+        self._matrix_days = days
+
+    def append_matrix(self, rows: Iterable[tuple[str, dict]]) -> None:
+        """
+        Matritsa qatorlari.
+
+        Args:
+            rows: (full_name, {date: status}) - har bir o'quvchi uchun
+        """
+        for full_name, statuses in rows:
+            self._matrix_count += 1
+            counts = {code: 0 for code in STATUS_FILLS}
+            cells = []
+            for day in self._matrix_days:
+                code = STATUS_CODES.get(statuses.get(day))
+                if code:
+                    counts[code] += 1
+                cells.append(code)
+            total = sum(counts.values())
+            self._matrix.append(
+                [self._matrix_count, full_name]
+                + cells
+                + [
+                    counts["+"],
+                    counts["K"],
+                    counts["Y"],
+                    round((counts["+"] + counts["K"]) / total * 100) if total else None,
+                ]
+            )
+
+    def save(self, fileobj: BinaryIO) -> None:
+        """Faylni yozish (write-only kitob faqat bir marta saqlanadi)."""
+        if self._matrix is not None and self._matrix_days and self._matrix_count:
+            cell_range = (
+                f"C3:{get_column_letter(2 + len(self._matrix_days))}{2 + self._matrix_count}"
+            )
+            for code, color in STATUS_FILLS.items():
+                self._matrix.conditional_formatting.add(cell_range, CellIsRule(
+                    operator="equal",
+                    formula=[f'"{code}"'],
+                    fill=PatternFill("solid", start_color=color, end_color=color),
+                ))
+        if not self.workbook.worksheets:
+            self.workbook.create_sheet("Ro'yxat")
+        self.workbook.save(fileobj)
+
+    @classmethod
+    def _bold(cls, sheet, value) -> WriteOnlyCell:
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.font = cls.HEADER_FONT
+        return cell
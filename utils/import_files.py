@@ -0,0 +1,113 @@
+"""Import fayllari - CSV/XLSX jadvallarni qatorma-qator o'qish."""
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from typing import Any, BinaryIO, Iterator, Optional
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+SUPPORTED_EXTENSIONS = (".csv", ".txt", ".xlsx")
+
+# O'zbek lotin yozuvidagi turli apostroflar bitta belgiga keltiriladi
+_APOSTROPHES = re.compile(r"[ʻʼ‘’`´]")
+_SPACES = re.compile(r"\s+")
+
+
+def iter_table_rows(fileobj: BinaryIO, filename: str) -> Iterator[list[Any]]:
+    """
+    Jadval qatorlarini birma-bir qaytarish (butun fayl xotiraga o'qilmaydi).
+
+    ``.xlsx`` - birinchi varaq, openpyxl read-only rejimida. ``.csv`` -
+    UTF-8 (BOM bilan yoki bo'lmasa), ajratuvchi ``,``, ``;`` yoki tab
+    avtomatik aniqlanadi. Matn qiymatlari chetdagi bo'shliqlarsiz,
+    bo'sh kataklar ``""`` bo'ladi.
+
+    Raises:
+        ValueError: Fayl turi qo'llab-quvvatlanmasa yoki fayl buzilgan bo'lsa
+    """
+    name = filename.lower()
+    if name.endswith(".xlsx"):
+        try:
+            workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        except (zipfile.BadZipFile, InvalidFileException, KeyError) as e:
+            raise ValueError("XLSX faylni o'qib bo'lmadi") from e
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield [_clean(value) for value in row]
+        finally:
+            workbook.close()
+    elif name.endswith((".csv", ".txt")):
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", errors="replace", newline="")
+        try:
+            sample = text.read(4096)
+            text.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            except csv.Error:
+                dialect = csv.excel
+            for row in csv.reader(text, dialect):
+                yield list(map(str.strip, row))
+        finally:
+            # Asl fayl chaqiruvchiniki - yopilmasin
+            if not fileobj.closed:
+                text.detach()
+    else:
+        raise ValueError(f"Fayl turi qo'llab-quvvatlanmaydi (faqat {', '.join(SUPPORTED_EXTENSIONS)})")
+
+
+def find_columns(row: list[Any], aliases: dict[str, set[str]]) -> Optional[dict[str, int]]:
+    """
+    Sarlavha qatoridan ustunlar o'rnini topish.
+
+    Args:
+        row: Birinchi qator
+        aliases: {"name": {"ism", "fio", ...}, ...}
+
+    Returns:
+        {"name": 0, ...} - qator sarlavha bo'lsa, aks holda None
+    """
+    columns: dict[str, int] = {}
+    for index, value in enumerate(row):
+        key = normalize_header(value)
+        for field, names in aliases.items():
+            if key in names and field not in columns:
+                columns[field] = index
+    return columns or None
+
+
+def normalize_header(value: Any) -> str:
+    return _APOSTROPHES.sub("'", _SPACES.sub(" ", str(value or "")).strip().lower())
+
+
+def normalize_name(value: Any) -> str:
+    """Ismdagi ortiqcha bo'shliqlar va apostroflarni tozalash."""
+    return _APOSTROPHES.sub("'", _SPACES.sub(" ", str(value or "")).strip())
+
+
+def name_key(value: Any) -> str:
+    """Takrorlarni aniqlash uchun kalit (katta-kichik harf farqisiz)."""
+    return normalize_name(value).casefold()
+
+
+def cell(row: list[Any], index: Optional[int]) -> Any:
+    """Qatordagi ustun qiymati (ustun yo'q yoki qator qisqa bo'lsa "")."""
+    if index is None or index >= len(row):
+        return ""
+    return row[index]
+
+
+def _clean(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, datetime):
+        return value.date() if value.time() == datetime.min.time() else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, date):
+        return value
+    return value
@@ -0,0 +1,124 @@
+"""PDF export - oylik sinf davomat jurnali (reportlab)."""
+import io
+import os
+from dataclasses import dataclass
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+# Kirill va o'zbek lotin harflari uchun TTF shrift (topilmasa Helvetica)
+FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+)
+FONT_NAME = "RegisterFont"
+
+# Matritsadagi belgilar: "+" keldi, "K" kechikdi, "Y" kelmadi, " " belgilanmagan
+CODE_FILLS = {
+    "K": colors.HexColor("#FFEB9C"),
+    "Y": colors.HexColor("#FFC7CE"),
+}
+
+
+@dataclass(frozen=True)
+class RegisterMatrix:
+    """
+    Jurnal uchun oldindan yig'ilgan ixcham ma'lumot (ORM obyektlarisiz).
+
+    ``rows`` dagi har bir satr ``days`` bilan bir xil uzunlikda: i-belgi
+    i-kundagi status kodi. Obyekt kichik va process pulga oson uzatiladi.
+    """
+
+    class_name: str
+    title: str               # masalan "Oktabr 2026"
+    days: tuple[int, ...]    # oy kunlari (ustunlar)
+    rows: tuple[tuple[str, str], ...]  # (full_name, status kodlari)
+    font_path: str = ""
+
+
+def render_register_pdf(matrix: RegisterMatrix) -> bytes:
+    """
+    Oylik davomat jurnalini PDF'ga chizish.
+
+    CPU talab qiladi - ``heavy_lane.run_in_process`` orqali chaqiriladi.
+
+    Returns:
+        PDF fayl baytlari
+    """
+    font = _register_font(matrix.font_path)
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=landscape(A4),
+        leftMargin=10 * mm,
+        rightMargin=10 * mm,
+        topMargin=12 * mm,
+        bottomMargin=12 * mm,
+        title=f"{matrix.class_name} - {matrix.title}",
+    )
+    title_style = ParagraphStyle("title", fontName=font, fontSize=14, leading=18)
+    text_style = ParagraphStyle("text", fontName=font, fontSize=10, leading=14)
+
+    header = ["№", "Ism Familiya"] + [str(day) for day in matrix.days] + ["+", "K", "Y"]
+    data = [header]
+    style = [
+        ("FONT", (0, 0), (-1, -1), font, 7),
+        ("FONT", (0, 0), (-1, 0), font, 7),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#D9D9D9")),
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.grey),
+        ("ALIGN", (2, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+    day_count = len(matrix.days)
+    for index, (full_name, codes) in enumerate(matrix.rows, 1):
+        data.append(
+            [index, full_name]
+            + list(codes)
+            + [codes.count("+"), codes.count("K"), codes.count("Y")]
+        )
+        for column, code in enumerate(codes, 2):
+            fill = CODE_FILLS.get(code)
+            if fill is not None:
+                style.append(("BACKGROUND", (column, index), (column, index), fill))
+
+    page_width = landscape(A4)[0] - 20 * mm
+    name_width = 55 * mm
+    fixed = 8 * mm + name_width + 3 * 7 * mm
+    day_width = min(7 * mm, (page_width - fixed) / day_count) if day_count else 7 * mm
+    table = Table(
+        data,
+        colWidths=[8 * mm, name_width] + [day_width] * day_count + [7 * mm] * 3,
+        repeatRows=1,
+    )
+    table.setStyle(TableStyle(style))
+
+    doc.build([
+        Paragraph(f"Sinf davomat jurnali: {matrix.class_name}, {matrix.title}", title_style),
+        Spacer(1, 4 * mm),
+        table,
+        Spacer(1, 4 * mm),
+        Paragraph("+ keldi, K kechikdi, Y kelmadi", text_style),
+        Spacer(1, 10 * mm),
+        Paragraph("Sinf rahbari: ______________________", text_style),
+        Spacer(1, 6 * mm),
+        Paragraph("Direktor o'rinbosari: ______________________", text_style),
+    ])
+    return output.getvalue()
+
+
+def _register_font(font_path: str = "") -> str:
+    """TTF shriftni ro'yxatdan o'tkazish (bir marta) va nomini qaytarish."""
+    if FONT_NAME in pdfmetrics.getRegisteredFontNames():
+        return FONT_NAME
+    for path in ((font_path,) if font_path else ()) + FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            pdfmetrics.registerFont(TTFont(FONT_NAME, path))
+            return FONT_NAME
+    return "Helvetica"